@@ -13,7 +13,7 @@ from .core.SpecificPopulation import PoissonPopulation, SpikeSourceArray
 from .core.SpecificProjection import DecodingProjection
 from .core.Dendrite import Dendrite
 from .core.Random import Uniform, DiscreteUniform, Normal, LogNormal, Gamma, Exponential
-from .core.IO import save, load, load_parameter
+from .core.IO import save, load, load_parameter, export_compiled, load_compiled
 from .core.Utils import raster_plot, smoothed_rate, histogram, population_rate, sparse_random_matrix
 from .core.Record import Monitor
 from .core.Network import Network, parallel_run
@@ -251,7 +251,7 @@ def connect_with_func(self, method, **args):
 
     *Parameters*:
 
-    * **method**: method to call. The method **must** return a CSR object.
+    * **method**: method to call. The method **must** return a CSR object, filled either with ``CSR.add()`` or created at once with ``CSR.from_arrays()``.
     * **args**: list of arguments needed by the function 
     """ 
     # Invoke the method directly, we need the delays already....
@@ -305,8 +305,6 @@ def connect_from_matrix(self, weights, delays=0.0, pre_post=False):
     return self
 
 def _load_from_matrix(self, pre, post, weights, delays, pre_post):
-    csr = Connector.CSR()
-
     uniform_delay = not isinstance(delays, (list, np.ndarray))
     if isinstance(delays, list):
         try:
@@ -315,6 +313,11 @@ def _load_from_matrix(self, pre, post, weights, delays, pre_post):
             Global._error('connect_from_matrix(): You must provide a dense 2D matrix.')
             exit(0)
 
+    # np.matrix would keep two dimensions when indexed
+    weights = np.asarray(weights)
+    if not uniform_delay:
+        delays = np.asarray(delays)
+
     if pre_post: # if the user prefers pre as the first index...
         weights = weights.T
         if isinstance(delays, np.ndarray):
@@ -332,31 +335,28 @@ def _load_from_matrix(self, pre, post, weights, delays, pre_post):
             Global._print('Received:', shape)
         exit(0)
 
-    for i in range(self.post.size):
-        if isinstance(self.post, PopulationView):
-            rk_post = self.post.ranks[i]
-        else:
-            rk_post = i
-        r = []
-        w = []
-        d = []
-        for j in range(self.pre.size):
-            val = weights[i, j]
-            if val != None:
-                if isinstance(self.pre, PopulationView):
-                    rk_pre = self.pre.ranks[j]
-                else:
-                    rk_pre = j
-                r.append(rk_pre)
-                w.append(val) 
-                if not uniform_delay:
-                    d.append(delays[i,j])   
-        if uniform_delay:        
-            d.append(delays)
-        if len(r) > 0:
-            csr.add(rk_post, r, w, d)
+    # Synapses are created where the weight is not None, in row-major order
+    if weights.dtype == object:
+        mask = np.not_equal(weights, None)
+    else:
+        mask = np.ones(shape, dtype=bool)
+    idx_post, idx_pre = np.nonzero(mask)
+    row_ptr = np.concatenate(([0], np.cumsum(np.count_nonzero(mask, axis=1))))
 
-    return csr
+    if isinstance(self.post, PopulationView):
+        post_ranks = np.array(self.post.ranks)
+    else:
+        post_ranks = np.arange(self.post.size)
+
+    if isinstance(self.pre, PopulationView):
+        pre_ranks = np.array(self.pre.ranks)[idx_pre]
+    else:
+        pre_ranks = idx_pre
+
+    w = weights[idx_post, idx_pre].astype(np.float64)
+    d = delays if uniform_delay else delays[idx_post, idx_pre].astype(np.float64)
+
+    return Connector.CSR.from_arrays(post_ranks, row_ptr, pre_ranks, w, d)
 
 def connect_from_sparse(self, weights, delays=0.0):
     """
@@ -383,7 +383,9 @@ def connect_from_sparse(self, weights, delays=0.0):
         Global._error("connect_from_sparse(): only constant delays are allowed for sparse matrices.")
         exit(0)
 
-    weights = csc_matrix(weights)
+    # Work on a copy, as duplicate entries are summed and the indices sorted in place
+    weights = csc_matrix(weights, copy=True)
+    weights.sum_duplicates()
 
     # if weights[weights.nonzero()].max() == weights[weights.nonzero()].min() :
     #     self._single_constant_weight = True
@@ -396,24 +398,18 @@ def connect_from_sparse(self, weights, delays=0.0):
     return self
 
 def _load_from_sparse(self, pre, post, weights, delays):
-    from scipy.sparse import csc_matrix
-
-    # Create an empty CSR object
-    csr = Connector.CSR()
-
     # Find offsets
     if isinstance(self.pre, PopulationView):
-        pre_ranks = self.pre.ranks
+        pre_ranks = np.array(self.pre.ranks)
     else:
-        pre_ranks = [i for i in range(self.pre.size)]
+        pre_ranks = np.arange(self.pre.size)
 
     if isinstance(self.post, PopulationView):
-        post_ranks = self.post.ranks
+        post_ranks = np.array(self.post.ranks)
     else:
-        post_ranks = [i for i in range(self.post.size)]
+        post_ranks = np.arange(self.post.size)
     
-    # Process the sparse matrix and fill the csr
-    weights.sort_indices()
+    # The columns of the CSC matrix are the dendrites
     (pre, post) = weights.shape
 
     if (pre, post) != (len(pre_ranks), len(post_ranks)):
@@ -422,13 +418,27 @@ def _load_from_sparse(self, pre, post, weights, delays):
         Global._print('Received:', (pre, post))
         exit(0)
 
-    for idx_post in range(post):
-        idx_pre = weights.getcol(idx_post).indices
-        w = weights.getcol(idx_post).data
-        pr = [pre_ranks[i] for i in idx_pre]
-        csr.add(post_ranks[idx_post], pr, w, [float(delays)])
+    return Connector.CSR.from_arrays(post_ranks, weights.indptr, pre_ranks[weights.indices], weights.data, float(delays))
 
-    return csr        
+def _csr_from_data(self, data):
+    """
+    Creates a CSR object from the connectivity data returned by Projection._connectivity_data().
+    """
+    pre_ranks = data['pre_ranks']
+    row_ptr = np.concatenate(([0], np.cumsum([len(r) for r in pre_ranks])))
+    if isinstance(data['w'], (int, float)):
+        self._single_constant_weight = True
+        w = data['w']
+    else:
+        w = np.concatenate(data['w']) if len(data['w']) > 0 else []
+    csr = Connector.CSR.from_arrays(data['post_ranks'], row_ptr, np.concatenate(pre_ranks) if len(pre_ranks) > 0 else [], w)
+
+    # The delays are stored in steps
+    if data['delay']:
+        csr.delay = data['delay']
+    csr.max_delay = data['max_delay']
+    csr.uniform_delay = data['uniform_delay']
+    return csr
 
 def connect_from_file(self, filename):
     """
@@ -442,9 +452,6 @@ def connect_from_file(self, filename):
 
         Only the ranks, weights and delays are loaded, not the other variables.
     """
-    # Create an empty CSR object
-    csr = Connector.CSR()
-
     # Load the data        
     from ANNarchy.core.IO import _load_data
     try:
@@ -456,19 +463,7 @@ def connect_from_file(self, filename):
 
     # Load the CSR object
     try:
-        csr.post_rank = data['post_ranks']
-        csr.pre_rank = data['pre_ranks']
-        if isinstance(data['w'], (int, float)):
-            self._single_constant_weight = True
-            csr.w = [[data['w']]]
-        else:
-            csr.w = data['w']
-        csr.size = data['size']
-        csr.nb_synapses = data['nb_synapses']
-        if data['delay']:
-            csr.delay = data['delay']
-        csr.max_delay = data['max_delay']
-        csr.uniform_delay = data['uniform_delay']
+        csr = _csr_from_data(self, data)
     except Exception as e:
         Global._print(e)
         Global._error('Unable to load the data', filename, 'into the projection.')
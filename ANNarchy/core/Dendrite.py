@@ -139,8 +139,13 @@ class Dendrite(object):
         elif name == 'attributes':
             object.__setattr__(self, 'attributes', value)
         elif hasattr(self, 'proj'):
-            if name in self.proj.attributes:
+            if name in self.proj._frozen:
+                Global._error('the parameter ' + name + ' is frozen and can not be modified.')
+            elif name in self.proj.attributes:
                 if isinstance(value, (np.ndarray, list)):
+                    if not len(value) == self.size:
+                        Global._error('The postynaptic neuron ' + str(self.post_rank) + ' receives '+ str(self.size)+ ' synapses.')
+                        exit(0)
                     getattr(self.proj.cyInstance, 'set_dendrite_'+name)(self.idx, value)
                 else :
                     getattr(self.proj.cyInstance, 'set_dendrite_'+name)(self.idx, value * np.ones(self.size))
@@ -56,7 +56,10 @@ config = dict(
     'method': "explicit",
     'seed': -1,
     'structural_plasticity': False,
-    'profiling': False
+    'storage_format': "auto",
+    'precision': "double",
+    'profiling': False,
+    'cache_dir': os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'annarchy')
    }
 )
 
@@ -86,6 +89,7 @@ authorized_keywords = [
     'semiimplicit',
     'exponential',
     'midpoint',
+    'rk4',
     'exact',
     'event-driven',
     # Refractory
@@ -96,6 +100,8 @@ authorized_keywords = [
     'float',
     # Event-based
     'unless_post',
+    # Constant parameters
+    'frozen',
 ]
 
 # Dictionary of population variables being currently recorded
@@ -117,8 +123,14 @@ def setup(**keyValueArgs):
 
     * **structural_plasticity**: allows synapses to be dynamically added/removed during the simulation (default: False).
 
+    * **storage_format**: default storage of the synapses on CPUs. "lil" uses one vector per post-synaptic neuron, "csr" flat compressed sparse rows (contiguous memory, faster summation and learning). "sell" (SELL-C-sigma) groups post-synaptic neurons with similar numbers of synapses into padded chunks, so that the weighted sum of rate-coded projections is vectorized; it falls back to "csr" for other projections. "auto" uses CSR whenever the projection allows it, i.e. without structural plasticity, dense connectivity or specific templates (default: "auto"). Can be overridden per projection with the ``storage_format`` argument of ``Projection``.
+
+    * **precision**: floating-point precision of the generated code. "double" stores all attributes, weights and weighted sums in double precision. "float" stores them in single precision, which halves the memory footprint and bandwidth of the synapses. "mixed" also uses single-precision storage, but keeps double-precision accumulators in the weighted sums. Only available for the "openmp" paradigm (default: "double").
+
     * **seed**: the seed (integer) to be used in the random number generators (default = -1 is equivalent to time(NULL)).
 
+    * **cache_dir**: directory where compiled networks are stored, so that an identical network is never compiled twice on the same CPU, whatever the compilation directory or the network id (default: ``~/.cache/annarchy``). Set to None to disable the cache.
+
     The following parameters are mainly for debugging and profiling, and should be ignored by most users:
 
     * **verbose**: shows details about compilation process on console (by default False). Additional some information of the network construction will be shown.
@@ -146,6 +158,13 @@ def setup(**keyValueArgs):
         if key == 'seed':
             np.random.seed(keyValueArgs[key])
 
+        if key == 'precision' and not keyValueArgs[key] in ['double', 'float', 'mixed']:
+            _error('setup(): precision must be "double", "float" or "mixed".')
+            exit(0)
+
+    if config['precision'] != 'double' and config['paradigm'] == 'cuda':
+        _warning('setup(): single precision is not available for CUDA, double precision is used.')
+
 
 def reset(populations=True, projections=False, synapses = False, net_id=0):
     """
@@ -367,6 +386,18 @@ def dt():
     "Returns the simulation step size ``dt`` used in the simulation."
     return config['dt']
 
+def _float_type():
+    "C++ type used to store floating-point attributes, weights and weighted sums."
+    if config['paradigm'] == 'openmp' and config['precision'] in ['float', 'mixed']:
+        return 'float'
+    return 'double'
+
+def _accumulator_type():
+    "C++ type of the accumulators used in the weighted sums."
+    if config['paradigm'] == 'openmp' and config['precision'] == 'float':
+        return 'float'
+    return 'double'
+
 ################################
 ## Seed
 ################################
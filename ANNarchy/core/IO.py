@@ -22,12 +22,15 @@
     
 """
 from ANNarchy.core import Global 
-import os
+import os, shutil
 try:
     import cPickle as pickle # Python2
 except:
     import pickle # Python3
 
+# Options depending on the machine running the network, which are not exported by export_compiled()
+_local_config = ['verbose', 'show_time', 'suppress_warnings', 'num_threads', 'cache_dir']
+
 def load_parameter(in_file):
     """
     Load parameter set from xml file.
@@ -258,7 +261,99 @@ def load(filename, populations=True, projections=True, net_id=0):
             if proj.name in desc.keys():            
                 _load_proj_data(proj, desc[proj.name])
 
-  
+
+def export_compiled(bundle, net_id=0):
+    """
+    Exports a compiled network into the directory *bundle*: the shared library, the description of the populations and projections (including the connectivity) and the current value of their parameters and variables.
+
+    The network can then be simulated in another script with ``load_compiled()``, without declaring it again: the neuron and synapse models are not analysed and the connectors are not called.
+
+    Monitors are not exported, they have to be created again after ``load_compiled()``. The loaded network starts at t = 0 with the exported values of the parameters and variables, but internal buffers (delayed variables, last spike times) are reset.
+
+    *Parameters*:
+
+    * **bundle**: directory where the network is exported (created if needed).
+
+    Example::
+
+        compile()
+        simulate(1000.0) # e.g. learning
+        export_compiled('bundles/network')
+    """
+    if not Global._network[net_id]['instance']:
+        Global._error('export_compiled(): the network has not been compiled yet.')
+        return
+
+    if not os.path.isdir(bundle):
+        os.makedirs(bundle)
+
+    from ANNarchy import __release__
+    # The library which was actually loaded, whatever the compilation directory
+    shutil.copy(Global._network[net_id]['instance'].__file__, bundle + '/ANNarchyCore' + str(net_id) + '.so')
+
+    desc = {
+        'release': __release__,
+        'net_id': net_id,
+        'import_id': int(Global._network[net_id]['instance'].__name__[len('ANNarchyCore'):]), # the library may come from the compilation cache
+        'config': dict([(key, val) for key, val in Global.config.items() if not key in _local_config]),
+        'populations': [(pop.__class__, pop._export()) for pop in Global._network[net_id]['populations']],
+        'projections': [(proj.__class__, proj._export()) for proj in Global._network[net_id]['projections']],
+        'data': _net_description(True, True, net_id),
+    }
+    with open(bundle + '/network.data', 'wb') as w_file:
+        pickle.dump(desc, w_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+def load_compiled(bundle):
+    """
+    Loads a network exported with ``export_compiled()`` and binds it to its shared library, so that it can be simulated immediately.
+
+    No population or projection must have been declared before. They can be accessed afterwards with ``get_population()``, ``populations()`` and ``projections()``. ``setup()`` can be called before to change options such as the number of threads, the other ones (``dt``, ``seed``...) are the ones of the exported network.
+
+    *Parameters*:
+
+    * **bundle**: directory containing the exported network.
+
+    Example::
+
+        from ANNarchy import *
+        load_compiled('bundles/network')
+        m = Monitor(get_population('pop0'), 'r')
+        simulate(1000.0)
+    """
+    if len(Global._network[0]['populations']) > 0 or len(Global._network[0]['projections']) > 0:
+        Global._error('load_compiled(): the network must be empty before loading a compiled one.')
+        return
+
+    desc = _load_data(bundle + '/network.data')
+    if desc == None:
+        return
+
+    from ANNarchy import __release__
+    if desc['release'] != __release__:
+        Global._error('load_compiled(): the network was exported with ANNarchy ' + desc['release'] + ', it has to be compiled again.')
+        return
+
+    Global.config.update(desc['config'])
+
+    # Recreate the Python objects
+    populations = {}
+    for cls, state in desc['populations']:
+        pop = cls._from_export(state)
+        populations[pop.id] = pop
+    for cls, state in desc['projections']:
+        cls._from_export(state, populations)
+    Global._network[0]['compiled'] = True
+
+    # Bind them to the library
+    from ANNarchy.generator.Compiler import _instantiate
+    _instantiate(0, import_id=desc.get('import_id', desc['net_id']), core_library=bundle + '/ANNarchyCore' + str(desc['net_id']) + '.so')
+
+    # Restore the values at the time of the export
+    for pop in Global._network[0]['populations']:
+        _load_pop_data(pop, desc['data'][pop.name])
+    for proj in Global._network[0]['projections']:
+        _load_proj_data(proj, desc['data'][proj.name])
+
 def _net_description(populations, projections, net_id=0):
     """
     Returns a dictionary containing the requested network data.
@@ -305,13 +400,13 @@ def _load_proj_data(proj, desc):
         Global._error('Saved with a too old version of ANNarchy (< 4.2).')
         return
     # If the post ranks have changed, overwrite
-    if desc.has_key('post_ranks') and not desc['post_ranks'] == proj.post_ranks:
+    if 'post_ranks' in desc and not desc['post_ranks'] == proj.post_ranks:
         getattr(proj.cyInstance, 'set_post_rank')(desc['post_ranks'])
     # If the pre ranks have changed, overwrite
-    if desc.has_key('pre_ranks') and not desc['pre_ranks'] == proj.cyInstance.pre_rank_all():
+    if 'pre_ranks' in desc and not desc['pre_ranks'] == proj.cyInstance.pre_rank_all():
         getattr(proj.cyInstance, 'set_pre_rank')(desc['pre_ranks'])
     # Other variables
-    if desc.has_key('dendrites'): # Saved before 4.5.3
+    if 'dendrites' in desc: # Saved before 4.5.3
         for dendrite in desc['dendrites']:
             rk = dendrite['post_rank']
             for var in desc['attributes']:
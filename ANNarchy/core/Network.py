@@ -121,6 +121,9 @@ class Network(object):
             proj.id = obj.id
             proj.name = obj.name
             proj.init = obj.init
+            proj._storage_format = obj._storage_format
+            proj._single_constant_weight = obj._single_constant_weight
+            proj._dense_matrix = obj._dense_matrix
             # Copy the synapses if they are already created
             proj._store_connectivity(obj._connection_method, obj._connection_args, obj._connection_delay)
             # Add the copy to the local network
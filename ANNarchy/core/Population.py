@@ -25,7 +25,7 @@ import ANNarchy.core.Global as Global
 
 from .PopulationView import PopulationView
 from .Random import RandomDistribution
-from .Neuron import IndividualNeuron
+from .Neuron import Neuron, IndividualNeuron
 
 import numpy as np
 import copy, inspect
@@ -35,7 +35,7 @@ class Population(object):
     Represents a population of homogeneous neurons.
     """
 
-    def __init__(self, geometry, neuron, name=None, stop_condition=None):
+    def __init__(self, geometry, neuron, name=None, stop_condition=None, substeps=1, period=None, quiescence=None):
         """
         *Parameters*:
 
@@ -47,6 +47,12 @@ class Population(object):
 
             * **stop_condition**: a single condition on a neural variable which can stop the simulation whenever it is true.
 
+            * **substeps**: number of integration steps of size ``dt/substeps`` performed by the population during each simulation step (default: 1). Spiking neurons emit at most one spike per simulation step.
+
+            * **period**: for rate-coded populations, period in ms (multiple of ``dt``) at which the neural variables are updated, using a step size equal to the period (default: dt).
+
+            * **quiescence**: for spiking populations, neurons which did not spike and whose variables changed by less than this value during the last step are at rest: they are not updated until they receive a spike or one of their attributes is set (default: None, all neurons are updated at each step). With ``0.0``, only neurons whose state is exactly stationary are skipped.
+
         """
         # Store the provided geometry
         # automatically defines w, h, d, size
@@ -89,6 +95,44 @@ class Population(object):
         # Store the stop condition
         self.stop_condition = stop_condition
 
+        # Number of integration steps per simulation step
+        if not isinstance(substeps, int) or substeps < 1:
+            Global._error('Population: substeps must be a positive integer.')
+            exit(0)
+        self.substeps = int(substeps)
+
+        # Update period in steps
+        self._update_period = 1
+        if period is not None:
+            nb_steps = int(round(period / Global.config['dt']))
+            if nb_steps < 1 or abs(nb_steps * Global.config['dt'] - period) > 1e-6 * period:
+                Global._error('Population: the period must be a multiple of dt.')
+                exit(0)
+            if self.neuron_type.type == 'spike':
+                Global._error('Population: an update period can only be defined for rate-coded populations.')
+                exit(0)
+            self._update_period = nb_steps
+
+        # Neurons at rest are skipped
+        self._quiescence = None
+        if quiescence is not None:
+            if self.neuron_type.type != 'spike':
+                Global._error('Population: quiescence can only be defined for spiking populations.')
+                exit(0)
+            # A neuron at rest must stay at rest without input
+            description = self.neuron_type.description
+            dependencies = []; code = description['spike']['spike_cond']
+            for var in description['variables']:
+                if var['locality'] == 'local' and 'dependencies' in var.keys(): # r has no equation in spiking neurons
+                    dependencies += var['dependencies']
+                    code += ''.join(var['cpp']) if isinstance(var['cpp'], list) else var['cpp']
+            global_variables = [var['name'] for var in description['variables'] if var['locality'] == 'global']
+            if len(description['random_distributions']) > 0 or 'double(t)' in code \
+                or any([var in dependencies for var in global_variables]):
+                Global._error('Population: quiescence requires neurons whose local equations do not depend on time, random variables or global variables.')
+                exit(0)
+            self._quiescence = float(quiescence)
+
         # Attribute a name if not provided
         self.id = len(Global._network[0]['populations'])
         self.class_name = 'pop'+str(self.id)
@@ -110,6 +154,9 @@ class Population(object):
             self.variables.append(var['name'])
         self.attributes = self.parameters + self.variables
 
+        # Frozen parameters are inlined in the generated code and can not be modified
+        self._frozen = [param['name'] for param in self.neuron_type.description['parameters'] if 'frozen' in param['flags']]
+
         # Store initial values
         self.init = {}
         for param in self.neuron_type.description['parameters']:
@@ -135,6 +182,16 @@ class Population(object):
         self._activated = True
 
         # Rank <-> Coordinates methods
+        self._bind_coordinate_methods()
+
+        # Recorded variables
+        self._monitor = None
+
+        # Is overwritten by SpecificPopulations
+        self._specific_template = {}
+
+    def _bind_coordinate_methods(self):
+        "Rank <-> Coordinates methods, depending on the dimension of the population."
         # for the one till three dimensional case we use cython optimized functions.
         import ANNarchy.core.cython_ext.Coordinates as Coordinates
         if self.dimension==1:
@@ -156,16 +213,34 @@ class Population(object):
             3: Coordinates.get_normalized_3d_coord
         }
 
-        # Recorded variables
-        self._monitor = None
-
-        # Is overwritten by SpecificPopulations
-        self._specific_template = {}
-
     def _generate(self):
         "Overriden by specific populations to generate the code."
         pass
 
+    def _export(self):
+        """
+        Returns the state of the population stored by export_compiled(), without the compiled objects.
+        The neuron type is stored as a plain ``Neuron``, so that its class does not have to be importable.
+        """
+        state = dict(self.__dict__)
+        for attr in ['cyInstance', '_monitor', '_rank_from_coord', '_coord_from_rank', '_norm_coord_dict']:
+            state.pop(attr, None)
+        state['initialized'] = False
+        state['neuron_type'] = Neuron.__new__(Neuron)
+        state['neuron_type'].__dict__.update(self.neuron_type.__dict__)
+        return state
+
+    @classmethod
+    def _from_export(cls, state):
+        "Recreates a population from the state returned by _export(), without analysing the neuron type."
+        pop = cls.__new__(cls)
+        pop.__dict__.update(state)
+        pop.cyInstance = None
+        pop._monitor = None
+        pop._bind_coordinate_methods()
+        Global._network[0]['populations'].append(pop)
+        return pop
+
     def _instantiate(self, module):
         # Create the Cython instance
         self.cyInstance = getattr(module, self.class_name+'_wrapper')(self.size)
@@ -174,7 +249,11 @@ class Population(object):
     def _init_attributes(self):
         """ Method used after compilation to initialize the attributes."""
         self.initialized = True
-        self.set(self.init)
+        for name, value in self.init.items():
+            if name in self._frozen: # can not be set by the user
+                self._set_cython_attribute(name, value)
+            else:
+                self.__setattr__(name, value)
         self.cyInstance.activate(self._activated)
         self.cyInstance.reset()
 
@@ -240,6 +319,9 @@ class Population(object):
             object.__setattr__(self, name, value)
         elif hasattr(self, 'attributes'):
             if name in self.attributes:
+                if name in self._frozen:
+                    Global._error('the parameter ' + name + ' is frozen and can not be modified.')
+                    return
                 if not self.initialized:
                     if isinstance(value, RandomDistribution): # Make sure it is generated only once
                         self.init[name] = np.array(value.get_values(self.size)).reshape(self.geometry)
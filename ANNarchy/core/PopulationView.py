@@ -116,6 +116,9 @@ class PopulationView(object):
             If you modify the value of a parameter, this will be the case for ALL neurons of the population, not only the subset.
         """
         def _set_single(name, rank, value):
+            if name in self.population._frozen:
+                Global._error('the parameter ' + name + ' is frozen and can not be modified.')
+                return
             if not self.population.initialized:
                 if not name in self.population.neuron_type.description['local']:
                     Global._error('can not set the value of a global attribute from a PopulationView.')
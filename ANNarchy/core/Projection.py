@@ -37,7 +37,7 @@ class Projection(object):
     Represents all synapses of the same type between two populations.
     """
 
-    def __init__(self, pre, post, target, synapse=None, name=None):
+    def __init__(self, pre, post, target, synapse=None, name=None, storage_format=None):
         """
         *Parameters*:
 
@@ -46,6 +46,7 @@ class Projection(object):
             * **target**: type of the connection.
             * **synapse**: a ``Synapse`` instance.
             * **name**: unique name of the projection (optional).
+            * **storage_format**: storage of the synapses on CPUs: "lil" (one vector per post-synaptic neuron), "csr" (flat compressed sparse rows), "sell" (sliced ELLPACK, rate-coded projections only) or "auto". By default, the value of ``storage_format`` in ``setup()`` is used.
 
         By default, the synapse only ensures linear synaptic transmission:
 
@@ -121,6 +122,9 @@ class Projection(object):
 
         self.attributes = self.parameters + self.variables
 
+        # Frozen parameters are inlined in the generated code and can not be modified
+        self._frozen = [param['name'] for param in self.synapse_type.description['parameters'] if 'frozen' in param['flags']]
+
         # Add the population to the global network
         Global._network[0]['projections'].append(self)
 
@@ -143,6 +147,12 @@ class Projection(object):
         # If a dense matrix should be used instead of LIL
         self._dense_matrix = False
 
+        # Storage format of the synapses (None: use the global setting)
+        if not storage_format in [None, 'lil', 'csr', 'sell', 'auto']:
+            Global._error('Projection: storage_format must be "lil", "csr", "sell" or "auto", not', storage_format)
+            exit(0)
+        self._storage_format = storage_format
+
         # Recorded variables
         self.recorded_variables = {}
 
@@ -194,9 +204,50 @@ class Projection(object):
         Method used after compilation to initialize the attributes. Called by Generator._instantiate
         """
         for name, val in self.init.items():
-            if not name in ['w']:
+            if name in self._frozen: # can not be set by the user
+                self._set_cython_attribute(name, val)
+            elif not name in ['w']:
                 self.__setattr__(name, val)
 
+    def _export(self):
+        """
+        Returns the state of the projection stored by export_compiled(), without the compiled objects.
+        The connection method is replaced by the connectivity data, and the pre- and post-synaptic
+        populations by their id (and ranks for population views).
+        """
+        state = dict(self.__dict__)
+        state.pop('cyInstance', None)
+        state['initialized'] = False
+        state['_connection_method'] = None
+        state['_connection_args'] = (self._connectivity_data(),)
+        for attr in ['pre', 'post']:
+            pop = getattr(self, attr)
+            if isinstance(pop, PopulationView):
+                state[attr] = (pop.population.id, pop.ranks)
+            else:
+                state[attr] = (pop.id, None)
+        from ANNarchy.core.Synapse import Synapse
+        state['synapse_type'] = Synapse.__new__(Synapse)
+        state['synapse_type'].__dict__.update(self.synapse_type.__dict__)
+        return state
+
+    @classmethod
+    def _from_export(cls, state, populations):
+        "Recreates a projection from the state returned by _export(), without analysing the synapse type."
+        proj = cls.__new__(cls)
+        proj.__dict__.update(state)
+        for attr in ['pre', 'post']:
+            pop_id, ranks = state[attr]
+            if ranks is None:
+                proj.__dict__[attr] = populations[pop_id]
+            else:
+                proj.__dict__[attr] = PopulationView(populations[pop_id], ranks)
+        proj.cyInstance = None
+        proj._connection_method = proj._load_from_csr
+        proj._connection_args = (ConnectorMethods._csr_from_data(proj, state['_connection_args'][0]),)
+        Global._network[0]['projections'].append(proj)
+        return proj
+
     def _connect(self, module):
         """
         Builds up dendrites either from list or dictionary. Called by instantiate().
@@ -249,6 +300,37 @@ class Projection(object):
         "If a single weight should be generated instead of a LIL"
         return self._single_constant_weight and not Global.config['structural_plasticity'] and not self.synapse_type.description['plasticity'] and Global.config['paradigm']=="openmp"
 
+    def _has_csr_storage(self):
+        "If the synapses should be stored in flat CSR arrays instead of a LIL"
+        storage_format = self._storage_format if self._storage_format else Global.config['storage_format']
+        if storage_format == 'lil' or Global.config['paradigm'] != "openmp":
+            return False
+        # Synapses can not be added or removed in a CSR, and specific templates rely on the LIL
+        if Global.config['structural_plasticity'] or self._specific_template != {}:
+            return False
+        if storage_format == 'auto' and self._dense_matrix:
+            return False
+        # CSR is also the fallback when SELL is not applicable
+        return not self._has_sell_storage()
+
+    def _has_sell_storage(self):
+        "If the synapses should be stored in the SELL-C-sigma format (vectorized summation of rate-coded projections)"
+        storage_format = self._storage_format if self._storage_format else Global.config['storage_format']
+        if storage_format != 'sell' or Global.config['paradigm'] != "openmp":
+            return False
+        if self.synapse_type.type != 'rate' or self.synapse_type.operation != 'sum':
+            return False
+        if Global.config['structural_plasticity'] or self._specific_template != {}:
+            return False
+        # Non-uniform delays are not supported
+        if self.max_delay > 1 and self.uniform_delay == -1:
+            return False
+        return True
+
+    def _has_flat_storage(self):
+        "If the local attributes are stored in flat arrays indexed by the synapse (CSR or SELL)"
+        return self._has_csr_storage() or self._has_sell_storage()
+
 
     def reset(self, synapses=False):
         """
@@ -429,6 +511,9 @@ class Projection(object):
                 self._set_flag(name, bool(value))
                 return
             if name in self.attributes:
+                if name in self._frozen:
+                    Global._error('the parameter ' + name + ' is frozen and can not be modified.')
+                    return
                 if not self.initialized:
                     self.init[name] = value
                 else:
@@ -671,7 +756,17 @@ class Projection(object):
             Global._error('save_connectivity(): the network has not been compiled yet.')
             return
         
-        data = {
+        data = self._connectivity_data()
+        try:
+            import cPickle as pickle # Python2
+        except:
+            import pickle # Python3
+        with open(filename, 'wb') as wfile:
+            pickle.dump(data, wfile, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _connectivity_data(self):
+        "Ranks, weights and delays of the compiled projection, as used by connect_from_file()."
+        return {
                 'name': self.name,
                 'post_ranks': self.post_ranks,
                 'pre_ranks': self.cyInstance.pre_rank_all(), # was: [self.cyInstance.pre_rank(n) for n in range(self.size)],
@@ -682,12 +777,6 @@ class Projection(object):
                 'size': self.size,
                 'nb_synapses': sum([self.cyInstance.nb_synapses(n) for n in range(self.size)])
             }
-        try:
-            import cPickle as pickle # Python2
-        except:
-            import pickle # Python3
-        with open(filename, 'wb') as wfile:
-            pickle.dump(data, wfile, protocol=pickle.HIGHEST_PROTOCOL)
 
     def _save_connectivity_as_csv(self):
         """
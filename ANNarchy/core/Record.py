@@ -41,7 +41,7 @@ class Monitor(object):
         
         * **variables**: single variable name or list of variable names to record (default: []).  
 
-        * **period**: delay in ms between two recording (default: dt). Not valid for the ``spike`` variable of a Population(View).
+        * **period**: delay in ms between two recording (default: dt, or the update period of the population). Not valid for the ``spike`` variable of a Population(View).
 
         * **start**: defines if the recording should start immediately (default: True). If not, you should later start the recordings with the ``start()`` method.
 
@@ -61,9 +61,12 @@ class Monitor(object):
         else:
             self.variables = variables
 
-        # Period
+        # Period, by default the update period of the population
         if not period:
             self._period = Global.config['dt']
+            if isinstance(obj, (Population, PopulationView)):
+                population = obj.population if isinstance(obj, PopulationView) else obj
+                self._period = population._update_period * Global.config['dt']
         else:
             self._period = float(period)
 
@@ -152,7 +155,7 @@ class Monitor(object):
         
         * **variables**: single variable name or list of variable names to start recording (default: the ``variables`` argument passed to the constructor).  
 
-        * **period**: delay in ms between two recording (default: dt). Not valid for the ``spike`` variable of a Population(View).
+        * **period**: delay in ms between two recording (default: dt, or the update period of the population). Not valid for the ``spike`` variable of a Population(View).
         """
         if variables:
             if not isinstance(variables, list):
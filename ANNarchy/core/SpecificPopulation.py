@@ -189,6 +189,8 @@ class SpikeSourceArray(Population):
 
     * **spike_times** : a list of times at which a spike should be emitted if the population has 1 neuron, a list of lists otherwise. Times are defined in milliseconds, and will be rounded to the closest multiple of the discretization time step dt.
     * **name**: optional name for the population.
+
+    The spike times are converted into a single list of events sorted by time step, so that each step only processes the neurons which fire. Further spikes can be streamed with ``add_spikes()``.
     """
     def __init__(self, spike_times, name=None):
 
@@ -223,57 +225,122 @@ class SpikeSourceArray(Population):
 
         self.init['spike_times'] = times
 
+    def add_spikes(self, spike_times):
+        """
+        Adds spikes to the neurons, for example to stream input data between two calls to ``simulate()``. Spike times which are already in the past are ignored.
+
+        *Parameters*:
+
+        * **spike_times** : a list of times if the population has 1 neuron, a list of lists otherwise (one list per neuron, possibly empty).
+        """
+        if not isinstance(spike_times, list):
+            Global._error('in SpikeSourceArray, spike_times must be a Python list.')
+            exit(0)
+
+        if self.size == 1 and (len(spike_times) == 0 or not isinstance(spike_times[0], list)):
+            spike_times = [ spike_times ]
+
+        if len(spike_times) != self.size:
+            Global._error('in SpikeSourceArray.add_spikes(), spike_times must contain one list per neuron.')
+            exit(0)
+
+        times = []
+        for neur_times in spike_times:
+            times.append(sorted(list(set(neur_times)))) # suppress doublons and sort
+
+        if self.initialized:
+            self.cyInstance.add_spikes(times)
+        else:
+            self.init['spike_times'] = [sorted(list(set(old + new))) for old, new in zip(self.init['spike_times'], times)]
+
     def _generate(self):
         "Code generation"
         # Do not generate default parameters and variables
         self._specific_template['declare_parameters_variables'] = """
     // Custom local parameter spike_times
-    std::vector< double > r ;
+    std::vector< %(float_prec)s > r ;
     std::vector< std::vector< double > > spike_times ;
-    std::vector< double >  next_spike ;
-    std::vector< int > idx_next_spike;
-"""
+    // Spikes as (step, rank) pairs sorted by step, and the next one to emit
+    std::vector< std::pair< long int, int > > _spike_events ;
+    int _spike_cursor ;
+
+    // Converts the spike times into the sorted list of events (past events are skipped by update())
+    void compile_spike_times() {
+        _spike_events.clear();
+        for(int i = 0; i < spike_times.size(); i++){
+            for(int j = 0; j < spike_times[i].size(); j++){
+                _spike_events.push_back(std::make_pair((long int)(spike_times[i][j]/dt + 0.5), i));
+            }
+        }
+        std::sort(_spike_events.begin(), _spike_events.end());
+        _spike_events.erase(std::unique(_spike_events.begin(), _spike_events.end()), _spike_events.end());
+        _spike_cursor = 0;
+    }
+
+    // Replaces the spike times
+    void set_spike_times(std::vector< std::vector< double > > times) {
+        spike_times = times;
+        compile_spike_times();
+    }
+
+    // Adds spike times to the neurons, only the future ones will be emitted
+    void add_spikes(std::vector< std::vector< double > > times) {
+        // Forget the events already emitted
+        _spike_events.erase(_spike_events.begin(), _spike_events.begin() + _spike_cursor);
+        _spike_cursor = 0;
+        int nb_events = _spike_events.size();
+        for(int i = 0; i < times.size(); i++){
+            if(times[i].empty())
+                continue;
+            int nb_times = spike_times[i].size();
+            for(int j = 0; j < times[i].size(); j++){
+                spike_times[i].push_back(times[i][j]);
+                long int step = (long int)(times[i][j]/dt + 0.5);
+                if(step >= t)
+                    _spike_events.push_back(std::make_pair(step, i));
+            }
+            std::sort(spike_times[i].begin() + nb_times, spike_times[i].end());
+            std::inplace_merge(spike_times[i].begin(), spike_times[i].begin() + nb_times, spike_times[i].end());
+            spike_times[i].erase(std::unique(spike_times[i].begin(), spike_times[i].end()), spike_times[i].end());
+        }
+        std::sort(_spike_events.begin() + nb_events, _spike_events.end());
+        std::inplace_merge(_spike_events.begin(), _spike_events.begin() + nb_events, _spike_events.end());
+        _spike_events.erase(std::unique(_spike_events.begin(), _spike_events.end()), _spike_events.end());
+    }
+""" % {'float_prec': Global._float_type()}
         self._specific_template['access_parameters_variables'] = ""
 
         self._specific_template['init_parameters_variables'] ="""
-        r = std::vector<double>(size, 0.0);
-        next_spike = std::vector<double>(size, -10000.0);
-        for(int i=0; i< size; i++){
-            if(!spike_times[i].empty())
-                next_spike[i] = spike_times[i][0];
-        }
-        idx_next_spike = std::vector<int>(size, 0);
-"""
+        r = std::vector<%(float_prec)s>(size, 0.0);
+        compile_spike_times();
+""" % {'float_prec': Global._float_type()}
 
         self._specific_template['reset_additional'] ="""
-        next_spike = std::vector<double>(size, -10000.0);
-        for(int i=0; i< size; i++){
-            if(!spike_times[i].empty())
-                next_spike[i] = spike_times[i][0];
-        }
-        idx_next_spike = std::vector<int>(size, 0);
+        compile_spike_times();
 """
 
         self._specific_template['update_variables'] ="""
         if(_active){
             spiked.clear();
-            for(int i = 0; i < %(size)s; i++){
-                // Emit spike
-                if( t == (long int)(next_spike[i]/dt) ){
-                    last_spike[i] = t;
-                    idx_next_spike[i]++ ;
-                    if(idx_next_spike[i] < spike_times[i].size())
-                        next_spike[i] = spike_times[i][idx_next_spike[i]];
-                    spiked.push_back(i);
-                }
+            // Skip the past events (inactive population or spike times changed during the simulation)
+            while( (_spike_cursor < _spike_events.size()) && (_spike_events[_spike_cursor].first < t) )
+                _spike_cursor++;
+            // Emit the spikes of the current step
+            while( (_spike_cursor < _spike_events.size()) && (_spike_events[_spike_cursor].first == t) ){
+                int i = _spike_events[_spike_cursor].second;
+                last_spike[i] = t;
+                spiked.push_back(i);
+                _spike_cursor++;
             }
         }
-""" % {'size': self.size}
+"""
 
         self._specific_template['export_parameters_variables'] ="""
         vector[vector[double]] spike_times
-        vector[double] r
-"""
+        vector[%(float_prec)s] r
+        void set_spike_times(vector[vector[double]])
+        void add_spikes(vector[vector[double]])
+""" % {'float_prec': Global._float_type()}
 
         self._specific_template['wrapper_args'] = "size, times"
         self._specific_template['wrapper_init'] = "        pop%(id)s.spike_times = times" % {'id': self.id}
@@ -283,7 +350,9 @@ class SpikeSourceArray(Population):
     cpdef get_spike_times(self):
         return pop%(id)s.spike_times
     cpdef set_spike_times(self, value):
-        pop%(id)s.spike_times = value
+        pop%(id)s.set_spike_times(value)
+    cpdef add_spikes(self, value):
+        pop%(id)s.add_spikes(value)
     # Mean firing rate
     cpdef get_r(self):
         return pop%(id)s.r
@@ -82,18 +82,16 @@ class DecodingProjection(Projection):
 
         self._specific_template['psp_code'] = """
         if (pop%(id_post)s._active){
-            std::vector< std::pair<int, int> > inv_post;
             std::vector<double> rates = std::vector<double>(%(post_size)s, 0.0);
             // Iterate over all incoming spikes
             for(int _idx_j = 0; _idx_j < pop%(id_pre)s.spiked.size(); _idx_j++){
                 rk_j = pop%(id_pre)s.spiked[_idx_j];
-                inv_post = inv_pre_rank[rk_j];
-                nb_post = inv_post.size();
+                nb_post = inv_pre_ptr[rk_j+1];
                 // Iterate over connected post neurons
-                for(int _idx_i = 0; _idx_i < nb_post; _idx_i++){
+                for(int _idx_i = inv_pre_ptr[rk_j]; _idx_i < nb_post; _idx_i++){
                     // Retrieve the correct indices
-                    i = inv_post[_idx_i].first;
-                    j = inv_post[_idx_i].second;
+                    i = inv_dendrite[_idx_i];
+                    j = inv_synapse[_idx_i];
 
                     // Increase the post-synaptic conductance
                     rates[post_rank[i]] +=  w[i][j];
@@ -1,21 +1,34 @@
 # distutils: language = c++
 
 from libcpp.vector cimport vector
+from libcpp.unordered_set cimport unordered_set
+from libcpp.algorithm cimport sort
 from libcpp cimport bool
 
 import numpy as np
 cimport numpy as np
 
-import random
-
-from libc.math cimport exp, fabs, ceil
+from libc.math cimport exp, fabs, ceil, floor, sqrt, log
+cimport cython
+from cython.parallel cimport prange
+
+cdef extern from "<random>" namespace "std" nogil:
+    cdef cppclass mt19937:
+        mt19937()
+        mt19937(unsigned int)
+    cdef cppclass geometric_distribution[T]:
+        geometric_distribution()
+        geometric_distribution(double)
+        T operator()(mt19937&)
+    cdef cppclass uniform_int_distribution[T]:
+        uniform_int_distribution()
+        uniform_int_distribution(T, T)
+        T operator()(mt19937&)
 
 import ANNarchy
 from ANNarchy.core import Global
 from ANNarchy.core.Random import RandomDistribution
 
-cimport ANNarchy.core.cython_ext.Coordinates as Coordinates
-
 ###################################################
 ########## CSR object to hold synapses ############
 ###################################################
@@ -74,6 +87,93 @@ cdef class CSR:
         self.size += 1
         self.nb_synapses += r.size()
 
+    @staticmethod
+    def from_arrays(post_ranks, row_ptr, pre_ranks, w, delays=0.0):
+        """
+        Creates a CSR object from flat arrays in the compressed sparse row layout:
+
+        * **post_ranks**: ranks of the N post-synaptic neurons.
+        * **row_ptr**: N+1 offsets, the synapses of ``post_ranks[i]`` being stored between ``row_ptr[i]`` and ``row_ptr[i+1]`` in the other arrays.
+        * **pre_ranks**: ranks of the pre-synaptic neurons.
+        * **w**: a single weight value or one value per synapse.
+        * **delays**: a single delay (in ms) or one value per synapse.
+
+        NumPy arrays of type int32 (int64 for ``row_ptr``) and float64 are read in place. Empty rows are skipped and post-synaptic neurons appearing several times are merged.
+        """
+        cdef CSR csr = CSR()
+        cdef int i, nb_post
+        cdef long j, start, stop, nnz
+        cdef int[:] posts, pres
+        cdef int[:] int_delays = None
+        cdef np.int64_t[:] ptr
+        cdef double[:] weights = None
+        cdef double weight = 0.0
+        cdef bool single_weight = isinstance(w, (int, float, np.number))
+        cdef bool single_delay = isinstance(delays, (int, float, np.number))
+        cdef vector[int] r, dl
+        cdef vector[double] wv
+
+        posts = np.ascontiguousarray(post_ranks, dtype=np.int32)
+        row_ptr = np.ascontiguousarray(row_ptr, dtype=np.int64)
+        pres = np.ascontiguousarray(pre_ranks, dtype=np.int32)
+        ptr = row_ptr
+        nb_post = posts.shape[0]
+        nnz = pres.shape[0]
+        if ptr.shape[0] != nb_post + 1 or ptr[0] != 0 or ptr[nb_post] != nnz or np.any(np.diff(row_ptr) < 0):
+            ANNarchy.core.Global._error('CSR.from_arrays(): row_ptr must contain len(post_ranks)+1 increasing offsets, from 0 to len(pre_ranks).')
+            exit(0)
+
+        # Weights
+        if single_weight:
+            weight = w
+        else:
+            weights = np.ascontiguousarray(w, dtype=np.float64)
+            if weights.shape[0] != nnz:
+                ANNarchy.core.Global._error('CSR.from_arrays(): w must be a single value or have the same size as pre_ranks.')
+                exit(0)
+
+        # Delays are stored in steps, a single value per dendrite if uniform
+        if single_delay:
+            dl.push_back(int(delays/csr.dt))
+            csr.max_delay = dl[0]
+            csr.uniform_delay = dl[0]
+        else:
+            delays = np.asarray(delays, dtype=np.float64)
+            if delays.shape[0] != nnz:
+                ANNarchy.core.Global._error('CSR.from_arrays(): delays must be a single value or have the same size as pre_ranks.')
+                exit(0)
+            int_delays = (delays/csr.dt).astype(np.int32)
+            if nnz > 0:
+                csr.max_delay = int(np.max(delays)/csr.dt)
+
+        for i in range(nb_post):
+            start = ptr[i]
+            stop = ptr[i+1]
+            if stop <= start:
+                continue
+            r.clear()
+            for j in range(start, stop):
+                r.push_back(pres[j])
+            if single_weight:
+                wv.assign(stop - start, weight)
+            else:
+                wv.clear()
+                for j in range(start, stop):
+                    wv.push_back(weights[j])
+            if not single_delay:
+                dl.clear()
+                for j in range(start, stop):
+                    dl.push_back(int_delays[j])
+            csr.post_rank.push_back(posts[i])
+            csr.pre_rank.push_back(r)
+            csr.w.push_back(wv)
+            csr.delay.push_back(dl)
+            csr.size += 1
+            csr.nb_synapses += stop - start
+
+        csr.validate()
+        return csr
+
     cpdef int get_max_delay(self):
         return self.max_delay
 
@@ -81,58 +181,74 @@ cdef class CSR:
         return self.uniform_delay
 
     cpdef validate(self):
-        cdef int idx, single, rk
-        cdef vector[int] ranks
+        cdef int g, k, idx, nb_groups
+        cdef long j
+        cdef np.int64_t[:] order, starts, groups
+        cdef vector[int] ranks, sorted_ranks
         cdef vector[double] weights
         cdef vector[int] delays
-        cdef dict doubletons = {}
-        cdef list postranks = list(self.post_rank)
-        cdef list set_postranks = list(set(postranks))
-        cdef list preranks, set_preranks, indices
-
-        if len(postranks) != len(set_postranks):
-            ANNarchy.core.Global._warning('You have added several times the same post-synaptic neuron to the CSR data in your connector method.')
-            ANNarchy.core.Global._print('ANNarchy will try to sort the entries if possible, it may take some time...')
-        else: 
+        cdef vector[int] post_rank
+        cdef vector[vector[int]] pre_rank, delay
+        cdef vector[vector[double]] w
+
+        if self.post_rank.size() < 2:
+            return
+
+        # Sort the post-synaptic ranks, the doubled ones become neighbours
+        postranks = np.array(self.post_rank, dtype=np.int32)
+        sorted_order = np.argsort(postranks, kind='mergesort')
+        sorted_post = postranks[sorted_order]
+        is_start = np.ones(len(sorted_post), dtype=np.bool_)
+        is_start[1:] = sorted_post[1:] != sorted_post[:-1]
+        if np.all(is_start):
             return
 
-        # Find out which post neurons are doubled.
-        for single in set_postranks:
-            doubletons[single] = []
-            for idx, possible_double in enumerate(postranks):
-                if possible_double == single:
-                    doubletons[single].append(idx)
-            if len(doubletons[single]) == 1 : # Only one occurence
-                doubletons.pop(single)
-
-        # Gather the info
-        for rk, indices in doubletons.items():
-            # Store the different infos
+        ANNarchy.core.Global._warning('You have added several times the same post-synaptic neuron to the CSR data in your connector method.')
+        ANNarchy.core.Global._print('ANNarchy will merge the corresponding entries.')
+
+        # Groups of dendrites with the same post-synaptic rank, in order of first appearance (the sort is stable)
+        order = sorted_order.astype(np.int64)
+        group_starts = np.append(np.flatnonzero(is_start), len(sorted_post))
+        starts = group_starts.astype(np.int64)
+        groups = np.argsort(sorted_order[group_starts[:-1]], kind='mergesort').astype(np.int64)
+        nb_groups = groups.shape[0]
+
+        for k in range(nb_groups):
+            g = groups[k]
+            idx = order[starts[g]]
+            post_rank.push_back(self.post_rank[idx])
+            if starts[g+1] - starts[g] == 1:
+                pre_rank.push_back(self.pre_rank[idx])
+                w.push_back(self.w[idx])
+                delay.push_back(self.delay[idx])
+                continue
+
+            # Gather the data
             ranks.clear()
             weights.clear()
             delays.clear()
-            for idx in reversed(indices): # Start from below, otherwise deletion crashes
-                # Gather data
+            for j in range(starts[g], starts[g+1]):
+                idx = order[j]
                 ranks.insert(ranks.end(), self.pre_rank[idx].begin(), self.pre_rank[idx].end())
                 weights.insert(weights.end(), self.w[idx].begin(), self.w[idx].end())
                 delays.insert(delays.end(), self.delay[idx].begin(), self.delay[idx].end())
-                # Delete the old vectors
-                self.post_rank.erase(self.post_rank.begin()+idx)
-                self.pre_rank.erase(self.pre_rank.begin()+idx)
-                self.w.erase(self.w.begin()+idx)
-                self.delay.erase(self.delay.begin()+idx)
 
             # Check if no synapse is doubled
-            preranks = list(ranks)
-            set_preranks = list(set(preranks))
-            if len(preranks) != len(set_preranks):
-                ANNarchy.core.Global._error('The same synapse has been declared multiple times! Check your code.', exit=True)
+            sorted_ranks = ranks
+            sort(sorted_ranks.begin(), sorted_ranks.end())
+            for idx in range(1, sorted_ranks.size()):
+                if sorted_ranks[idx] == sorted_ranks[idx-1]:
+                    ANNarchy.core.Global._error('The same synapse has been declared multiple times! Check your code.', exit=True)
+
+            pre_rank.push_back(ranks)
+            w.push_back(weights)
+            delay.push_back(delays)
 
-            # Add the new data
-            self.post_rank.push_back(rk)
-            self.pre_rank.push_back(ranks)
-            self.w.push_back(weights)
-            self.delay.push_back(delays)
+        self.post_rank.swap(post_rank)
+        self.pre_rank.swap(pre_rank)
+        self.w.swap(w)
+        self.delay.swap(delay)
+        self.size = self.post_rank.size()
 
 
 cdef _get_weights_delays(int size, weights, delays):
@@ -165,7 +281,8 @@ def all_to_all(pre, post, weights, delays, allow_self_connections):
     cdef CSR projection
     cdef double weight
     cdef int r_post, size_pre, i
-    cdef list tmp, post_ranks, pre_ranks
+    cdef list post_ranks
+    cdef vector[int] pre_ranks
     cdef vector[int] r
     cdef vector[double] w, d
 
@@ -184,14 +301,13 @@ def all_to_all(pre, post, weights, delays, allow_self_connections):
 
     for r_post in post_ranks:
         # List of pre ranks
-        tmp = [i for i  in pre_ranks]
+        r = pre_ranks
         if not allow_self_connections:
-            try:
-                tmp.remove(r_post)
-            except: # was not in the list
-                pass
-        r = tmp
-        size_pre = len(tmp)
+            for i in range(r.size()):
+                if r[i] == r_post:
+                    r.erase(r.begin() + i)
+                    break
+        size_pre = r.size()
         # Weights
         if isinstance(weights, (int, float)):
             weight = weights
@@ -265,66 +381,173 @@ def one_to_one(pre, post, weights, delays, shift):
 
 
 
+cdef int _bernoulli_process(double probability, long size, unsigned int seed, vector[long] &indices) except -1 nogil:
+    """ Sorted indices in [0, size) selected independently with the given probability. The gaps between two selected indices follow a geometric distribution, so the cost is proportional to the number of selected indices."""
+
+    cdef long index
+
+    # The geometric distribution requires 0 < p < 1
+    if probability >= 1.0:
+        for index in range(size):
+            indices.push_back(index)
+        return 0
+
+    cdef mt19937 generator = mt19937(seed)
+    cdef geometric_distribution[long] gap = geometric_distribution[long](probability)
+    index = gap(generator)
+
+    while index < size:
+        indices.push_back(index)
+        index += gap(generator) + 1
+
+    return 0
+
 def fixed_probability(pre, post, probability, weights, delays, allow_self_connections):
     """ Cython implementation of the fixed_probability pattern."""
 
     cdef CSR projection
-    cdef double weight
-    cdef int r_post, r_pre, size_pre, max_size_pre
+    cdef double weight, proba
+    cdef int r_post, size_pre, max_size_pre, nb_post, block_size, nb_blocks, group_start, nb_group, b, block_start, nb_block, i
+    cdef long k, first, last
+    cdef int nb_threads = Global.config['num_threads']
+    cdef bool allow_self = allow_self_connections
     cdef list post_ranks
+    cdef vector[int] pre_ranks
+    cdef vector[unsigned int] seeds
+    cdef vector[vector[long]] indices
     cdef vector[int] r
     cdef vector[double] w, d
-    cdef np.ndarray random_values, tmp, pre_ranks
 
     # Retríeve ranks
     if hasattr(post, 'ranks'): # PopulationView
         post_ranks = post.ranks
     else: # Plain population
         post_ranks = list(range(post.size))
+    nb_post = len(post_ranks)
 
     if hasattr(pre, 'ranks'): # PopulationView
-        pre_ranks = np.array(pre.ranks)
+        pre_ranks = list(pre.ranks)
         max_size_pre = len(pre.ranks)
     else:
-        pre_ranks = np.arange(pre.size)
+        pre_ranks = list(range(pre.size))
         max_size_pre = pre.size
 
     # Create the projection data as CSR
     projection = CSR()
-
-    for r_post in post_ranks:
-        # List of pre ranks
-        random_values = np.random.random(max_size_pre)
-        tmp = pre_ranks[random_values < probability]
-        if not allow_self_connections:
-            tmp = tmp[tmp != r_post]
-        r = tmp
-        size_pre = tmp.size
-        if size_pre == 0:
-            continue
-        # Weights
-        if isinstance(weights, (int, float)):
-            weight = weights
-            w = vector[double](1, weight)
-        elif isinstance(weights, RandomDistribution):
-            w = weights.get_list_values(size_pre)
-        # Delays
-        if isinstance(delays, (float, int)):
-            d = vector[double](1, delays)
-        elif isinstance(delays, RandomDistribution):
-            d = delays.get_list_values(size_pre)
-        # Create the dendrite
-        projection.push_back(r_post, r, w, d)
+    if probability <= 0.0 or nb_post == 0:
+        return projection
+    proba = min(probability, 1.0)
+
+    # The (post, pre) pairs of several post-synaptic neurons are drawn at once, about 10^6 synapses per block
+    block_size = <int>min(nb_post, max(1, 1e6 / (max_size_pre * proba)))
+    nb_blocks = (nb_post + block_size - 1) // block_size
+
+    # Each block has its own random stream, seeded from numpy so that the result only depends on the seed given to setup()
+    seeds = np.random.randint(0, 2**31 - 1, nb_blocks).tolist()
+
+    # Groups of blocks are drawn in parallel, then inserted in the CSR object
+    for group_start in range(0, nb_blocks, nb_threads):
+        nb_group = min(nb_threads, nb_blocks - group_start)
+        indices = vector[vector[long]](nb_group)
+        with nogil:
+            for b in prange(nb_group, num_threads=nb_threads, schedule='dynamic'):
+                _bernoulli_process(proba, <long>min(block_size, nb_post - (group_start + b) * block_size) * max_size_pre, seeds[group_start + b], indices[b])
+
+        for b in range(nb_group):
+            block_start = (group_start + b) * block_size
+            nb_block = min(block_size, nb_post - block_start)
+            k = 0
+            for i in range(nb_block):
+                r_post = post_ranks[block_start + i]
+                # List of pre ranks
+                r.clear()
+                first = <long>i * max_size_pre
+                last = first + max_size_pre
+                while k < indices[b].size() and indices[b][k] < last:
+                    if allow_self or pre_ranks[indices[b][k] - first] != r_post:
+                        r.push_back(pre_ranks[indices[b][k] - first])
+                    k += 1
+                size_pre = r.size()
+                if size_pre == 0:
+                    continue
+                # Weights
+                if isinstance(weights, (int, float)):
+                    weight = weights
+                    w = vector[double](1, weight)
+                elif isinstance(weights, RandomDistribution):
+                    w = weights.get_list_values(size_pre)
+                # Delays
+                if isinstance(delays, (float, int)):
+                    d = vector[double](1, delays)
+                elif isinstance(delays, RandomDistribution):
+                    d = delays.get_list_values(size_pre)
+                # Create the dendrite
+                projection.push_back(r_post, r, w, d)
 
     return projection
 
+cdef int _sample_block(unsigned int seed, int start, int nb, int number, int size, vector[int] &excluded, vector[vector[int]] &result) except -1 nogil:
+    """ For the elements start to start+nb-1, sorted distinct indices in [0, size) different from excluded[i] (if positive), drawn with Floyd's algorithm. """
+
+    cdef mt19937 generator = mt19937(seed)
+    cdef uniform_int_distribution[int] uniform
+    cdef unordered_set[int] selected
+    cdef int i, j, k, n, t
+
+    for i in range(start, start + nb):
+        n = size - 1 if excluded[i] >= 0 else size
+        k = min(number, n)
+        selected.clear()
+        for j in range(n - k, n):
+            uniform = uniform_int_distribution[int](0, j)
+            t = uniform(generator)
+            if selected.count(t) > 0:
+                t = j
+            selected.insert(t)
+            # Skip the excluded index
+            if excluded[i] >= 0 and t >= excluded[i]:
+                t += 1
+            result[i].push_back(t)
+        sort(result[i].begin(), result[i].end())
+
+    return 0
+
+cdef vector[vector[int]] _fixed_number(int number, int size, vector[int] &excluded):
+    """ Draws number distinct indices in [0, size) for each element of excluded. Blocks of elements are drawn in parallel with their own random stream, seeded from numpy so that the result only depends on the seed given to setup()."""
+
+    cdef int b, nb = excluded.size(), block_size = 1024
+    cdef int nb_blocks = (nb + block_size - 1) // block_size
+    cdef int nb_threads = Global.config['num_threads']
+    cdef vector[unsigned int] seeds
+    cdef vector[vector[int]] result = vector[vector[int]](nb)
+
+    if nb_blocks > 0:
+        seeds = np.random.randint(0, 2**31 - 1, nb_blocks).tolist()
+    with nogil:
+        for b in prange(nb_blocks, num_threads=nb_threads, schedule='dynamic'):
+            _sample_block(seeds[b], b * block_size, min(block_size, nb - b * block_size), number, size, excluded, result)
+
+    return result
+
+cdef vector[int] _positions(list ranks, list targets, bool allow_self):
+    """ Position of each rank of targets in ranks (-1 if absent or if self-connections are allowed). """
+
+    cdef dict position = {rk: i for i, rk in enumerate(ranks)}
+    cdef vector[int] result
+
+    for rk in targets:
+        result.push_back(-1 if allow_self else position.get(rk, -1))
+
+    return result
+
 def fixed_number_pre(pre, post, int number, weights, delays, allow_self_connections):
     """ Cython implementation of the fixed_number_pre pattern."""
 
     cdef CSR projection
     cdef double weight
-    cdef int r_post, r_pre, size_pre
+    cdef int r_post, size_pre, i, j
     cdef list pre_ranks, post_ranks
+    cdef vector[vector[int]] indices
     cdef vector[int] r
     cdef vector[double] w, d
     
@@ -338,28 +561,36 @@ def fixed_number_pre(pre, post, int number, weights, delays, allow_self_connecti
     else:
         pre_ranks = list(range(pre.size))
 
+    if number > len(pre_ranks):
+        Global._error('connect_fixed_number_pre: the pre-synaptic population has less than', number, 'neurons.')
+        exit(0)
+
+    # Positions in pre_ranks of the pre-synaptic neurons of each post-synaptic neuron
+    indices = _fixed_number(number, len(pre_ranks), _positions(pre_ranks, post_ranks, allow_self_connections))
+
     # Create the projection data as CSR
     projection = CSR()
 
-    for r_post in post_ranks:
+    for i in range(len(post_ranks)):
+        r_post = post_ranks[i]
         # List of pre ranks
-        r = random.sample(pre_ranks, number)
-        if len(r) == 0:
+        r.clear()
+        for j in range(indices[i].size()):
+            r.push_back(pre_ranks[indices[i][j]])
+        size_pre = r.size()
+        if size_pre == 0:
             continue
-        if not allow_self_connections:
-            while r_post in list(r): # the post index is in the list
-                r = random.sample(pre_ranks, number)
         # Weights
         if isinstance(weights, (int, float)):
             weight = weights
             w = vector[double](1, weight)
         elif isinstance(weights, RandomDistribution):
-            w = weights.get_list_values(number)
+            w = weights.get_list_values(size_pre)
         # Delays
         if isinstance(delays, (float, int)):
             d = vector[double](1, delays)
         elif isinstance(delays, RandomDistribution):
-            d = delays.get_list_values(number)
+            d = delays.get_list_values(size_pre)
         # Create the dendrite
         projection.push_back(r_post, r, w, d)
 
@@ -370,10 +601,9 @@ def fixed_number_post(pre, post, int number, weights, delays, allow_self_connect
 
     cdef CSR projection
     cdef double weight
-    cdef int r_post, r_pre, size_pre
+    cdef int r_post, size_pre, i, j
     cdef list pre_ranks, post_ranks
-    cdef list pre_r, tmp
-    cdef dict rk_mat
+    cdef vector[vector[int]] indices, rk_mat
     cdef vector[int] r
     cdef vector[double] w, d
     
@@ -387,28 +617,24 @@ def fixed_number_post(pre, post, int number, weights, delays, allow_self_connect
     else:
         pre_ranks = list(range(pre.size))
 
-    # Create the projection data as CSR
-    projection = CSR()
-    
+    # Positions in post_ranks of the post-synaptic neurons of each pre-synaptic neuron
+    indices = _fixed_number(number, len(post_ranks), _positions(post_ranks, pre_ranks, allow_self_connections))
 
     # Build the backward matrix
-    rk_mat = {i: [] for i in post_ranks}
-    for r_pre in pre_ranks:
-        if number >= len(post_ranks):
-            tmp = post_ranks
-        else:
-            tmp = random.sample(post_ranks, number)
-            if not allow_self_connections:
-                while r_pre in tmp: # the post index is in the list
-                    tmp = random.sample(post_ranks, number)
-        for i in tmp:
-            rk_mat[i].append(r_pre)
+    rk_mat = vector[vector[int]](len(post_ranks))
+    for i in range(len(pre_ranks)):
+        for j in range(indices[i].size()):
+            rk_mat[indices[i][j]].push_back(pre_ranks[i])
+
+    # Create the projection data as CSR
+    projection = CSR()
 
     # Create the dendrites
-    for r_post in post_ranks:
+    for i in range(len(post_ranks)):
+        r_post = post_ranks[i]
         # List of pre ranks
-        r = rk_mat[r_post]
-        size_pre = len(r)
+        r = rk_mat[i]
+        size_pre = r.size()
         if size_pre == 0:
             continue
         # Weights
@@ -427,161 +653,167 @@ def fixed_number_post(pre, post, int number, weights, delays, allow_self_connect
 
     return projection
 
-def gaussian(pre_pop, post_pop, float amp, float sigma, delays, limit, allow_self_connections):
-    """ Cython implementation of the fixed_number_post pattern."""
+cdef np.ndarray _normalized_coordinates(tuple geometry, int size):
+    """ Normalized coordinates of all neurons of a population (one row per rank). 2D and 3D coordinates are stored in single precision as in Coordinates. """
+    cdef int c
+    cdef np.ndarray coords
+
+    coords = np.array(np.unravel_index(np.arange(size), geometry), dtype=np.float64).T.copy()
+    for c in range(len(geometry)):
+        if geometry[c] > 1:
+            coords[:, c] /= float(geometry[c] - 1)
+    if len(geometry) in [2, 3]:
+        coords = coords.astype(np.float32).astype(np.float64)
+    return coords
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef int _distance_dendrite(int post, double[:, :] pre_coords, double[:, :] post_coords, vector[int] &geometry, vector[int] &strides, float amp_pos, float sigma_pos, float amp_neg, float sigma_neg, double threshold, double radius, bool allow_self, bool dog, vector[int] &r, vector[double] &w) except -1 nogil:
+    """
+    Dendrite of the post-synaptic neuron post in the gaussian and dog patterns. Only the pre-synaptic neurons inside
+    the box of half-width radius (in normalized coordinates) around it are tested. A negative radius means no cutoff.
+    """
+    cdef float distance, value
+    cdef double diff
+    cdef int pre, c, dim = geometry.size()
+    cdef vector[int] lower = vector[int](dim, 0)
+    cdef vector[int] upper = vector[int](dim, 0)
+    cdef vector[int] idx = vector[int](dim, 0)
+
+    # Box of pre-synaptic neurons around the post-synaptic one, with a margin of one neuron for rounding errors
+    for c in range(dim):
+        if radius < 0.0 or geometry[c] == 1:
+            lower[c] = 0
+            upper[c] = geometry[c] - 1
+        else:
+            lower[c] = max(0, <int>floor((post_coords[post, c] - radius) * (geometry[c] - 1)) - 1)
+            upper[c] = min(geometry[c] - 1, <int>ceil((post_coords[post, c] + radius) * (geometry[c] - 1)) + 1)
+        idx[c] = lower[c]
+
+    # Visit the box in increasing rank order
+    while True:
+        pre = 0
+        for c in range(dim):
+            pre += idx[c] * strides[c]
+
+        if allow_self or pre != post:
+            distance = 0.0
+            for c in range(dim):
+                diff = pre_coords[pre, c] - post_coords[post, c]
+                distance += diff * diff
+            if dog:
+                value = amp_pos * exp(-distance/(2.0*sigma_pos**2)) - amp_neg * exp(-distance/(2.0*sigma_neg**2))
+                if fabs(value) > threshold:
+                    r.push_back(pre)
+                    w.push_back(value)
+            else:
+                value = amp_pos * exp(-distance/(2.0*sigma_pos**2))
+                if value > threshold:
+                    r.push_back(pre)
+                    w.push_back(value)
+
+        # Next neuron in the box
+        c = dim - 1
+        while c >= 0:
+            idx[c] += 1
+            if idx[c] <= upper[c]:
+                break
+            idx[c] = lower[c]
+            c -= 1
+        if c < 0:
+            break
 
+    return 0
+
+cdef CSR _distance_profile(pre_pop, post_pop, float amp_pos, float sigma_pos, float amp_neg, float sigma_neg, double threshold, double radius, delays, allow_self_connections, bool dog):
+    """
+    Common implementation of the gaussian and dog patterns. Blocks of dendrites are computed in parallel, then inserted in the CSR object.
+    """
     cdef CSR projection
-    cdef float distance, value
-    cdef int post, pre, pre_size, post_size, c, nb_synapses, pre_dim, post_dim
-    cdef tuple pre_coord, post_coord
+    cdef int post, pre_size, post_size, c, dim, nb_synapses, block_start, block_size, nb_block
+    cdef int nb_threads = Global.config['num_threads']
+    cdef bool allow_self = allow_self_connections
     cdef tuple pre_geometry, post_geometry
-    cdef list ranks, values
+    cdef double[:, :] pre_coords, post_coords
+    cdef vector[int] geometry, strides
+    cdef vector[vector[int]] ranks
+    cdef vector[vector[double]] values
+
+    cdef vector[double] d
+
+    # Population geometries
+    pre_geometry = (pre_pop.geometry, ) if isinstance(pre_pop.geometry, int) else tuple(pre_pop.geometry)
+    post_geometry = (post_pop.geometry, ) if isinstance(post_pop.geometry, int) else tuple(post_pop.geometry)
+    dim = len(pre_geometry)
+    if len(post_geometry) < dim:
+        Global._error('the post-synaptic population must have at least as many dimensions as the pre-synaptic one.')
+        exit(0)
+    pre_size = int(np.prod(pre_geometry))
+    post_size = int(np.prod(post_geometry))
+
+    # Normalized coordinates of all neurons, computed once
+    pre_coords = _normalized_coordinates(pre_geometry, pre_size)
+    post_coords = _normalized_coordinates(post_geometry, post_size)
+
+    # Row-major strides of the pre-synaptic population
+    geometry = vector[int](dim, 0)
+    strides = vector[int](dim, 1)
+    for c in range(dim):
+        geometry[c] = pre_geometry[c]
+    for c in range(dim-2, -1, -1):
+        strides[c] = strides[c+1] * geometry[c+1]
 
-    cdef vector[int] r
-    cdef vector[double] w, d
+    # Create the projection data as CSR
+    projection = CSR()
+    block_size = 256 * nb_threads
+    for block_start in range(0, post_size, block_size):
+        nb_block = min(block_size, post_size - block_start)
+        ranks = vector[vector[int]](nb_block)
+        values = vector[vector[double]](nb_block)
+
+        # The dendrites of the block are independent
+        with nogil:
+            for post in prange(nb_block, num_threads=nb_threads, schedule='dynamic'):
+                _distance_dendrite(block_start + post, pre_coords, post_coords, geometry, strides, amp_pos, sigma_pos, amp_neg, sigma_neg, threshold, radius, allow_self, dog, ranks[post], values[post])
+
+        for post in range(nb_block):
+            nb_synapses = ranks[post].size()
+            if isinstance(delays, (float, int)):
+                d = vector[double](1, delays)
+            elif isinstance(delays, RandomDistribution):
+                d = delays.get_list_values(nb_synapses)
 
+            # Create the dendrite
+            projection.push_back(block_start + post, ranks[post], values[post], d)
 
-    # Retrieve simulation time step
-    dt = Global.config['dt']
+    return projection
 
-    # Population sizes
-    pre_geometry = pre_pop.geometry
-    post_geometry = post_pop.geometry
-    if isinstance(pre_geometry, int):
-        pre_size = pre_geometry
-        pre_dim = 1
-    else:
-        pre_dim = len(pre_geometry)
-        pre_size = 1
-        for c in pre_geometry:
-            pre_size  = pre_size * c
-    if isinstance(post_geometry, int):
-        post_size = post_geometry
-        post_dim = 1
+def gaussian(pre_pop, post_pop, float amp, float sigma, delays, limit, allow_self_connections):
+    """ Cython implementation of the gaussian pattern."""
+
+    cdef double threshold, radius
+
+    # Synapses are created if amp * exp(-d^2/(2 sigma^2)) > limit * amp, i.e. if d^2 < -2 sigma^2 log(limit)
+    threshold = limit * amp
+    if amp > 0.0 and limit > 0.0:
+        radius = sqrt(max(0.0, -2.0 * sigma**2 * log(limit)))
     else:
-        post_dim = len(post_geometry)
-        post_size = 1
-        for c in post_geometry:
-            post_size  = post_size * c
-    
-    # Create the projection data as CSR
-    projection = CSR()
-    for post in list(range(post_size)):
-        ranks = []
-        values = []
-        if post_dim == 1:
-            post_coord = (post/float(post_size-1), )
-        elif post_dim == 2:
-            post_coord = Coordinates.get_normalized_2d_coord(post, post_geometry)
-        elif post_dim == 3:
-            post_coord = Coordinates.get_normalized_3d_coord(post, post_geometry)
-        else:
-            post_coord = Coordinates.get_normalized_coord(post, post_geometry)
-        for pre in list(range(pre_size)):
-            if not allow_self_connections and pre==post:
-                continue
-            if pre_dim == 1:
-                pre_coord = (pre/float(pre_size-1), )
-                distance = Coordinates.comp_dist1D(pre_coord, post_coord)
-            elif pre_dim == 2:
-                pre_coord = Coordinates.get_normalized_2d_coord(pre, pre_geometry)
-                distance = Coordinates.comp_dist2D(pre_coord, post_coord)
-            elif pre_dim == 3:
-                pre_coord = Coordinates.get_normalized_3d_coord(pre, pre_geometry)
-                distance = Coordinates.comp_dist3D(pre_coord, post_coord)
-            else:
-                pre_coord = Coordinates.get_normalized_coord(pre, pre_geometry)
-                distance = Coordinates.comp_distND(pre_coord, post_coord)
-            value = amp * exp(-distance/(2.0*sigma**2))
-            if value > limit * amp:
-                ranks.append(pre)
-                values.append(value)
-        nb_synapses = len(ranks)
-        r = ranks
-        w = values
-        if isinstance(delays, (float, int)):
-            d = vector[double](1, delays)
-        elif isinstance(delays, RandomDistribution):
-            d = delays.get_list_values(nb_synapses)
-        # Create the dendrite
-        projection.push_back(post, r, w, d)
+        radius = -1.0
 
-    return projection
+    return _distance_profile(pre_pop, post_pop, amp, sigma, 0.0, 1.0, threshold, radius, delays, allow_self_connections, False)
 
 def dog(pre_pop, post_pop, float amp_pos, float sigma_pos, float amp_neg, float sigma_neg, delays, limit, allow_self_connections):
-    """ Cython implementation of the fixed_number_post pattern."""
-
-    cdef CSR projection
-    cdef float distance, value
-    cdef int post, pre, pre_size, post_size, c, nb_synapses, pre_dim, post_dim
-    cdef tuple pre_coord, post_coord
-    cdef tuple pre_geometry, post_geometry
-    cdef list ranks, values
+    """ Cython implementation of the dog pattern."""
 
-    cdef vector[int] r
-    cdef vector[double] w, d
+    cdef double threshold, radius, total, sigma
 
-    # Population sizes
-    pre_geometry = pre_pop.geometry
-    post_geometry = post_pop.geometry
-    if isinstance(pre_geometry, int):
-        pre_size = pre_geometry
-        pre_dim = 1
+    # The absolute value of the profile is below (|amp_pos| + |amp_neg|) * exp(-d^2/(2 max(sigma)^2))
+    threshold = limit * fabs(amp_pos - amp_neg)
+    total = fabs(amp_pos) + fabs(amp_neg)
+    sigma = max(fabs(sigma_pos), fabs(sigma_neg))
+    if threshold > 0.0 and total > 0.0:
+        radius = sqrt(max(0.0, -2.0 * sigma**2 * log(threshold / total)))
     else:
-        pre_dim = len(pre_geometry)
-        pre_size = 1
-        for c in pre_geometry:
-            pre_size  = pre_size * c
-    if isinstance(post_geometry, int):
-        post_size = post_geometry
-        post_dim = 1
-    else:
-        post_dim = len(post_geometry)
-        post_size = 1
-        for c in post_geometry:
-            post_size  = post_size * c
-    
-    # Create the projection data as CSR
-    projection = CSR()
-    for post in list(range(post_size)):
-        ranks = []
-        values = []
-        if post_dim == 1:
-            post_coord = (post/float(post_size-1), )
-        elif post_dim == 2:
-            post_coord = Coordinates.get_normalized_2d_coord(post, post_geometry)
-        elif post_dim == 3:
-            post_coord = Coordinates.get_normalized_3d_coord(post, post_geometry)
-        else:
-            post_coord = Coordinates.get_normalized_coord(post, post_geometry)
-        for pre in list(range(pre_size)):
-            if not allow_self_connections and pre==post:
-                continue
-            if pre_dim == 1:
-                pre_coord = (pre/float(pre_size-1), )
-                distance = Coordinates.comp_dist1D(pre_coord, post_coord)
-            elif pre_dim == 2:
-                pre_coord = Coordinates.get_normalized_2d_coord(pre, pre_geometry)
-                distance = Coordinates.comp_dist2D(pre_coord, post_coord)
-            elif pre_dim == 3:
-                pre_coord = Coordinates.get_normalized_3d_coord(pre, pre_geometry)
-                distance = Coordinates.comp_dist3D(pre_coord, post_coord)
-            else:
-                pre_coord = Coordinates.get_normalized_coord(pre, pre_geometry)
-                distance = Coordinates.comp_distND(pre_coord, post_coord)
-            value = amp_pos * exp(-distance/(2.0*sigma_pos**2)) - amp_neg * exp(-distance/(2.0*sigma_neg**2))
-            if fabs(value) > limit * fabs(amp_pos - amp_neg):
-                ranks.append(pre)
-                values.append(value)
-        nb_synapses = len(ranks)
-        r = ranks
-        w = values
-        if isinstance(delays, (float, int)):
-            d = vector[double](1, delays)
-        elif isinstance(delays, RandomDistribution):
-            d = delays.get_list_values(nb_synapses)
+        radius = -1.0
 
-        # Create the dendrite
-        projection.push_back(post, r, w, d)
-
-    return projection
+    return _distance_profile(pre_pop, post_pop, amp_pos, sigma_pos, amp_neg, sigma_neg, threshold, radius, delays, allow_self_connections, True)
@@ -85,10 +85,12 @@ class CodeGenerator(object):
               objects, which should be accessible from Python
             * for each population a seperate header file, contain semantic
               logic of a population respectively neuron object (filename:
-              pop<id>).
+              pop<id>). With OpenMP, the methods are compiled in a separate
+              translation unit pop<id>.cpp.
             * for each projection a seperate header file, contain semantic
               logic of a projection respectively synapse object (filename:
-              proj<id>)
+              proj<id>). With OpenMP, the methods are compiled in a separate
+              translation unit proj<id>.cpp.
         """
         if Global.config['verbose']:
             if Global.config['num_threads'] > 1:
@@ -500,7 +502,7 @@ class CodeGenerator(object):
             from .Template.GlobalOperationTemplate import global_operation_templates_openmp as omp_template
             code = ""
             for op in list(set(ops)):
-                code += omp_template[op] % {'omp': '' if Global.config['num_threads'] > 1 else "//"}
+                code += omp_template[op] % {'omp': '' if Global.config['num_threads'] > 1 else "//", 'type': Global._float_type()}
 
             return code
         else:
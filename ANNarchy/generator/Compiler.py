@@ -25,6 +25,8 @@ import os, sys, imp
 import subprocess
 import shutil
 import time
+import hashlib
+import platform
 import numpy as np
 import re
 
@@ -33,14 +35,40 @@ import ANNarchy
 import ANNarchy.core.Global as Global
 from .Template.MakefileTemplate import *
 
-from optparse import OptionParser
-from optparse import OptionGroup
-
-from distutils.sysconfig import get_python_inc, get_python_lib
-
 # String containing the extra libs which can be added by extensions
 # e.g. extra_libs = ['-lopencv_core', '-lopencv_video']
 extra_libs = []
+
+# Targets resolved by -march=native, per compiler
+_native_targets = {}
+
+def _native_target(compiler):
+    """
+    Description of the host CPU as seen by the compiler: the options it passes
+    to its backend with -march=native (architecture, instruction sets, caches).
+    Libraries built on different CPUs, e.g. on the nodes of a cluster sharing
+    the home directory, must not be exchanged through the compilation cache.
+    """
+    if not compiler in _native_targets:
+        try:
+            target = subprocess.Popen([compiler, "-march=native", "-###", "-E", "-x", "c++", os.devnull], 
+                                      stdout=subprocess.PIPE, stderr=subprocess.PIPE).communicate()[1]
+        except Exception:
+            target = b''
+        _native_targets[compiler] = platform.machine() + ' ' + platform.processor() + ' ' + target.decode('utf-8', 'replace')
+    return _native_targets[compiler]
+
+def _import_id(annarchy_dir, net_id):
+    """
+    The library of a network may have been compiled for another network and
+    copied from the compilation cache: its Python module is then named after
+    the id stored next to it.
+    """
+    try:
+        with open(annarchy_dir+'/ANNarchyCore'+str(net_id)+'.import_id', 'r') as rfile:
+            return int(rfile.read())
+    except (IOError, ValueError):
+        return net_id
  
 def _folder_management(annarchy_dir, profile_enabled, clean, net_id):
     """
@@ -80,6 +108,8 @@ def _folder_management(annarchy_dir, profile_enabled, clean, net_id):
     sys.path.append(annarchy_dir)
 
 def setup_parser():
+    from optparse import OptionParser, OptionGroup
+
     # override the error behavior of OptionParser,
     # normally an unknwon arg would raise an exception
     class MyOptionParser(OptionParser):
@@ -121,7 +151,7 @@ def compile(    directory='annarchy',
     *Parameters*:
 
     * **directory**: name of the subdirectory where the code will be generated and compiled. Must be a relative path.
-    * **clean**: boolean to specifying if the library should be recompiled entirely or only the changes since last compilation (default: False).
+    * **clean**: boolean to specifying if the library should be recompiled entirely or only the changes since last compilation (default: False). A library with identical sources and flags found in ``setup(cache_dir=...)`` is reused in any case.
     * **populations**: list of populations which should be compiled. If set to None, all available populations will be used.
     * **projections**: list of projection which should be compiled. If set to None, all available projections will be used.
     * **compiler**: C++ compiler to use. Default: g++ on GNU/Linux, clang++ on OS X. Valid compilers are [g++, clang++].
@@ -225,14 +255,19 @@ class Compiler(object):
         # Copy the files if needed
         changed = self.copy_files()
         
-        # Perform compilation if something has changed
+        # Perform compilation if something has changed and the library is not
+        # already available in the compilation cache
         if changed or not os.path.isfile(self.annarchy_dir+'/ANNarchyCore'+str(self.net_id)+'.so'):
-            self.compilation()
+            if not self.load_from_cache():
+                self.compilation()
+                self.set_import_id(self.net_id)
+                self.store_in_cache()
                 
         Global._network[self.net_id]['compiled'] = True
         
         # Create the Python objects                
-        _instantiate(self.net_id)    
+        _instantiate(self.net_id, import_id=_import_id(self.annarchy_dir, self.net_id), 
+                     core_library=self.annarchy_dir+'/ANNarchyCore'+str(self.net_id)+'.so')
 
     def copy_files(self):
         " Copy the generated files in the build/ folder if needed."
@@ -276,12 +311,85 @@ class Compiler(object):
                     if f.startswith('ANNarchyCore'):
                         continue
                     os.remove(self.annarchy_dir+'/build/net'+ str(self.net_id) + '/' + f)
-                    if os.path.isfile(self.annarchy_dir+'/build/net'+ str(self.net_id) + '/' + basename + '.o'):
-                        os.remove(self.annarchy_dir+'/build/net'+ str(self.net_id) + '/' + basename + '.o')
+                    for ext in ['.o', '.d']:
+                        if os.path.isfile(self.annarchy_dir+'/build/net'+ str(self.net_id) + '/' + basename + ext):
+                            os.remove(self.annarchy_dir+'/build/net'+ str(self.net_id) + '/' + basename + ext)
                     changed = True
 
         return changed
 
+    def cache_key(self):
+        """
+        Hash of everything which determines the content of ANNarchyCore.so: the
+        generated sources, the Makefile (compiler, flags and include paths), the
+        host CPU targeted by -march=native, the Python/Numpy ABI and the ANNarchy
+        release. The compilation directory and the id of the network are not part
+        of the key, so the cache is shared between all directories and networks.
+        """
+        sha = hashlib.sha1()
+        for info in [ANNarchy.__release__, sys.version, sys.platform, np.__version__, Global.config['paradigm'], _native_target(self.compiler)]:
+            sha.update(str(info).encode('utf-8'))
+        # The id only appears in the names of the module and of the build directory
+        net_id = str(self.net_id).encode('utf-8')
+        for f in sorted(os.listdir(self.annarchy_dir+'/generate')):
+            sha.update(f.replace('ANNarchyCore'+str(self.net_id), 'ANNarchyCore').encode('utf-8'))
+            with open(self.annarchy_dir+'/generate/'+f, 'rb') as rfile:
+                sha.update(rfile.read().replace(b'ANNarchyCore'+net_id, b'ANNarchyCore').replace(b'build/net'+net_id, b'build/net'))
+        return sha.hexdigest()
+
+    def load_from_cache(self):
+        """ Copy a previously compiled library from the cache. Returns True if successful. """
+        if not Global.config['cache_dir']:
+            return False
+
+        # The library is stored under the name of the network it was compiled for
+        cache_dir = Global.config['cache_dir'] + '/' + self.cache_key()
+        try:
+            libraries = [f for f in os.listdir(cache_dir) if re.match(r'^ANNarchyCore[0-9]+\.so$', f)]
+        except OSError:
+            return False
+        if len(libraries) == 0:
+            return False
+        cached = cache_dir + '/' + libraries[0]
+        import_id = int(libraries[0][len('ANNarchyCore'):-len('.so')])
+
+        try:
+            shutil.copy(cached, self.annarchy_dir + '/ANNarchyCore' + str(self.net_id) + '.so')
+            self.set_import_id(import_id)
+        except Exception as e:
+            Global._debug('Could not use the compilation cache:', e)
+            return False
+
+        if not self.silent:
+            Global._print('Network already compiled, using', cached)
+        return True
+
+    def set_import_id(self, import_id):
+        """ Stores the id of the network the library was compiled for, if it is not this one. """
+        filename = self.annarchy_dir + '/ANNarchyCore' + str(self.net_id) + '.import_id'
+        if import_id != self.net_id:
+            with open(filename, 'w') as wfile:
+                wfile.write(str(import_id))
+        elif os.path.isfile(filename):
+            os.remove(filename)
+
+    def store_in_cache(self):
+        """ Store the freshly compiled library in the cache. """
+        if not Global.config['cache_dir']:
+            return
+
+        library = 'ANNarchyCore'+str(self.net_id)+'.so'
+        cache_dir = Global.config['cache_dir'] + '/' + self.cache_key()
+        try:
+            if not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            # Copy then rename, so that concurrent sweeps never load a partial file
+            tmp_file = cache_dir + '/' + library + '.' + str(os.getpid())
+            shutil.copy(self.annarchy_dir + '/' + library, tmp_file)
+            os.rename(tmp_file, cache_dir + '/' + library)
+        except Exception as e:
+            Global._debug('Could not store the library in the compilation cache:', e)
+
     def compilation(self):
         """ Create ANNarchyCore.so and py extensions if something has changed. """
         # STDOUT
@@ -300,8 +408,13 @@ class Compiler(object):
         # Start the compilation
         verbose = "> compile_stdout.log 2> compile_stderr.log" if not Global.config["verbose"] else ""
 
-        # Start the compilation process
-        make_process = subprocess.Popen("make all -j4" + verbose, shell=True)
+        # Start the compilation process, one job per available core
+        try:
+            import multiprocessing
+            nb_jobs = multiprocessing.cpu_count()
+        except NotImplementedError:
+            nb_jobs = 4
+        make_process = subprocess.Popen("make all -j" + str(nb_jobs) + " " + verbose, shell=True)
 
         if make_process.wait() != 0:
             with open('compile_stderr.log', 'r') as rfile:
@@ -346,6 +459,9 @@ class Compiler(object):
         omp_flag = ""
         if Global.config['paradigm']=="openmp" and Global.config['num_threads']>1 and sys.platform != "darwin":
             omp_flag = "-fopenmp"
+        # The summation of SELL projections relies on "#pragma omp simd" to be vectorized
+        if omp_flag == "" and any(proj._has_sell_storage() for proj in self.projections):
+            omp_flag = "-fopenmp-simd"
 
         # Cuda capability
         #
@@ -399,6 +515,12 @@ class Compiler(object):
         # Include path to Numpy is not standard on all distributions
         numpy_include = np.get_include()
 
+        # One object file per generated source file
+        objects = ""
+        for f in sorted(os.listdir(self.annarchy_dir+'/generate')):
+            if f.endswith('.cpp'):
+                objects += '$(BUILD_DIR)/' + f.replace('.cpp', '.o') + ' '
+
         # Gather all Makefile flags
         makefile_flags = { 
             'compiler': self.compiler,
@@ -412,7 +534,8 @@ class Compiler(object):
             'python_include': python_include, 
             'python_lib': python_lib,
             'numpy_include': numpy_include, 
-            'net_id': self.net_id
+            'net_id': self.net_id,
+            'objects': objects
         }
 
         # Create Makefiles depending on the target platform and parallel framework
@@ -491,22 +614,25 @@ class Compiler(object):
                     exit(0)
 
 
-def _instantiate(net_id, import_id=-1):
+def _instantiate(net_id, import_id=-1, core_library=None):
     """ After every is compiled, actually create the Cython objects and 
         bind them to the Python ones."""
 
     if import_id < 0:
         import_id = net_id
 
+    if core_library is None:
+        core_library = 'annarchy/ANNarchyCore'+str(import_id)+'.so'
+
     if Global.config['verbose']:
         Global._print('Building network ...')
 
     # Import the Cython library
     try:
-        cython_module = imp.load_dynamic('ANNarchyCore'+str(import_id), 'annarchy/ANNarchyCore'+str(import_id)+'.so')
+        cython_module = imp.load_dynamic('ANNarchyCore'+str(import_id), core_library)
     except Exception as e:
         Global._print(e)
-        Global._error('Something went wrong when importing the network. Force recompilation with --clean.')
+        Global._error('Something went wrong when importing the network. Force recompilation with --clean and setup(cache_dir=None).')
         exit(0)
     Global._network[net_id]['instance'] = cython_module
 
@@ -84,7 +84,7 @@ class PopulationGenerator(object):
         # Declare global operations as extern at the beginning of the file
         extern_global_operations = ""
         for op in pop.global_operations:
-            extern_global_operations += global_op_extern_dict[op['function']]
+            extern_global_operations += global_op_extern_dict[op['function']] % {'type': Global._float_type()}
 
         # Initialize parameters and variables
         init_parameters_variables = self.init_population(pop)
@@ -94,6 +94,8 @@ class PopulationGenerator(object):
         if pop.neuron_type.description['type'] == 'spike':
             # Main data for spiking pops
             declare_spike += PopTemplate.spike_specific['declare_spike'] % {'id': pop.id}
+            if Global.config['num_threads'] > 1 and pop.size > Global.OMP_MIN_NB_NEURONS:
+                declare_spike += PopTemplate.spike_specific['declare_thread_spiked']
             init_spike += PopTemplate.spike_specific['init_spike'] % {'id': pop.id}
             reset_spike += PopTemplate.spike_specific['reset_spike'] % {'id': pop.id}
             # If there is a refractory period
@@ -101,6 +103,11 @@ class PopulationGenerator(object):
                 declare_spike += PopTemplate.spike_specific['declare_refractory'] % {'id': pop.id}
                 init_spike += PopTemplate.spike_specific['init_refractory'] % {'id': pop.id}
                 reset_spike += PopTemplate.spike_specific['reset_refractory'] % {'id': pop.id}
+            # If the neurons at rest are skipped
+            if pop._quiescence is not None:
+                declare_spike += PopTemplate.quiescence['declare']
+                init_spike += PopTemplate.quiescence['init']
+                reset_spike += PopTemplate.quiescence['reset']
 
         # Process eventual delay
         declare_delay = ""; init_delay = ""; update_delay=""; reset_delay = ""
@@ -175,7 +182,7 @@ class PopulationGenerator(object):
             reset_spike = pop._specific_template['reset_spike']
         if 'reset_delay' in pop._specific_template.keys() and pop.max_delay > 1:
             reset_delay = pop._specific_template['reset_delay']
-        if 'reset_additional' in pop._specific_template.keys() and pop.max_delay > 1:
+        if 'reset_additional' in pop._specific_template.keys():
             reset_additional = pop._specific_template['reset_additional']
         if 'update_variables' in pop._specific_template.keys():
             update_variables = pop._specific_template['update_variables']
@@ -187,40 +194,46 @@ class PopulationGenerator(object):
             update_global_ops = pop._specific_template['update_global_ops']
 
         # Fill the template
-        code = base_template % { 'id': pop.id,
-                                 'name': pop.name,
-                                 'size': pop.size,
-                                 'include_additional': include_additional,
-                                 'include_profile': include_profile,
-                                 'struct_additional': struct_additional,
-                                 'extern_global_operations': extern_global_operations,
-                                 'declare_spike_arrays': declare_spike,
-                                 'declare_parameters_variables': declaration_parameters_variables,
-                                 'declare_additional': declare_additional,
-                                 'declare_delay': declare_delay,
-                                 'declare_FR': declare_FR,
-                                 'declare_profile': declare_profile,
-                                 'access_parameters_variables': access_parameters_variables,
-                                 'init_parameters_variables': init_parameters_variables,
-                                 'init_spike': init_spike,
-                                 'init_delay': init_delay,
-                                 'init_FR': init_FR,
-                                 'init_additional': init_additional,
-                                 'init_profile': init_profile,
-                                 'reset_spike': reset_spike,
-                                 'reset_delay': reset_delay,
-                                 'reset_additional': reset_additional,
-                                 'update_variables': update_variables,
-                                 'update_rng': update_rng,
-                                 'update_delay': update_delay,
-                                 'update_global_ops': update_global_ops,
-                                 'stop_condition': stop_condition
-                                }
+        template_dict = { 'id': pop.id,
+                          'name': pop.name,
+                          'size': pop.size,
+                          'include_additional': include_additional,
+                          'include_profile': include_profile,
+                          'struct_additional': struct_additional,
+                          'extern_global_operations': extern_global_operations,
+                          'declare_spike_arrays': declare_spike,
+                          'declare_parameters_variables': declaration_parameters_variables,
+                          'declare_additional': declare_additional,
+                          'declare_delay': declare_delay,
+                          'declare_FR': declare_FR,
+                          'declare_profile': declare_profile,
+                          'access_parameters_variables': access_parameters_variables,
+                          'init_parameters_variables': init_parameters_variables,
+                          'init_spike': init_spike,
+                          'init_delay': init_delay,
+                          'init_FR': init_FR,
+                          'init_additional': init_additional,
+                          'init_profile': init_profile,
+                          'reset_spike': reset_spike,
+                          'reset_delay': reset_delay,
+                          'reset_additional': reset_additional,
+                          'update_variables': update_variables,
+                          'update_rng': update_rng,
+                          'update_delay': update_delay,
+                          'update_global_ops': update_global_ops,
+                          'stop_condition': stop_condition
+                        }
+        code = base_template % template_dict
 
         # Store the complete header definition in a single file
         with open(annarchy_dir+'/generate/pop'+str(pop.id)+'.hpp', 'w') as ofile:
             ofile.write(code)
 
+        # The methods are compiled in a separate translation unit
+        if Global.config['paradigm'] == "openmp":
+            with open(annarchy_dir+'/generate/pop'+str(pop.id)+'.cpp', 'w') as ofile:
+                ofile.write(PopTemplate.body_struct_omp % template_dict)
+
         # Generate the calls to be made in the main ANNarchy.cpp
         if Global.config['paradigm'] == "openmp":
             if len(pop.neuron_type.description['variables']) > 0 or 'update_variables' in pop._specific_template.keys():
@@ -277,6 +290,10 @@ class PopulationGenerator(object):
             Global._error("Spiking neurons on GPUs are currently not supported")
             exit(0)
 
+        if pop.substeps > 1 or pop._update_period > 1:
+            Global._error("substeps and update periods are not supported on GPUs yet ...")
+            exit(0)
+
         code = base_template % { 'id': pop.id,
                                  'name': pop.name,
                                  'size': pop.size,
@@ -325,6 +342,8 @@ class PopulationGenerator(object):
         # Pick basic template based on neuron type
         attr_template = PopTemplate.attribute_decl[Global.config['paradigm']]
         acc_template = PopTemplate.attribute_acc[Global.config['paradigm']]
+        if pop._quiescence is not None:
+            acc_template = PopTemplate.attribute_acc_quiescence
 
         declaration = "" # member declarations
         accessors = "" # export member functions
@@ -345,7 +364,7 @@ class PopulationGenerator(object):
 """
         if pop.neuron_type.type == 'rate':
             for target in sorted(list(set(pop.neuron_type.description['targets'] + pop.targets))):
-                declaration += PopTemplate.rate_psp[Global.config['paradigm']]['decl'] % {'target': target}
+                declaration += PopTemplate.rate_psp[Global.config['paradigm']]['decl'] % {'target': target, 'float_prec': Global._float_type()}
 
         # Global operations
         declaration += """
@@ -391,12 +410,12 @@ class PopulationGenerator(object):
 
         # Parameters
         for var in pop.neuron_type.description['parameters']:
-            init = 0.0 if var['ctype'] == 'double' else 0
+            init = 0.0 if var['ctype'] in ['double', 'float'] else 0
             code += attr_tpl[var['locality']] % {'id': pop.id, 'name': var['name'], 'type': var['ctype'], 'init': init, 'attr_type': 'parameter'}
 
         # Variables
         for var in pop.neuron_type.description['variables']:
-            init = 0.0 if var['ctype'] == 'double' else 0
+            init = 0.0 if var['ctype'] in ['double', 'float'] else 0
             code += attr_tpl[var['locality']] % {'id': pop.id, 'name': var['name'], 'type': var['ctype'], 'init': init, 'attr_type': 'variable'}
 
         # Random numbers
@@ -415,7 +434,7 @@ class PopulationGenerator(object):
         # Targets
         if pop.neuron_type.type == 'rate':
             for target in sorted(list(set(pop.neuron_type.description['targets'] + pop.targets))):
-                code += PopTemplate.rate_psp[Global.config['paradigm']]['init'] % {'id': pop.id, 'target': target}
+                code += PopTemplate.rate_psp[Global.config['paradigm']]['init'] % {'id': pop.id, 'target': target, 'float_prec': Global._float_type()}
 
         return code
 
@@ -452,31 +471,28 @@ class PopulationGenerator(object):
         # Retrieve the template
         delay_tpl = PopTemplate.attribute_delayed[Global.config['paradigm']]
 
+        # The delayed values have the type of the variable
+        ctypes = {}
+        for var in pop.neuron_type.description['parameters'] + pop.neuron_type.description['variables']:
+            ctypes[var['name']] = var['ctype']
+
         # Declaration
         declare_code = """
     // Delayed variables"""
 
         if Global.config['paradigm'] == "openmp":
-            if pop.neuron_type.type == "rate":
-                for var in pop.delayed_variables:
-                    if var in pop.neuron_type.description['local']:
-                        declare_code += """
-    std::deque< std::vector<double> > _delayed_%(var)s; """ % {'var': var}
-                    else:
-                        declare_code += """
-    std::deque< double > _delayed_%(var)s; """ % {'var': var}
-            else: # Spiking networks should only exchange spikes
+            if pop.neuron_type.type == "spike": # Spiking networks should only exchange spikes
                 declare_code += """
     // Delays for spike population
-    std::deque< std::vector<int> > _delayed_spike;
+    DelayBuffer< std::vector<int> > _delayed_spike;
 """
-                for var in pop.delayed_variables:
-                    if var in pop.neuron_type.description['local']:
-                        declare_code += """
-    std::deque< std::vector<double> > _delayed_%(var)s; """ % {'var': var}
-                    else:
-                        declare_code += """
-    std::deque< double > _delayed_%(var)s; """ % {'var': var}
+            for var in pop.delayed_variables:
+                if var in pop.neuron_type.description['local']:
+                    declare_code += """
+    DelayBuffer< std::vector<%(type)s> > _delayed_%(var)s; """ % {'var': var, 'type': ctypes[var]}
+                else:
+                    declare_code += """
+    DelayBuffer< %(type)s > _delayed_%(var)s; """ % {'var': var, 'type': ctypes[var]}
         else: #CUDA
             if pop.neuron_type.type == "rate":
                 for var in pop.delayed_variables:
@@ -496,7 +512,7 @@ std::deque< double* > gpu_delayed_%(var)s; // list of gpu arrays""" % {'var': va
 
         for var in pop.delayed_variables:
             locality = "local" if var in pop.neuron_type.description['local'] else "global"
-            init_code += delay_tpl[locality] % {'delay': pop.max_delay, 'var': var}
+            init_code += delay_tpl[locality] % {'delay': pop.max_delay, 'var': var, 'type': ctypes[var]}
 
         # Update
         update_code = ""
@@ -504,8 +520,7 @@ std::deque< double* > gpu_delayed_%(var)s; // list of gpu arrays""" % {'var': va
         if Global.config['paradigm'] == "openmp":
             for var in pop.delayed_variables:
                 update_code += """
-        _delayed_%(var)s.push_front(%(var)s);
-        _delayed_%(var)s.pop_back();
+        _delayed_%(var)s.push(%(var)s);
 """ % {'id': pop.id, 'var' : var}
 
                 # reset
@@ -548,14 +563,13 @@ std::deque< double* > gpu_delayed_%(var)s; // list of gpu arrays""" % {'var': va
         if pop.neuron_type.type == 'spike':
             if Global.config['paradigm']=="openmp":
                 init_code += """
-        _delayed_spike = std::deque< std::vector<int> >(%(delay)s, std::vector<int>());""" % {'delay': pop.max_delay}
+        _delayed_spike.init(%(delay)s, std::vector<int>());""" % {'delay': pop.max_delay}
 
                 update_code += """
-            _delayed_spike.push_front(spiked);
-            _delayed_spike.pop_back();
+            _delayed_spike.push(spiked);
 """
                 reset_code += """
-        _delayed_spike = std::deque< std::vector<int> >(%(delay)s, std::vector<int>());""" % {'delay': pop.max_delay}
+        _delayed_spike.fill(std::vector<int>());"""
             else:
                 Global._error("no synaptic delays for spiking synapses on CUDA implemented ...")
                 exit(0)
@@ -577,7 +591,7 @@ std::deque< double* > gpu_delayed_%(var)s; // list of gpu arrays""" % {'var': va
         with an openmp for construct, if number of threads is greater than one and the number
         of neurons exceed a minimum amount of neurons ( defined as Global.OMP_MIN_NB_NEURONS)
         """
-        from .Utils import generate_equation_code
+        from .Utils import generate_equation_code, generate_pre_loop_code, substep_code, update_condition
         code = ""
 
         # Global variables
@@ -592,21 +606,33 @@ std::deque< double* > gpu_delayed_%(var)s; // list of gpu arrays""" % {'var': va
         eqs = generate_equation_code(pop.id, pop.neuron_type.description, 'local', padding=4) % {'id': pop.id, 'local_index': "[i]", 'global_index': ''}
         if eqs.strip() != "":
             omp_code = "#pragma omp parallel for" if (Global.config['num_threads'] > 1 and pop.size > Global.OMP_MIN_NB_NEURONS) else ""
+            pre_loop = generate_pre_loop_code(pop.neuron_type.description, 'local', padding=3) % {'id': pop.id, 'local_index': "[i]", 'global_index': ''}
             code += """
             // Updating the local variables
+%(pre_loop)s
             %(omp_code)s
             for(int i = 0; i < %(size)s; i++){
 %(eqs)s
             }
-""" % {'id': pop.id, 'size': pop.size, 'name' : pop.name, 'eqs': eqs, 'omp_code': omp_code}
+""" % {'id': pop.id, 'size': pop.size, 'name' : pop.name, 'eqs': eqs, 'omp_code': omp_code, 'pre_loop': pre_loop}
+
+        # The equations are integrated several times with a smaller step size
+        if code != "" and pop.substeps > 1:
+            code = self._substeps(pop, substep_code(code))
+
+        # The equations are only integrated every period, with a larger step size
+        if code != "" and pop._update_period > 1:
+            code = """
+            const double _period_dt = %(period)s.0 * dt;
+%(code)s""" % {'period': pop._update_period, 'code': substep_code(code, '_period_dt', None)}
 
         if code != "":
             # finish code
             final_code = """
-        if( _active ) {
+        if( _active%(condition)s ) {
 %(code)s
         } // active
-""" % {'code': code}
+""" % {'code': code, 'condition': update_condition(pop)}
 
             # if profiling enabled, annotate with profiling code
             if self._prof_gen:
@@ -616,6 +642,16 @@ std::deque< double* > gpu_delayed_%(var)s; // list of gpu arrays""" % {'var': va
 
         return final_code
 
+    def _substeps(self, pop, code):
+        "Repeats the update code of a population for each of its substeps."
+        return """
+        for(int _substep = 0; _substep < %(substeps)s; _substep++){
+            const double _substep_dt = dt / %(substeps)s.0;
+            const double _substep_t = double(t)*dt + double(_substep) * _substep_dt;
+%(code)s
+        } // substeps
+""" % {'substeps': pop.substeps, 'code': code}
+
     def update_rate_neuron_cuda(self, pop):
         """
         Generate the code template for neural update step, more precise updating of variables.
@@ -761,7 +797,7 @@ __global__ void cuPop%(id)s_step( double dt%(tar)s%(var)s%(par)s );
 
     def update_spike_neuron(self, pop):
         # Neural update
-        from .Utils import generate_equation_code
+        from .Utils import generate_equation_code, generate_pre_loop_code, substep_code
 
         # Is there a refractory period?
         if pop.neuron_type.refractory or pop.refractory:
@@ -774,7 +810,10 @@ __global__ void cuPop%(id)s_step( double dt%(tar)s%(var)s%(par)s );
                 continue;
             }
         """ %  {'id': pop.id, 'eqs': eqs}
-            refrac_inc = "refractory_remaining[i] = refractory[i];" %  {'id': pop.id}
+            if pop.substeps > 1: # the remaining refractory period is counted in substeps
+                refrac_inc = "refractory_remaining[i] = %(substeps)s * refractory[i];" %  {'substeps': pop.substeps}
+            else:
+                refrac_inc = "refractory_remaining[i] = refractory[i];" %  {'id': pop.id}
         else:
             code = ""
             refrac_inc = ""
@@ -786,9 +825,19 @@ __global__ void cuPop%(id)s_step( double dt%(tar)s%(var)s%(par)s );
         else:
             global_code = ""
 
-        # OMP code
-        omp_code = "#pragma omp parallel for" if (Global.config['num_threads'] > 1 and pop.size > Global.OMP_MIN_NB_NEURONS) else ""
-        omp_critical_code = "#pragma omp critical" if (Global.config['num_threads'] > 1 and pop.size > Global.OMP_MIN_NB_NEURONS) else ""
+        # Factors of the local ODEs which are the same for all neurons
+        global_code += generate_pre_loop_code(pop.neuron_type.description, 'local', padding=2) % {'id': pop.id, 'local_index': "[i]", 'global_index': ''}
+
+        # OMP code: each thread collects its spikes in its own buffer
+        with_openmp = Global.config['num_threads'] > 1 and pop.size > Global.OMP_MIN_NB_NEURONS
+
+        # Values of the local variables before the update, to detect the neurons at rest
+        if pop._quiescence is not None:
+            quiescent_variables = [var for var in pop.neuron_type.description['variables'] if var['locality'] == 'local' and var['cpp'] != '']
+            for var in quiescent_variables:
+                code += """
+            %(type)s _prev_%(name)s = %(name)s[i];""" % {'type': var['ctype'], 'name': var['name']}
+            code += "\n"
 
         # Local variables, evaluated in parallel
         code += generate_equation_code(pop.id, pop.neuron_type.description, 'local', padding=3) % {'id': pop.id, 'local_index': "[i]", 'global_index': ''}
@@ -805,40 +854,125 @@ __global__ void cuPop%(id)s_step( double dt%(tar)s%(var)s%(par)s );
 
         # Mean Firing rate
         mean_FR_push, mean_FR_update = self.update_fr(pop)
+        if pop._quiescence is not None and mean_FR_update != "":
+            Global._error('the mean firing rate of ' + pop.name + ' can not be computed when the neurons at rest are skipped.')
+            exit(0)
 
-        # Gather code
+        # Gather code. With substeps, the condition is checked after each substep
+        # but a neuron emits at most one spike per step.
+        if pop.substeps > 1:
+            spike_emission = """
+                if(last_spike[i] != t){
+                    %(spiked)s.push_back(i);
+                    last_spike[i] = t;
+                    %(refrac_inc)s
+                    %(mean_FR_push)s
+                }"""
+        else:
+            spike_emission = """
+                %(spiked)s.push_back(i);
+                last_spike[i] = t;
+                %(refrac_inc)s
+                %(mean_FR_push)s"""
         spike_gather = """
             if(%(condition)s){ // Emit a spike
 %(reset)s        
-                %(omp_critical_code)s
-                {
-                    spiked.push_back(i);
-                }
-                last_spike[i] = t;
-                %(refrac_inc)s
-                %(mean_FR_push)s
+%(emission)s
             }
-            %(mean_FR_update)s
-"""% {  'id': pop.id, 'name': pop.name, 'size': pop.size, 
-        'condition' : cond, 'reset': reset, 
-        'refrac_inc': refrac_inc,
-        'mean_FR_push': mean_FR_push,
-        'mean_FR_update': mean_FR_update,
-        'omp_critical_code': omp_critical_code} 
+"""% {  'condition' : cond, 'reset': reset,
+        'emission': spike_emission % {
+            'refrac_inc': refrac_inc,
+            'mean_FR_push': mean_FR_push,
+            'spiked': '_local_spiked' if with_openmp else 'spiked'}
+     }
 
         code += spike_gather
 
+        # A neuron which did not spike and whose variables did not change is at rest:
+        # it is not updated anymore until it receives a spike.
+        if pop._quiescence is not None:
+            unchanged = []
+            for var in quiescent_variables:
+                if var['ctype'] in ['int', 'bool']:
+                    unchanged.append("%(name)s[i] == _prev_%(name)s" % {'name': var['name']})
+                else:
+                    unchanged.append("fabs(%(name)s[i] - _prev_%(name)s) <= %(tol)s" % {'name': var['name'], 'tol': pop._quiescence})
+            code += """
+            // Neurons at rest are removed from the update list
+            _is_active[i] = !( (last_spike[i] != t) && %(unchanged)s );
+""" % {'unchanged': ' && '.join(unchanged) if len(unchanged) > 0 else 'true'}
+            loop_header = """for(int _idx = 0; _idx < _nb_active; _idx++){
+            int i = _active_neurons[_idx];"""
+        else:
+            loop_header = "for(int i = 0; i < %(size)s; i++){" % {'size': pop.size}
+
+        # Loop over the neurons
+        if with_openmp:
+            # The static schedule gives contiguous blocks of neurons to the threads in
+            # increasing order, so that merging the buffers keeps the spikes sorted by rank.
+            loop_code = """
+        #pragma omp parallel
+        {
+            std::vector<int> &_local_spiked = _thread_spiked[omp_get_thread_num()];
+            #pragma omp for schedule(static)
+            %(loop_header)s
+%(code)s
+            }
+        }
+"""
+            spiked_init = """
+        _thread_spiked.resize(omp_get_max_threads());
+        for(int _thread = 0; _thread < _thread_spiked.size(); _thread++){
+            _thread_spiked[_thread].clear();
+        }"""
+            spiked_merge = """
+        for(int _thread = 0; _thread < _thread_spiked.size(); _thread++){
+            spiked.insert(spiked.end(), _thread_spiked[_thread].begin(), _thread_spiked[_thread].end());
+        }"""
+        else:
+            loop_code = """
+        %(loop_header)s
+%(code)s
+        }
+"""
+            spiked_init = ""
+            spiked_merge = ""
+
+        if pop._quiescence is not None:
+            # Only the neurons in the update list are processed, the spikes are then sorted by rank
+            spiked_init += """
+        int _nb_active = _active_neurons.size();"""
+            spiked_merge += """
+        int _nb_remaining = 0;
+        for(int _idx = 0; _idx < _nb_active; _idx++){
+            if(_is_active[_active_neurons[_idx]])
+                _active_neurons[_nb_remaining++] = _active_neurons[_idx];
+        }
+        _active_neurons.resize(_nb_remaining);
+        std::sort(spiked.begin(), spiked.end());"""
+
+        if pop.substeps > 1:
+            # The global and local equations are integrated for each substep, the spikes are then sorted by rank
+            update_code = self._substeps(pop, substep_code(global_code + loop_code % {'loop_header': loop_header, 'code': code}))
+            if pop._quiescence is None:
+                spiked_merge += """
+        std::sort(spiked.begin(), spiked.end());"""
+            # The mean firing rate is only updated once per step
+            if mean_FR_update != "":
+                spiked_merge += """
+        for(int i = 0; i < %(size)s; i++){
+%(mean_FR_update)s
+        }""" % {'size': pop.size, 'mean_FR_update': mean_FR_update}
+        else:
+            update_code = global_code + loop_code % {'loop_header': loop_header, 'code': code + mean_FR_update}
+
         # finish code
         final_code = """
     if( _active ) {
-        spiked.clear();
-%(global_code)s
-        %(omp_code)s
-        for(int i = 0; i < %(size)s; i++){
-%(code)s
-        }
+        spiked.clear();%(spiked_init)s
+%(update_code)s%(spiked_merge)s
     } // active
-""" % {'id': pop.id, 'size': pop.size, 'name': pop.name, 'code': code, 'global_code': global_code, 'omp_code': omp_code }
+""" % {'update_code': update_code, 'spiked_init': spiked_init, 'spiked_merge': spiked_merge}
 
         # if profiling enabled, annotate with profiling code
         if self._prof_gen:
@@ -851,12 +985,13 @@ __global__ void cuPop%(id)s_step( double dt%(tar)s%(var)s%(par)s );
     ################################
 
     def reset_computesum(self, pop):
+        from .Utils import update_condition
         code = ""
         for target in sorted(pop.targets):
             code += """
-    if (pop%(id)s._active)
-        memset( pop%(id)s._sum_%(target)s.data(), 0.0, pop%(id)s._sum_%(target)s.size() * sizeof(double));
-""" % {'id': pop.id, 'target': target}
+    if (pop%(id)s._active%(condition)s)
+        memset( pop%(id)s._sum_%(target)s.data(), 0.0, pop%(id)s._sum_%(target)s.size() * sizeof(%(float_prec)s));
+""" % {'id': pop.id, 'target': target, 'float_prec': Global._float_type(), 'condition': update_condition(pop)}
         return code
 
     ################################
@@ -871,6 +1006,7 @@ __global__ void cuPop%(id)s_step( double dt%(tar)s%(var)s%(par)s );
         In case of CUDA the call semantic will be placed in ANNarchy.cu
         file as part of the host section.
         """
+        from .Utils import update_condition
         if len(pop.global_operations) == 0:
             return ""
 
@@ -886,9 +1022,9 @@ __global__ void cuPop%(id)s_step( double dt%(tar)s%(var)s%(par)s );
                 code += template[op['function']]['call'] % { 'id': pop.id, 'op': op['function'], 'var': op['variable'] }
 
         return """
-    if (_active){
+    if (_active%(condition)s){
 %(code)s
-}""" % {'code':code}
+}""" % {'code':code, 'condition': update_condition(pop)}
 
     ################################
     ### Mean firing rate (spiking)
@@ -24,7 +24,7 @@
 import ANNarchy.core.Global as Global
 from ANNarchy.core.PopulationView import PopulationView
 import ANNarchy.generator.Template.ProjectionTemplate as ProjTemplate
-from .Utils import generate_equation_code, tabify
+from .Utils import generate_equation_code, generate_pre_loop_code, update_condition, tabify
 import re
 
 class ProjectionGenerator(object):
@@ -37,8 +37,8 @@ class ProjectionGenerator(object):
 #######################################################################
     def header_struct(self, proj, annarchy_dir):
         """
-        Generate and store the projection code in a single header file. The name is defined as
-        proj%(id)s.hpp.
+        Generate and store the projection code in a header file. The name is defined as
+        proj%(id)s.hpp. With OpenMP, the methods are defined in proj%(id)s.cpp.
 
         Parameters:
 
@@ -51,7 +51,7 @@ class ProjectionGenerator(object):
 
         Templates:
 
-            header_struct: basic template
+            header_struct_omp, body_struct_omp, header_struct_cuda: basic templates
 
         """
         # Dictionary for inclusions in ANNarchy.cpp
@@ -128,7 +128,7 @@ class ProjectionGenerator(object):
         if 'access_additional' in proj._specific_template.keys():
             access_additional = proj._specific_template['access_additional']
 
-        final_code = ProjTemplate.header_struct % {
+        template_dict = {
             'id_pre': proj.pre.id,
             'id_post': proj.post.id,
             'id_proj': proj.id,
@@ -149,7 +149,8 @@ class ProjectionGenerator(object):
             'declare_profile': declare_profile,
             'init_connectivity_matrix': connectivity_matrix['init'],
             'init_inverse_connectivity_matrix': connectivity_matrix['init_inverse'] % {'id_pre': proj.pre.id, 'id_post': proj.post.id},
-            'init_event_driven': "",
+            'init_delay': ProjTemplate.spike_delay_queue['cpp_init'] % {'max_delay': proj.max_delay} if has_delay and proj.synapse_type.type == "spike" else "",
+            'init_event_driven': ProjTemplate.csr_event_driven['cpp_init'] if has_event_driven and proj._has_csr_storage() else "",
             'init_rng': init_rng,
             'init_parameters_variables': init_parameters_variables,
             'init_additional': init_additional,
@@ -168,9 +169,19 @@ class ProjectionGenerator(object):
         }
 
         # Store file
+        if Global.config['paradigm'] == "openmp":
+            final_code = ProjTemplate.header_struct_omp % template_dict
+        else:
+            final_code = ProjTemplate.header_struct_cuda % template_dict
+
         with open(annarchy_dir+'/generate/proj'+str(proj.id)+'.hpp', 'w') as ofile:
             ofile.write(final_code)
 
+        # The methods are compiled in a separate translation unit
+        if Global.config['paradigm'] == "openmp":
+            with open(annarchy_dir+'/generate/proj'+str(proj.id)+'.cpp', 'w') as ofile:
+                ofile.write(ProjTemplate.body_struct_omp % template_dict)
+
         #
         # Dependent on the chosen paradigm, different codes need to
         # added in ANNarchy.c* file:
@@ -229,25 +240,38 @@ class ProjectionGenerator(object):
         # Default weight matrix as LIL
         weight_matrix_tpl = ProjTemplate.lil_weight_matrix_omp if Global.config['paradigm']=="openmp" else ProjTemplate.csr_weight_matrix_cuda
 
+        # Flat CSR or SELL arrays instead of the LIL
+        if proj._has_csr_storage():
+            connectivity_matrix_tpl = ProjTemplate.csr_connectivity_matrix_omp
+            weight_matrix_tpl = ProjTemplate.csr_weight_matrix_omp
+        elif proj._has_sell_storage():
+            connectivity_matrix_tpl = ProjTemplate.sell_connectivity_matrix_omp
+            weight_matrix_tpl = ProjTemplate.sell_weight_matrix_omp
+
         # Special case when the weight have a single value
         if proj._has_single_weight():
             weight_matrix_tpl = ProjTemplate.single_weight_matrix_omp
 
         # Connectivity
-        declare_connectivity_matrix = connectivity_matrix_tpl['declare']
-        access_connectivity_matrix = connectivity_matrix_tpl['accessor']
+        declare_connectivity_matrix = connectivity_matrix_tpl['declare'] % {'idx_type': self._index_type(proj)}
+        access_connectivity_matrix = connectivity_matrix_tpl['accessor'] % {'idx_type': self._index_type(proj)}
         init_connectivity_matrix = connectivity_matrix_tpl['init']
 
         # Weight array
-        declare_connectivity_matrix += weight_matrix_tpl['declare']
-        access_connectivity_matrix += weight_matrix_tpl['accessor']
-        init_connectivity_matrix += weight_matrix_tpl['init']
+        declare_connectivity_matrix += weight_matrix_tpl['declare'] % {'float_prec': Global._float_type()}
+        access_connectivity_matrix += weight_matrix_tpl['accessor'] % {'float_prec': Global._float_type()}
+        init_connectivity_matrix += weight_matrix_tpl['init'] % {'float_prec': Global._float_type()}
 
         # Spiking model require inverted ranks
         if proj.synapse_type.type == "spike":
             inv_connectivity_matrix_tpl = ProjTemplate.inverse_connectivity_matrix if Global.config['paradigm']=="openmp" else {}
+            if proj._has_csr_storage():
+                inv_connectivity_matrix_tpl = ProjTemplate.csr_inverse_connectivity_matrix
             declare_inverse_connectivity_matrix = inv_connectivity_matrix_tpl['declare']
             init_inverse_connectivity_matrix = inv_connectivity_matrix_tpl['init']
+            if self._partitioned_propagation(proj):
+                declare_inverse_connectivity_matrix += ProjTemplate.inverse_connectivity_partition['declare']
+                init_inverse_connectivity_matrix += ProjTemplate.inverse_connectivity_partition['init']
 
         # Specific projections can overwrite
         if 'declare_connectivity_matrix' in proj._specific_template.keys():
@@ -287,12 +311,16 @@ class ProjectionGenerator(object):
         declare_parameters_variables = ""
         declare_additional = ""
 
-        # choose templates dependend on the paradigm
-        decl_template = ProjTemplate.attribute_decl[Global.config['paradigm']]
-        acc_template = ProjTemplate.attribute_acc[Global.config['paradigm']]
+        # choose templates dependend on the paradigm and the storage format
+        storage = self._attribute_storage(proj)
+        decl_template = ProjTemplate.attribute_decl[storage]
+        acc_template = ProjTemplate.attribute_acc[storage]
 
         # Delays
-        declare_delay = ProjTemplate.delay['header_struct']
+        delay_tpl = ProjTemplate.csr_delay if proj._has_csr_storage() else ProjTemplate.delay
+        declare_delay = delay_tpl['header_struct'] % {'delay_type': self._delay_type(proj)}
+        if proj.synapse_type.type == "spike" and Global.config['paradigm'] == "openmp":
+            declare_delay += ProjTemplate.spike_delay_queue['header_struct']
 
         # Code for declarations and accessors
         accessor = ""
@@ -317,7 +345,7 @@ class ProjectionGenerator(object):
                 has_event_driven = True
                 break
         if has_event_driven:
-            declare_event_driven = ProjTemplate.event_driven['header_struct']
+            declare_event_driven = ProjTemplate.csr_event_driven['header_struct'] if proj._has_csr_storage() else ProjTemplate.event_driven['header_struct']
 
         # Arrays for the random numbers
         if len(proj.synapse_type.description['random_distributions']) > 0:
@@ -325,9 +353,9 @@ class ProjectionGenerator(object):
     // Random numbers
 """
             for rd in proj.synapse_type.description['random_distributions']:
-                declare_rng += """    std::vector< std::vector<double> > %(rd_name)s;
+                declare_rng += """    std::vector< %(container)s > %(rd_name)s;
     %(template)s dist_%(rd_name)s;
-""" % {'rd_name' : rd['name'], 'type': rd['dist'], 'template': rd['template']}
+""" % {'rd_name' : rd['name'], 'type': rd['dist'], 'template': rd['template'], 'container': 'double' if proj._has_flat_storage() else 'std::vector<double>'}
 
         # Local functions
         if len(proj.synapse_type.description['functions'])>0:
@@ -366,6 +394,39 @@ class ProjectionGenerator(object):
 
         return declaration, accessor
 
+    def _attribute_storage(self, proj):
+        "Key of the attribute templates: the paradigm or the flat storage format."
+        if proj._has_csr_storage():
+            return 'csr'
+        if proj._has_sell_storage():
+            return 'sell'
+        return Global.config['paradigm']
+
+    def _index_type(self, proj):
+        """
+        C++ type of the stored pre-synaptic ranks: 16 bits are enough for pre-synaptic populations of less than 65536 neurons.
+        SELL keeps 32 bits indices, as the vectorized gathers of the summation are slower with 16 bits ones.
+        """
+        pre = proj.pre.population if isinstance(proj.pre, PopulationView) else proj.pre
+        if Global.config['paradigm'] == "openmp" and not proj._has_sell_storage() and pre.size < 65536:
+            return 'unsigned short'
+        return 'int'
+
+    def _partitioned_propagation(self, proj):
+        """
+        With several threads, the spikes of a spiking projection are propagated in parallel by splitting the post-synaptic
+        neurons between the threads, so each thread only increments its own conductances.
+        """
+        return Global.config['paradigm'] == "openmp" and Global.config['num_threads'] > 1 and \
+            proj.synapse_type.type == "spike" and proj.post.size > Global.OMP_MIN_NB_NEURONS and \
+            not 'psp_code' in proj._specific_template.keys()
+
+    def _delay_type(self, proj):
+        "C++ type of the stored non-uniform delays (in steps): 8 bits are enough when the maximal delay is smaller than 256 steps."
+        if Global.config['paradigm'] == "openmp" and proj.max_delay < 256:
+            return 'unsigned char'
+        return 'int'
+
 #######################################################################
 ############## Initialize projection OMP ##############################
 #######################################################################
@@ -378,21 +439,21 @@ class ProjectionGenerator(object):
         # Learning by default
         code = ""
 
-        # choose initialization templates based on chosen paradigm
-        attr_init_tpl = ProjTemplate.attribute_cpp_init[Global.config['paradigm']]
+        # choose initialization templates based on chosen paradigm and storage format
+        attr_init_tpl = ProjTemplate.attribute_cpp_init[self._attribute_storage(proj)]
 
         # Initialize parameters
         for var in proj.synapse_type.description['parameters']:
             if var['name'] == 'w':
                 continue
-            init = 0.0 if var['ctype'] == 'double' else 0
+            init = 0.0 if var['ctype'] in ['double', 'float'] else 0
             code += attr_init_tpl[var['locality']] % { 'id': proj.id, 'name': var['name'], 'type': var['ctype'], 'init': init, 'attr_type': 'parameter' }
 
         # Initialize variables
         for var in proj.synapse_type.description['variables']:
             if var['name'] == 'w':
                 continue
-            init = 0.0 if var['ctype'] == 'double' else 0
+            init = 0.0 if var['ctype'] in ['double', 'float'] else 0
             code += attr_init_tpl[var['locality']] % { 'id': proj.id, 'name': var['name'], 'type': var['ctype'], 'init': init, 'attr_type': 'variable' }
 
         # Pruning
@@ -423,7 +484,7 @@ class ProjectionGenerator(object):
         """
         # Default variables needed in psp_code
         psp_prefix = """
-        int nb_post; double sum;"""
+        int nb_post; %(acc_prec)s sum;""" % {'acc_prec': Global._accumulator_type()}
         if 'psp_prefix' in proj._specific_template.keys():
             psp_prefix = proj._specific_template['psp_prefix']
 
@@ -436,7 +497,11 @@ class ProjectionGenerator(object):
             return psp_prefix, psp_code
 
         # Choose the relevant summation template
-        if proj._dense_matrix: # Dense connectivity
+        if proj._has_sell_storage(): # Chunks of dendrites
+            template =  ProjTemplate.sell_summation_operation
+        elif proj._has_csr_storage(): # Flat CSR arrays
+            template =  ProjTemplate.csr_summation_operation
+        elif proj._dense_matrix: # Dense connectivity
             template =  ProjTemplate.dense_summation_operation
         else: # Default LiL
             template =  ProjTemplate.lil_summation_operation
@@ -458,7 +523,11 @@ class ProjectionGenerator(object):
         }
 
         # Special keywords based on the data structure
-        if proj._dense_matrix: # Dense connectivity
+        if proj._has_flat_storage(): # CSR or SELL: j is the index of the synapse in the flat arrays
+            ids['local_index'] = "[j]"
+            ids['pre_index'] = "[col_idx[j]]"
+            ids['delay_nu'] = "[delay[j]-1]"
+        elif proj._dense_matrix: # Dense connectivity
             ids['pre_index'] = "[j]"
             ids['post_index'] = "[i]"
 
@@ -531,7 +600,7 @@ class ProjectionGenerator(object):
                     omp_code = "#pragma omp parallel for private(sum) firstprivate("
                     for var in dependencies:
                         if var in proj.pre.neuron_type.description['local']:
-                            pre_copy += "std::vector<double> _pre_" + var + " = %(pre_prefix)s_delayed_" + var + "%(delay_u)s;"
+                            pre_copy += "std::vector<" + Global._float_type() + "> _pre_" + var + " = %(pre_prefix)s_delayed_" + var + "%(delay_u)s;"
                             psp = psp.replace(
                                 '%(pre_prefix)s_delayed_'+var+'%(delay_u)s%(pre_index)s',
                                 '_pre_'+var+'%(pre_index)s'
@@ -544,7 +613,7 @@ class ProjectionGenerator(object):
                 pre_copy = ""; omp_code = "#pragma omp parallel for private(sum) firstprivate("
                 for var in dependencies:
                     if var in proj.pre.neuron_type.description['local']:
-                        pre_copy += "std::vector<double> _pre_" + var + " = %(pre_prefix)s" + var + ";"
+                        pre_copy += "std::vector<" + Global._float_type() + "> _pre_" + var + " = %(pre_prefix)s" + var + ";"
                         psp = psp.replace(
                             '%(pre_prefix)s'+var+'%(pre_index)s',
                             '_pre_'+var+'%(pre_index)s'
@@ -565,15 +634,18 @@ class ProjectionGenerator(object):
             'id_pre': proj.pre.id,
             'id_post': proj.post.id,
             'target': proj.target,
+            'float_prec': Global._float_type(),
+            'acc_prec': Global._accumulator_type(),
         }
 
-        # Finish the code
+        # Finish the code, the sums are only needed when the post-synaptic population is updated
         final_code = """
-        if (_transmission && pop%(id_post)s._active){
+        if (_transmission && pop%(id_post)s._active%(condition)s){
 %(code)s
         } // active
         """ % {'id_post': proj.post.id,
                'code': tabify(sum_code, 3),
+               'condition': update_condition(proj.post),
                }
 
         if self._prof_gen:
@@ -696,6 +768,8 @@ class ProjectionGenerator(object):
 
         # Basic tags
         ids = {'id_proj' : proj.id, 'id_post': proj.post.id, 'id_pre': proj.pre.id, 'target': proj.target, 'local_index': "[i][j]", 'global_index': '[i]'}
+        if proj._has_csr_storage(): # inv_synapse directly gives the index of the synapse
+            ids['local_index'] = "[j]"
 
         # Determine the mode of synaptic transmission
         continous_transmission = False
@@ -735,7 +809,7 @@ class ProjectionGenerator(object):
                         try:
                             value = str(float(val))
                         except: # TODO: more complex operations
-                            value = "%(name)s%(locality)s" % {'id_proj' : proj.id, 'name': val, 'locality': '[i]' if val in proj.synapse_type.description['global'] else '[i][j]'}
+                            value = "%(name)s%(locality)s" % {'id_proj' : proj.id, 'name': val, 'locality': '[i]' if val in proj.synapse_type.description['global'] else ids['local_index']}
 
                         g_target_code += """
     if (pop%(id_post)s.g_%(target)s[post_rank[i]] %(op)s %(val)s)
@@ -748,7 +822,7 @@ class ProjectionGenerator(object):
                 if eq['name'] == 'w': # Surround it by the learning flag
                     condition = "_plasticity" # Plasticity can be disabled
                 if 'unless_post' in eq['flags']: # Flags avoids pre-spike evaluation when post fires at the same time
-                    simultaneous = "pop%(id_pre)s.last_spike[pre_rank[i][j]] != pop%(id_post)s.last_spike[post_rank[i]]" % {'id_post': proj.post.id, 'id_pre': proj.pre.id}
+                    simultaneous = "pop%(id_pre)s.last_spike[%(pre_rank)s] != pop%(id_post)s.last_spike[post_rank[i]]" % {'id_post': proj.post.id, 'id_pre': proj.pre.id, 'pre_rank': 'col_idx[j]' if proj._has_csr_storage() else 'pre_rank[i][j]'}
                     if condition == "":
                         condition = simultaneous
                     else:
@@ -784,17 +858,29 @@ if(%(condition)s){
             for target in targets:
                 g_target_code += """
             // Increase the post-synaptic conductance g_target += w
-            pop%(id_post)s.g_%(target)s[post_rank[i]] += w[i][j];
+            pop%(id_post)s.g_%(target)s[post_rank[i]] += w%(local_index)s;
 """ % ids
 
         # Special case where w is a single value
         if proj._has_single_weight():
             g_target_code = re.sub(
-                r'([^\w]+)w\[i\]\[j\]',
+                r'([^\w]+)w' + re.escape(ids['local_index']),
                 r'\1w',
                 g_target_code
             )
 
+        # The post-synaptic neuron may be at rest
+        post = proj.post.population if isinstance(proj.post, PopulationView) else proj.post
+        if post._quiescence is not None:
+            if continous_transmission:
+                Global._error('the neurons at rest of ' + post.name + ' can not receive a continuous psp.')
+                exit(0)
+            if g_target_code != "":
+                g_target_code += """
+            // Put the post-synaptic neuron back in the update list
+            pop%(id_post)s.wake_up(post_rank[i]);
+""" % ids
+
         # Event-driven integration of synaptic variables
         has_exact = False
         event_driven_code = ''
@@ -804,12 +890,12 @@ if(%(condition)s){
                 event_driven_code += """
             // %(eq)s
             %(exact)s
-""" % {'eq': var['eq'], 'exact': var['cpp'].replace('(t)', '(t-1)') %{'id_proj' : proj.id, 'local_index': "[i][j]", 'global_index': '[i]'}}
+""" % {'eq': var['eq'], 'exact': var['cpp'].replace('(t)', '(t-1)') %{'id_proj' : proj.id, 'local_index': ids['local_index'], 'global_index': '[i]'}}
         if has_exact:
                 event_driven_code += """
             // Update the last event for the synapse
-            _last_event[i][j] = t;
-""" % {'id_proj' : proj.id, 'exact': var['cpp']}
+            _last_event%(local_index)s = t;
+""" % ids
 
 
         # Generate code for pre-spike variables
@@ -821,63 +907,128 @@ if(%(condition)s){
             # Special case where w is a single value
             if proj._has_single_weight():
                 pre_code = re.sub(
-                    r'([^\w]+)w\[i\]\[j\]',
+                    r'([^\w]+)w' + re.escape(ids['local_index']),
                     r'\1w',
                     pre_code
                 )
 
         # Take delays into account if any
-        if proj.max_delay > 1:
-            if proj.uniform_delay == -1 : # Non-uniform delays
-                Global._error('Non-uniform delays are not yet possible for spiking networks.')
-                exit(0)
-            else: # Uniform delays
-                pre_array = "pop%(id_pre)s._delayed_spike[%(delay)s]" % {'id_proj' : proj.id, 'id_pre': proj.pre.id, 'delay': str(proj.uniform_delay-1)}
-        else:
+        has_nonuniform_delay = proj.max_delay > 1 and proj.uniform_delay == -1
+        if proj.max_delay > 1 and not has_nonuniform_delay: # Uniform delays
+            pre_array = "pop%(id_pre)s._delayed_spike[%(delay)s]" % {'id_proj' : proj.id, 'id_pre': proj.pre.id, 'delay': str(proj.uniform_delay-1)}
+        else: # Non-uniform delays are queued when the spikes are emitted
             pre_array = "pop%(id_pre)s.spiked" % ids
 
-        # No need for openmp if less than 100 post neurons
-        omp_code = ""
-        if Global.config['num_threads']>1:
-            if proj.post.size > Global.OMP_MIN_NB_NEURONS and len(updated_variables_list) > 0:
-                omp_code = """#pragma omp parallel for firstprivate(nb_post, inv_post) private(i, j)"""%{'id_proj' : proj.id}
+        # With several threads, each thread propagates the spikes to its own slice of post-synaptic neurons
+        partition_code = ""; omp_code = ""; thread_code = ""
+        first_synapse = "inv_pre_ptr[rk_j]"; last_synapse = "inv_pre_ptr[rk_j+1]"
+        event_queue = "_delayed_events[0]"
+        if self._partitioned_propagation(proj):
+            partition_code = ProjTemplate.inverse_connectivity_partition['update'] % {
+                'id_pre': proj.pre.id,
+                'dendrite_size': "row_ptr[i+1] - row_ptr[i]" if proj._has_csr_storage() else "pre_rank[i].size()",
+                'resize_queue': ProjTemplate.spike_delay_queue['resize'] % {'max_delay': proj.max_delay} if has_nonuniform_delay else ""
+            }
+            omp_code = "#pragma omp parallel private(nb_post, i, j, rk_j)"
+            thread_code = "int _thread = omp_get_thread_num();"
+            first_synapse = "inv_thread_ptr[_thread][rk_j]"; last_synapse = "inv_thread_ptr[_thread+1][rk_j]"
+            event_queue = "_delayed_events[_thread]"
 
         # Generate the whole code block
         code = ""
-        if g_target_code != "" or pre_code != "":
+        if (g_target_code != "" or pre_code != "") and has_nonuniform_delay:
             code = """
 // Event-based summation
 if (_transmission && pop%(id_post)s._active){
-    std::vector< std::pair<int, int> > inv_post;
-    // Iterate over all incoming spikes
-    for(int _idx_j = 0; _idx_j < %(pre_array)s.size(); _idx_j++){
-        rk_j = %(pre_array)s[_idx_j];
-        inv_post = inv_pre_rank[rk_j];
-        nb_post = inv_post.size();
-        // Iterate over connected post neurons
-        %(omp_code)s
-        for(int _idx_i = 0; _idx_i < nb_post; _idx_i++){
+%(partition)s
+    %(omp_code)s
+    {
+        %(thread_code)s
+        std::vector< std::vector<int> > &_queue = %(event_queue)s;
+        // Queue the incoming spikes until their arrival
+        for(int _idx_j = 0; _idx_j < %(pre_array)s.size(); _idx_j++){
+            rk_j = %(pre_array)s[_idx_j];
+            nb_post = %(last_synapse)s;
+            for(int _idx_i = %(first_synapse)s; _idx_i < nb_post; _idx_i++){
+                i = inv_dendrite[_idx_i];
+                j = inv_synapse[_idx_i];
+                int _slot = _event_head + delay[i][j] - 1;
+                _queue[_slot < _queue.size() ? _slot : _slot - _queue.size()].push_back(_idx_i);
+            }
+        }
+        // Iterate over the synapses receiving a spike at this step
+        std::vector<int> &_events = _queue[_event_head];
+        for(int _idx_i = 0; _idx_i < _events.size(); _idx_i++){
             // Retrieve the correct indices
-            i = inv_post[_idx_i].first;
-            j = inv_post[_idx_i].second;
+            i = inv_dendrite[_events[_idx_i]];
+            j = inv_synapse[_events[_idx_i]];
 %(event_driven)s
 %(g_target)s
 %(pre_event)s
         }
+        _events.clear();
     }
+    _event_head = (_event_head + 1 < %(max_delay)s) ? _event_head + 1 : 0;
 } // active
 """%{   'id_pre': proj.pre.id,
         'id_post': proj.post.id,
         'pre_array': pre_array,
-        'pre_event': pre_code,
-        'g_target': g_target_code,
+        'pre_event': tabify(pre_code, 1),
+        'g_target': tabify(g_target_code, 1),
         'omp_code': omp_code,
-        'event_driven': event_driven_code
+        'partition': partition_code,
+        'thread_code': thread_code,
+        'first_synapse': first_synapse,
+        'last_synapse': last_synapse,
+        'event_queue': event_queue,
+        'max_delay': proj.max_delay,
+        'event_driven': tabify(event_driven_code, 1)
+    }
+
+        elif g_target_code != "" or pre_code != "":
+            code = """
+// Event-based summation
+if (_transmission && pop%(id_post)s._active){
+%(partition)s
+    %(omp_code)s
+    {
+        %(thread_code)s
+        // Iterate over all incoming spikes
+        for(int _idx_j = 0; _idx_j < %(pre_array)s.size(); _idx_j++){
+            rk_j = %(pre_array)s[_idx_j];
+            nb_post = %(last_synapse)s;
+            // Iterate over connected post neurons
+            for(int _idx_i = %(first_synapse)s; _idx_i < nb_post; _idx_i++){
+                // Retrieve the correct indices
+                i = inv_dendrite[_idx_i];
+                j = inv_synapse[_idx_i];
+%(event_driven)s
+%(g_target)s
+%(pre_event)s
+            }
+        }
+    }
+} // active
+"""%{   'id_pre': proj.pre.id,
+        'id_post': proj.post.id,
+        'pre_array': pre_array,
+        'pre_event': tabify(pre_code, 1),
+        'g_target': tabify(g_target_code, 1),
+        'omp_code': omp_code,
+        'partition': partition_code,
+        'thread_code': thread_code,
+        'first_synapse': first_synapse,
+        'last_synapse': last_synapse,
+        'event_driven': tabify(event_driven_code, 1)
     }
 
         # Add tabs
         code = tabify(code, 2)
 
+        # The parser uses LIL indices for t_pre and event-driven variables
+        if proj._has_csr_storage():
+            code = csr_indices(code)
+
         ####################################################
         # Not even-driven summation of psp: like rate-coded
         ####################################################
@@ -966,6 +1117,16 @@ _last_event[i][j] = t;
         else:
             omp_code = ""
 
+        # Loop over the synapses of the dendrite
+        if proj._has_csr_storage():
+            loop = """nb_pre = row_ptr[i+1];
+        %(omp_code)s
+        for(j = row_ptr[i]; j < nb_pre; j++){""" % {'omp_code': omp_code}
+        else:
+            loop = """nb_pre = pre_rank[i].size();
+        %(omp_code)s
+        for(j = 0; j < nb_pre; j++){""" % {'omp_code': omp_code}
+
         # Generate the code block
         code = """
 if(_transmission && pop%(id_post)s._active){
@@ -977,9 +1138,7 @@ if(_transmission && pop%(id_post)s._active){
         // Leave if the neuron is not part of the projection
         if (i==-1) continue;
         // Iterate over all synapse to this neuron
-        nb_pre = pre_rank[i].size();
-        %(omp_code)s
-        for(j = 0; j < nb_pre; j++){
+        %(loop)s
 %(event_driven)s
 %(post_event)s
         }
@@ -988,7 +1147,11 @@ if(_transmission && pop%(id_post)s._active){
 """%{'id_post': proj.post.id,
     'post_event': post_code,
     'event_driven': event_driven_code,
-    'omp_code': omp_code}
+    'loop': loop}
+
+        # The parser uses LIL indices for t_pre and event-driven variables
+        if proj._has_csr_storage():
+            code = csr_indices(code)
 
         return post_event_prefix, tabify(code, 2)
 
@@ -1015,6 +1178,9 @@ if(_transmission && pop%(id_post)s._active){
                 'delay_nu' : '[delay[i][j]-1]', # non-uniform delay
                 'delay_u' : '[' + str(proj.uniform_delay-1) + ']' # uniform delay
         }
+        if proj._has_flat_storage(): # CSR or SELL: j is the index of the synapse in the flat arrays
+            ids['local_index'] = '[j]'
+            ids['delay_nu'] = '[delay[j]-1]'
 
         # Global variables
         global_eq = generate_equation_code(proj.id, proj.synapse_type.description, 'global', 'proj', padding=2, wrap_w="_plasticity")
@@ -1026,6 +1192,11 @@ if(_transmission && pop%(id_post)s._active){
         if local_eq.strip() == '' and global_eq.strip() == '' :
             return "", ""
 
+        # Terms of the local equations which are the same for all synapses of a dendrite
+        pre_loop = generate_pre_loop_code(proj.synapse_type.description, 'local', padding=2)
+        if pre_loop != "":
+            global_eq += '\n' + pre_loop
+
 
         # Special case where w is a single value
         if proj._has_single_weight():
@@ -1083,7 +1254,11 @@ if(_transmission && pop%(id_post)s._active){
                         )
 
         # Choose the template
-        if proj._dense_matrix: # Dense matrix
+        if proj._has_sell_storage(): # Chunks of dendrites
+            template = ProjTemplate.sell_update_variables
+        elif proj._has_csr_storage(): # Flat CSR arrays
+            template = ProjTemplate.csr_update_variables
+        elif proj._dense_matrix: # Dense matrix
             template = ProjTemplate.dense_update_variables
         else: # Default: LIL
             template = ProjTemplate.lil_update_variables
@@ -1104,6 +1279,10 @@ if(_transmission && pop%(id_post)s._active){
                 'omp_code': omp_code
             }
 
+        # The parser uses LIL indices for t_pre and event-driven variables
+        if proj._has_flat_storage():
+            code = csr_indices(code)
+
         if self._prof_gen:
             code = self._prof_gen.annotate_update_synapse_omp(proj, code)
 
@@ -1269,6 +1448,11 @@ if(_transmission && pop%(id_post)s._active){
 
         code = ""
         for rd in proj.synapse_type.description['random_distributions']:
+            if proj._has_flat_storage():
+                code += """    %(rd_name)s = std::vector<double>(col_idx.size(), 0.0);
+    dist_%(rd_name)s = %(rd_init)s;
+""" % {'id_proj': proj.id, 'rd_name': rd['name'], 'rd_init': rd['definition']% {'id': proj.id}}
+                continue
             code += """    %(rd_name)s = std::vector< std::vector<double> >(post_rank.size(), std::vector<double>());
     for(int i=0; i<post_rank.size(); i++){
         %(rd_name)s[i] = std::vector<double>(pre_rank[i].size(), 0.0);
@@ -1282,17 +1466,25 @@ if(_transmission && pop%(id_post)s._active){
         if 'update_rng' in proj._specific_template.keys():
             return proj._specific_template['update_rng']
 
+        # Loop over the synapses of a dendrite
+        if proj._has_csr_storage():
+            loop = "for(int j = row_ptr[i]; j < row_ptr[i+1]; j++)"
+        elif proj._has_sell_storage():
+            loop = "for(int j = row_start[i]; j < row_start[i] + row_len[i]*chunk_size; j += chunk_size)"
+        else:
+            loop = "for(int j = 0; j < pre_rank[i].size(); j++)"
+
         code = ""
         if len(proj.synapse_type.description['random_distributions']) > 0:
             code += """
     // RD of proj%(id_proj)s
     for(int i = 0; i < post_rank.size(); i++){
-        for(int j = 0; j < pre_rank[i].size(); j++){
-"""% {'id_proj': proj.id}
+        %(loop)s{
+"""% {'id_proj': proj.id, 'loop': loop}
 
             for rd in proj.synapse_type.description['random_distributions']:
                 code += """
-            %(rd_name)s[i][j] = dist_%(rd_name)s(rng);""" % {'id_proj': proj.id, 'rd_name': rd['name']}
+            %(rd_name)s%(local_index)s = dist_%(rd_name)s(rng);""" % {'id_proj': proj.id, 'rd_name': rd['name'], 'local_index': '[j]' if proj._has_flat_storage() else '[i][j]'}
 
             code += """
         }
@@ -1345,7 +1537,7 @@ if(_transmission && pop%(id_post)s._active){
         if proj.max_delay > 1 and proj.uniform_delay == -1:
             delay_code = "delay[post].insert(delay[post].begin() + idx, _delay)"
 
-        # Spiking networks must update the inv_pre_rank array
+        # Spiking networks must rebuild the inverse connectivity
         spiking_addcode = "" if proj.synapse_type.type == 'rate' else header_tpl['spiking_addcode']
         spiking_removecode = "" if proj.synapse_type.type == 'rate' else header_tpl['spiking_removecode']
 
@@ -1544,6 +1736,11 @@ if(_transmission && pop%(id_post)s._active){
 ######################################
 ### Code generation
 ######################################
+def csr_indices(code):
+    "Replaces the LIL indices of a synapse (i, j) by its index j in the CSR arrays."
+    code = code.replace('pre_rank[i][j]', 'col_idx[j]')
+    return code.replace('[i][j]', '[j]')
+
 def get_bounds(param):
     "Analyses the bounds of a variable and returns the corresponding code."
     code = ""
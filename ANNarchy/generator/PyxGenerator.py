@@ -137,8 +137,11 @@ class PyxGenerator(object):
         # Spiking neurons have additional data
         export_refractory = ""
         if pop.neuron_type.type == 'spike':
+            export_refractory = """
+        vector[int] spiked
+"""
             if pop.neuron_type.refractory or pop.refractory:
-                export_refractory = """
+                export_refractory += """
         vector[int] refractory
 """
         # Parameters and variables
@@ -156,8 +159,8 @@ class PyxGenerator(object):
             export_targets += """
         # Targets"""
             for target in sorted(list(set(pop.neuron_type.description['targets'] + pop.targets))):
-                export_targets += """        vector[double] _sum_%(target)s
-""" % {'target' : target}
+                export_targets += """        vector[%(float_prec)s] _sum_%(target)s
+""" % {'target' : target, 'float_prec': Global._float_type()}
         if 'export_targets' in pop._specific_template.keys():
             export_targets = pop._specific_template['export_targets']
 
@@ -191,6 +194,11 @@ class PyxGenerator(object):
 
         # Spiking neurons have aditional data
         if pop.neuron_type.type == 'spike':
+            wrapper_access_refractory += """
+    # Ranks of the neurons which spiked at the last step, in emission order
+    cpdef list get_spiked(self):
+        return pop%(id)s.spiked
+""" % {'id': pop.id}
             if pop.neuron_type.refractory or pop.refractory:
                 wrapper_access_refractory += """
     # Refractory period
@@ -202,9 +210,9 @@ class PyxGenerator(object):
 
         # Parameters
         for var in pop.neuron_type.description['parameters']:
-            wrapper_access_parameters_variables += PopTemplate.attribute_pyx_wrapper[var['locality']] % {'id' : pop.id, 'name': var['name'], 'type': var['ctype'], 'attr_type': 'parameter'}
+            wrapper_access_parameters_variables += PopTemplate.attribute_pyx_wrapper[var['locality']] % {'id' : pop.id, 'name': var['name'], 'type': var['ctype'], 'dtype': _numpy_dtype(var['ctype']), 'attr_type': 'parameter'}
         for var in pop.neuron_type.description['variables']:
-            wrapper_access_parameters_variables += PopTemplate.attribute_pyx_wrapper[var['locality']] % {'id' : pop.id, 'name': var['name'], 'type': var['ctype'], 'attr_type': 'variable'}
+            wrapper_access_parameters_variables += PopTemplate.attribute_pyx_wrapper[var['locality']] % {'id' : pop.id, 'name': var['name'], 'type': var['ctype'], 'dtype': _numpy_dtype(var['ctype']), 'attr_type': 'variable'}
 
         # Specific populations can overwrite
         if 'wrapper_args' in pop._specific_template.keys():
@@ -262,23 +270,35 @@ class PyxGenerator(object):
 
         sp_tpl = ProjTemplate.structural_plasticity['pyx_struct']
 
+        # Flat CSR or SELL arrays instead of the LIL
+        delay_tpl = ProjTemplate.delay
+        event_driven_tpl = ProjTemplate.event_driven
+        if proj._has_csr_storage():
+            connectivity_tpl = ProjTemplate.csr_connectivity_matrix_omp
+            weight_tpl = ProjTemplate.csr_weight_matrix_omp
+            delay_tpl = ProjTemplate.csr_delay
+            event_driven_tpl = ProjTemplate.csr_event_driven
+        elif proj._has_sell_storage():
+            connectivity_tpl = ProjTemplate.sell_connectivity_matrix_omp
+            weight_tpl = ProjTemplate.sell_weight_matrix_omp
+
         # Special case for single weights
         if proj._has_single_weight():
             weight_tpl = ProjTemplate.single_weight_matrix_omp  
 
         # Export connectivity matrix
         export_connectivity_matrix = connectivity_tpl['pyx_struct']
-        export_connectivity_matrix += weight_tpl['pyx_struct']
+        export_connectivity_matrix += weight_tpl['pyx_struct'] % {'float_prec': Global._float_type()}
 
         # Delay 
         export_delay=""
         if has_delay:
-            export_delay = ProjTemplate.delay['pyx_struct'] % {'id': proj.id} 
+            export_delay = delay_tpl['pyx_struct'] % {'id': proj.id} 
 
         # Event-driven
         export_event_driven = ""
         if has_event_driven:
-            export_event_driven = ProjTemplate.event_driven['pyx_struct']
+            export_event_driven = event_driven_tpl['pyx_struct']
 
         # Determine all export methods
         export_parameters_variables = ""
@@ -366,6 +386,18 @@ class PyxGenerator(object):
         # Import weight array template
         weight_tpl = ProjTemplate.lil_weight_matrix_omp if Global.config['paradigm'] == "openmp" else ProjTemplate.csr_weight_matrix_cuda
         
+        # Flat CSR or SELL arrays instead of the LIL
+        delay_tpl = ProjTemplate.delay
+        event_driven_tpl = ProjTemplate.event_driven
+        if proj._has_csr_storage():
+            connectivity_tpl = ProjTemplate.csr_connectivity_matrix_omp
+            weight_tpl = ProjTemplate.csr_weight_matrix_omp
+            delay_tpl = ProjTemplate.csr_delay
+            event_driven_tpl = ProjTemplate.csr_event_driven
+        elif proj._has_sell_storage():
+            connectivity_tpl = ProjTemplate.sell_connectivity_matrix_omp
+            weight_tpl = ProjTemplate.sell_weight_matrix_omp
+
         # Special case for single weights
         if proj._has_single_weight():
             weight_tpl = ProjTemplate.single_weight_matrix_omp            
@@ -378,24 +410,24 @@ class PyxGenerator(object):
 
         # Wrapper constructor
         wrapper_init = connectivity_tpl['pyx_wrapper_init'] % {'id_proj': proj.id}
-        wrapper_init += weight_tpl['pyx_wrapper_init'] % {'id_proj': proj.id}
+        wrapper_init += weight_tpl['pyx_wrapper_init'] % {'id_proj': proj.id, 'syn_w': 'syn.w' if Global._float_type() == 'double' else 'single_precision(syn.w)'}
 
         # Wrapper sccess to connectivity matrix 
         wrapper_access_connectivity = connectivity_tpl['pyx_wrapper_accessor'] % {'id_proj': proj.id}
-        wrapper_access_connectivity += weight_tpl['pyx_wrapper_accessor'] % {'id_proj': proj.id}
+        wrapper_access_connectivity += weight_tpl['pyx_wrapper_accessor'] % {'id_proj': proj.id, 'float_prec': Global._float_type()}
 
         # Delays
         wrapper_init_delay = ""; wrapper_access_delay=""
         if has_delay:
             # Initialize the wrapper
-            wrapper_init_delay = ProjTemplate.delay['pyx_wrapper_init'] % {'id_proj': proj.id}
+            wrapper_init_delay = delay_tpl['pyx_wrapper_init'] % {'id_proj': proj.id}
             # Access in wrapper
-            wrapper_access_delay = ProjTemplate.delay['pyx_wrapper_accessor'] % {'id_proj': proj.id}
+            wrapper_access_delay = delay_tpl['pyx_wrapper_accessor'] % {'id_proj': proj.id}
 
         # Event-driven
         wrapper_init_event_driven = ""
         if has_event_driven:
-            wrapper_init_event_driven = ProjTemplate.event_driven['pyx_wrapper_init'] % {'id_proj': proj.id}
+            wrapper_init_event_driven = event_driven_tpl['pyx_wrapper_init'] % {'id_proj': proj.id}
 
         # Determine all accessor methods
         wrapper_access_parameters_variables = ""
@@ -579,3 +611,7 @@ cdef class ProjRecorder%(id)s_wrapper(Monitor_wrapper):
         (<ProjRecorder%(id)s *>self.thisptr).%(name)s.clear()""" % {'id' : proj.id, 'name': var['name']}
 
         return tpl_code % {'id' : proj.id}
+
+def _numpy_dtype(ctype):
+    "NumPy type of the arrays returned for local attributes (None lets NumPy infer it)."
+    return 'np.float32' if ctype == 'float' else 'None'
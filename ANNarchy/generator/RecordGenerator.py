@@ -52,18 +52,24 @@ class RecordGenerator:
     def generate(self):
         """
         Generate one file "Recorder.h" comprising of Monitor base class and inherited
-        classes for each Population/Projection.
+        classes for each Population/Projection. With OpenMP, the recording methods
+        are defined in a separate translation unit "Recorder.cpp".
 
         Templates:
 
             record_base_class
         """
         record_class = ""
+        record_body = ""
         for pop in self._populations:
-            record_class += self._pop_recorder_class(pop)
+            struct_code, body_code = self._pop_recorder_class(pop)
+            record_class += struct_code
+            record_body += body_code
 
         for proj in self._projections:
-            record_class += self._proj_recorder_class(proj)
+            struct_code, body_code = self._proj_recorder_class(proj)
+            record_class += struct_code
+            record_body += body_code
         
         code = RecTemplate.record_base_class % {'record_classes': record_class}
         
@@ -71,13 +77,19 @@ class RecordGenerator:
         with open(self._annarchy_dir+'/generate/Recorder.h', 'w') as ofile:
             ofile.write(code)
 
+        # Definition of the recording methods
+        if Global.config['paradigm']=="openmp":
+            with open(self._annarchy_dir+'/generate/Recorder.cpp', 'w') as ofile:
+                ofile.write(RecTemplate.record_body_file % {'record_bodies': record_body})
+
     def _pop_recorder_class(self, pop):
         """
         Creates population recording class code.
 
         Returns:
 
-            * complete code as string
+            * class declaration and definition of the record() method (empty
+              for CUDA, where it is defined in the class)
 
         Templates:
 
@@ -131,7 +143,10 @@ class RecordGenerator:
             }
         }""" % {'id': pop.id, 'type' : 'int', 'name': 'spike'}
 
-        return tpl_code % {'id': pop.id, 'init_code': init_code, 'recording_code': recording_code, 'struct_code': struct_code}
+        rec_dict = {'id': pop.id, 'init_code': init_code, 'recording_code': recording_code, 'struct_code': struct_code}
+        body_code = template['body'] % rec_dict if 'body' in template.keys() else ""
+
+        return tpl_code % rec_dict, body_code
 
     def _proj_recorder_class(self, proj):
         """
@@ -139,7 +154,8 @@ class RecordGenerator:
 
         Returns:
 
-            * complete code as string
+            * class declaration and definition of the record() method (empty
+              for CUDA, where it is defined in the class)
 
         Templates:
 
@@ -153,6 +169,12 @@ class RecordGenerator:
         for var in proj.synapse_type.description['variables']:
             struct_code += tpl_code[var['locality']]['struct'] % {'type' : var['ctype'], 'name': var['name']}
             init_code += tpl_code[var['locality']]['init'] % {'type' : var['ctype'], 'name': var['name']}
-            recording_code += tpl_code[var['locality']]['recording'] % {'id': proj.id, 'type' : var['ctype'], 'name': var['name']}
+            # CSR and SELL store local variables in flat arrays: copy the dendrite
+            recording_tpl = 'recording_csr' if proj._has_flat_storage() and var['locality'] == 'local' else 'recording'
+            recording_code += tpl_code[var['locality']][recording_tpl] % {'id': proj.id, 'type' : var['ctype'], 'name': var['name']}
+
+        rec_dict = {'id': proj.id, 'init_code': init_code, 'recording_code': recording_code, 'struct_code': struct_code}
+        if Global.config['paradigm']=="openmp":
+            return tpl_code['struct_omp'] % rec_dict, tpl_code['body_omp'] % rec_dict
 
-        return tpl_code['struct'] % {'id': proj.id, 'init_code': init_code, 'recording_code': recording_code, 'struct_code': struct_code}
+        return tpl_code['struct'] % rec_dict, ""
@@ -32,6 +32,31 @@ omp_header_template = """#ifndef __ANNARCHY_H__
  */
 %(custom_func)s
 
+/*
+ * Delayed values of an attribute or of the spikes: circular buffer of the last values,
+ * buffer[d] being the value d+1 steps ago. push() overwrites the oldest value in place
+ * and moves the head, so that no memory is allocated during the simulation.
+ *
+ */
+template<typename T>
+class DelayBuffer {
+public:
+    void init(int nb_steps, const T &value) { _values = std::vector<T>(nb_steps, value); _head = 0; }
+    void fill(const T &value) { std::fill(_values.begin(), _values.end(), value); }
+    void push(const T &value) {
+        _head = (_head == 0 ? _values.size() : _head) - 1;
+        _values[_head] = value;
+    }
+    T& operator[](int d) {
+        int idx = _head + d;
+        return _values[idx < _values.size() ? idx : idx - _values.size()];
+    }
+    int size() const { return _values.size(); }
+private:
+    std::vector<T> _values;
+    int _head;
+};
+
 /*
  * Structures for the populations
  *
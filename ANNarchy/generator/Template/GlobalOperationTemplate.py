@@ -1,7 +1,7 @@
 global_operation_templates_openmp = {
     'max' : """
 // Computes the maximum value of an array
-double max_value(const double* array, int n)
+double max_value(const %(type)s* array, int n)
 {
     double max = array[0];
     for(int i=0; i<n; i++)
@@ -15,7 +15,7 @@ double max_value(const double* array, int n)
     """,
     'min' : """
 // Computes the minimum value of an array
-double min_value(const double* array, int n)
+double min_value(const %(type)s* array, int n)
 {
     double min = array[0];
     for(int i=0; i<n; i++)
@@ -29,7 +29,7 @@ double min_value(const double* array, int n)
     """,
     'mean' : """
 // Computes the mean value of an array
-double mean_value(const double* array, int n)
+double mean_value(const %(type)s* array, int n)
 {
     double sum = 0.0;
     %(omp)s#pragma omp parallel for reduction(+:sum)
@@ -42,7 +42,7 @@ double mean_value(const double* array, int n)
     """,
     'norm1' : """
 // Computes the L1-norm of an array
-double norm1_value(const double* array, int n)
+double norm1_value(const %(type)s* array, int n)
 {
     double sum = 0.0;
     %(omp)s#pragma omp parallel for reduction(+:sum)
@@ -56,7 +56,7 @@ double norm1_value(const double* array, int n)
     """,
     'norm2' : """
 // Computes the L2-norm (Euclidian) of an array
-double norm2_value(const double* array, int n)
+double norm2_value(const %(type)s* array, int n)
 {
     double sum = 0.0;
     %(omp)s#pragma omp parallel for reduction(+:sum)
@@ -71,11 +71,11 @@ double norm2_value(const double* array, int n)
 }
 
 global_operation_templates_extern = {
-    'max': "extern double max_value(const double*, int);\n",
-    'min': "extern double min_value(const double*, int);\n",
-    'mean': "extern double mean_value(const double*, int);\n",
-    'norm1': "extern double norm1_value(const double*, int);\n",
-    'norm2': "extern double norm2_value(const double*, int);\n"
+    'max': "extern double max_value(const %(type)s*, int);\n",
+    'min': "extern double min_value(const %(type)s*, int);\n",
+    'mean': "extern double mean_value(const %(type)s*, int);\n",
+    'norm1': "extern double norm1_value(const %(type)s*, int);\n",
+    'norm2': "extern double norm2_value(const %(type)s*, int);\n"
 }
 
 #
@@ -1,14 +1,31 @@
 # Linux, Seq or OMP
+#
+# Each generated source file (core step, populations, projections, recorders,
+# cython wrapper) is compiled into its own object file, so that only the
+# modified objects are recompiled (in parallel when using make -j). The
+# dependencies on the headers are tracked with -MMD.
 linux_omp_template = """# Makefile generated by ANNarchy
-all:
-\tcython -%(py_major)s build/net%(net_id)s/ANNarchyCore%(net_id)s.pyx --cplus
-\t%(compiler)s %(cpu_flags)s -shared -fPIC -fpermissive -std=c++0x  %(openmp)s \\
-        build/net%(net_id)s/*.cpp -o ANNarchyCore%(net_id)s.so \\
-        %(python_include)s -I%(numpy_include)s \\
+BUILD_DIR = build/net%(net_id)s
+OBJECTS = %(objects)s $(BUILD_DIR)/ANNarchyCore%(net_id)s.o
+CXXFLAGS = %(cpu_flags)s -fPIC -fpermissive -std=c++0x %(openmp)s %(python_include)s -I%(numpy_include)s
+
+all: ANNarchyCore%(net_id)s.so
+
+$(BUILD_DIR)/ANNarchyCore%(net_id)s.cpp: $(BUILD_DIR)/ANNarchyCore%(net_id)s.pyx
+\tcython -%(py_major)s $< --cplus
+
+$(BUILD_DIR)/%%.o: $(BUILD_DIR)/%%.cpp
+\t%(compiler)s $(CXXFLAGS) -MMD -MP -c $< -o $@
+
+ANNarchyCore%(net_id)s.so: $(OBJECTS)
+\t%(compiler)s -shared -fPIC %(openmp)s $(OBJECTS) -o $@ \\
         %(python_lib)s %(libs)s
 
+-include $(OBJECTS:.o=.d)
+
 clean:
 \trm -rf build/net%(net_id)s/*.o
+\trm -rf build/net%(net_id)s/*.d
 \trm -rf build/net%(net_id)s/*.so
 \trm -rf *.so
 """
@@ -59,46 +59,73 @@ struct PopStruct%(id)s{
 %(access_parameters_variables)s
 
     // Method called to initialize the data structures
-    void init_population() {
-        size = %(size)s;
-        _active = true;
+    void init_population();
+
+    // Method called to reset the population
+    void reset();
+
+    // Method to draw new random numbers
+    void update_rng();
+
+    // Method to update global operations on the population (min/max/mean...)
+    void update_global_ops();
+
+    // Method to enqueue output variables in case outgoing projections have non-zero delay
+    void update_delay();
+
+    // Main method to update neural variables
+    void update();
+
+    %(stop_condition)s
+};
+"""
+
+# Definition of the methods declared in header_struct_omp, stored in pop%(id)s.cpp
+# so that each population is compiled in its own translation unit.
+body_struct_omp = """#include "ANNarchy.h"
+
+///////////////////////////////////////////////////////////////
+// Methods of the population of id %(id)s (%(name)s)
+///////////////////////////////////////////////////////////////
+
+// Method called to initialize the data structures
+void PopStruct%(id)s::init_population() {
+    size = %(size)s;
+    _active = true;
 %(init_parameters_variables)s
 %(init_spike)s
 %(init_delay)s
 %(init_FR)s
 %(init_additional)s
 %(init_profile)s
-    }
+}
 
-    // Method called to reset the population
-    void reset() {
+// Method called to reset the population
+void PopStruct%(id)s::reset() {
 %(reset_spike)s
 %(reset_delay)s
 %(reset_additional)s
-    }
+}
 
-    // Method to draw new random numbers
-    void update_rng() {
+// Method to draw new random numbers
+void PopStruct%(id)s::update_rng() {
 %(update_rng)s
-    }
+}
 
-    // Method to update global operations on the population (min/max/mean...)
-    void update_global_ops() {
+// Method to update global operations on the population (min/max/mean...)
+void PopStruct%(id)s::update_global_ops() {
 %(update_global_ops)s
-    }
+}
 
-    // Method to enqueue output variables in case outgoing projections have non-zero delay
-    void update_delay() {
+// Method to enqueue output variables in case outgoing projections have non-zero delay
+void PopStruct%(id)s::update_delay() {
 %(update_delay)s
-    }
+}
 
-    // Main method to update neural variables
-    void update() {
+// Main method to update neural variables
+void PopStruct%(id)s::update() {
 %(update_variables)s
-    }
-
-    %(stop_condition)s
-};
+}
 """
 
 header_struct_cuda = """#pragma once
@@ -298,7 +325,7 @@ attribute_pyx_wrapper = {
 """
     # Local %(attr_type)s %(name)s
     cpdef np.ndarray get_%(name)s(self):
-        return np.array(pop%(id)s.get_%(name)s())
+        return np.array(pop%(id)s.get_%(name)s(), dtype=%(dtype)s)
     cpdef set_%(name)s(self, np.ndarray value):
         pop%(id)s.set_%(name)s( value )
     cpdef %(type)s get_single_%(name)s(self, int rank):
@@ -356,13 +383,11 @@ attribute_cpp_init = {
 attribute_delayed = {
     'openmp':{
         'local': """
-        _delayed_%(var)s = std::deque< std::vector<double> >(%(delay)s, std::vector<double>(size, 0.0));""",
+        _delayed_%(var)s.init(%(delay)s, std::vector<%(type)s>(size, 0.0));""",
         'global': """
-        _delayed_%(var)s = std::deque< double >(%(delay)s, 0.0);""",
+        _delayed_%(var)s.init(%(delay)s, 0.0);""",
         'reset' : """
-        for ( int i = 0; i < _delayed_%(var)s.size(); i++ ) {
-            _delayed_%(var)s[i] = %(var)s;
-        }
+        _delayed_%(var)s.fill(%(var)s);
         """
     },
     'cuda':{
@@ -482,6 +507,10 @@ spike_specific = {
         // Spiking variables
         spiked = std::vector<int>(0, 0);
         last_spike = std::vector<long int>(size, -10000L);
+""",
+    'declare_thread_spiked': """
+    // Spikes emitted by each thread, merged in rank order after the update
+    std::vector< std::vector<int> > _thread_spiked;
 """,
     'declare_refractory': """    
     // Refractory period
@@ -506,13 +535,65 @@ spike_specific = {
 """
 }
 
+# Update list of populations skipping the neurons at rest: a neuron is put back
+# in the list when it receives a spike or when its attributes are set from Python.
+quiescence = {
+    'declare': """
+    // Neurons updated at the next step, the others are at rest
+    std::vector<int> _active_neurons;
+    std::vector<char> _is_active;
+    void wake_up(int rk) {
+        if(!_is_active[rk]){
+            #pragma omp critical
+            {
+                if(!_is_active[rk]){
+                    _is_active[rk] = 1;
+                    _active_neurons.push_back(rk);
+                }
+            }
+        }
+    }
+    void wake_up_all() {
+        _active_neurons = std::vector<int>(size);
+        for(int i = 0; i < size; i++)
+            _active_neurons[i] = i;
+        _is_active = std::vector<char>(size, 1);
+    }
+""",
+    'init': """
+        // All neurons are updated at the first step
+        wake_up_all();
+""",
+    'reset': """
+        wake_up_all();
+"""
+}
+
+# Accessors of populations skipping the neurons at rest: setting an attribute wakes the neurons up.
+attribute_acc_quiescence = {
+    'local':
+"""
+    // Local %(attr_type)s %(name)s
+    std::vector< %(type)s > get_%(name)s() { return %(name)s; }
+    %(type)s get_single_%(name)s(int rk) { return %(name)s[rk]; }
+    void set_%(name)s(std::vector< %(type)s > val) { %(name)s = val; wake_up_all(); }
+    void set_single_%(name)s(int rk, %(type)s val) { %(name)s[rk] = val; wake_up(rk); }
+""",
+    'global':
+"""
+    // Global %(attr_type)s %(name)s
+    %(type)s get_%(name)s() { return %(name)s; }
+    void set_%(name)s(%(type)s val) { %(name)s = val; wake_up_all(); }
+"""
+}
+
 rate_psp = {
     'openmp':
     {
-        'decl': """    std::vector<double> _sum_%(target)s;""",
+        'decl': """    std::vector<%(float_prec)s> _sum_%(target)s;""",
         'init': """
         // Post-synaptic potential
-        _sum_%(target)s = std::vector<double>(size, 0.0);""",
+        _sum_%(target)s = std::vector<%(float_prec)s>(size, 0.0);""",
     },
     'cuda':
     {
@@ -25,7 +25,126 @@
 ######################################
 ### Main template
 ######################################
-header_struct = """#pragma once
+header_struct_omp = """#pragma once
+
+#include "pop%(id_pre)s.hpp"
+#include "pop%(id_post)s.hpp"
+%(include_additional)s
+%(include_profile)s
+
+extern PopStruct%(id_pre)s pop%(id_pre)s;
+extern PopStruct%(id_post)s pop%(id_post)s;
+%(struct_additional)s
+
+/////////////////////////////////////////////////////////////////////////////
+// proj%(id_proj)s: %(name_pre)s -> %(name_post)s with target %(target)s
+/////////////////////////////////////////////////////////////////////////////
+struct ProjStruct%(id_proj)s{
+    // Number of dendrites
+    int size;
+
+    // Transmission and plasticity flags
+    bool _transmission, _plasticity, _update;
+    int _update_period;
+    long int _update_offset;
+
+%(declare_connectivity_matrix)s
+%(declare_inverse_connectivity_matrix)s
+%(declare_delay)s
+%(declare_event_driven)s
+%(declare_rng)s
+%(declare_parameters_variables)s
+%(declare_additional)s
+%(declare_profile)s
+
+    // Method called to initialize the projection
+    void init_projection();
+
+    // Spiking networks: inverse the connectivity matrix
+    void inverse_connectivity_matrix();
+
+    // Computes the weighted sum of inputs or updates the conductances
+    void compute_psp();
+
+    // Draws random numbers
+    void update_rng();
+
+    // Updates synaptic variables
+    void update_synapse();
+
+    // Post-synaptic events
+    void post_event();
+
+    // Accessors for default attributes
+    int get_size() { return size; }
+    void set_size(int new_size) { size = new_size; }
+
+    // Additional access methods
+%(access_connectivity_matrix)s
+%(access_parameters_variables)s
+%(access_additional)s
+};
+"""
+
+# Definition of the methods declared in header_struct_omp, stored in proj%(id_proj)s.cpp
+# so that each projection is compiled in its own translation unit.
+body_struct_omp = """#include "ANNarchy.h"
+
+/////////////////////////////////////////////////////////////////////////////
+// proj%(id_proj)s: %(name_pre)s -> %(name_post)s with target %(target)s
+/////////////////////////////////////////////////////////////////////////////
+
+// Method called to initialize the projection
+void ProjStruct%(id_proj)s::init_projection() {
+    _transmission = true;
+    _update = true;
+    _plasticity = true;
+    _update_period = 1;
+    _update_offset = 0L;
+
+%(init_connectivity_matrix)s
+
+    // Inverse the connectivity matrix if spiking neurons
+    inverse_connectivity_matrix();
+
+%(init_delay)s
+%(init_event_driven)s
+%(init_parameters_variables)s
+%(init_rng)s
+%(init_additional)s
+%(init_profile)s
+}
+
+// Spiking networks: inverse the connectivity matrix
+void ProjStruct%(id_proj)s::inverse_connectivity_matrix() {
+%(init_inverse_connectivity_matrix)s
+}
+
+// Computes the weighted sum of inputs or updates the conductances
+void ProjStruct%(id_proj)s::compute_psp() {
+%(psp_prefix)s
+%(psp_code)s
+}
+
+// Draws random numbers
+void ProjStruct%(id_proj)s::update_rng() {
+%(update_rng)s
+}
+
+// Updates synaptic variables
+void ProjStruct%(id_proj)s::update_synapse() {
+%(update_prefix)s
+%(update_variables)s
+}
+
+// Post-synaptic events
+void ProjStruct%(id_proj)s::post_event() {
+%(post_event_prefix)s
+%(post_event)s
+}
+"""
+
+header_struct_cuda = """#pragma once
 
 #include "pop%(id_pre)s.hpp"
 #include "pop%(id_post)s.hpp"
@@ -127,14 +246,25 @@ lil_connectivity_matrix_omp = {
     'declare': """
     // Connectivity
     std::vector<int> post_rank;
-    std::vector< std::vector< int > > pre_rank;
+    std::vector< std::vector< %(idx_type)s > > pre_rank;
 """,
     'accessor': """
     // Accessor to connectivity data
     std::vector<int> get_post_rank() { return post_rank; }
     void set_post_rank(std::vector<int> ranks) { post_rank = ranks; }
-    std::vector< std::vector<int> > get_pre_rank() { return pre_rank; }
-    void set_pre_rank(std::vector< std::vector<int> > ranks) { pre_rank = ranks; }
+    std::vector< std::vector<int> > get_pre_rank() {
+        std::vector< std::vector<int> > ranks(pre_rank.size());
+        for(int i=0; i<pre_rank.size(); i++){
+            ranks[i] = std::vector<int>(pre_rank[i].begin(), pre_rank[i].end());
+        }
+        return ranks;
+    }
+    void set_pre_rank(std::vector< std::vector<int> > ranks) {
+        pre_rank = std::vector< std::vector< %(idx_type)s > >(ranks.size());
+        for(int i=0; i<ranks.size(); i++){
+            pre_rank[i] = std::vector< %(idx_type)s >(ranks[i].begin(), ranks[i].end());
+        }
+    }
     int nb_synapses(int n) { return pre_rank[n].size(); }
 """,
     'init': """
@@ -176,31 +306,31 @@ lil_connectivity_matrix_omp = {
 lil_weight_matrix_omp = {
     'declare': """
     // LIL weights
-    std::vector< std::vector< double > > w;
+    std::vector< std::vector< %(float_prec)s > > w;
 """,
     'accessor': """
     // Local parameter w
-    std::vector<std::vector< double > > get_w() { return w; }
-    std::vector<double> get_dendrite_w(int rk) { return w[rk]; }
-    double get_synapse_w(int rk_post, int rk_pre) { return w[rk_post][rk_pre]; }
-    void set_w(std::vector<std::vector< double > >value) { w = value; }
-    void set_dendrite_w(int rk, std::vector<double> value) { w[rk] = value; }
-    void set_synapse_w(int rk_post, int rk_pre, double value) { w[rk_post][rk_pre] = value; }
+    std::vector<std::vector< %(float_prec)s > > get_w() { return w; }
+    std::vector<%(float_prec)s> get_dendrite_w(int rk) { return w[rk]; }
+    %(float_prec)s get_synapse_w(int rk_post, int rk_pre) { return w[rk_post][rk_pre]; }
+    void set_w(std::vector<std::vector< %(float_prec)s > >value) { w = value; }
+    void set_dendrite_w(int rk, std::vector<%(float_prec)s> value) { w[rk] = value; }
+    void set_synapse_w(int rk_post, int rk_pre, %(float_prec)s value) { w[rk_post][rk_pre] = value; }
 """,
     'init': """
 """,
     'pyx_struct': """
         # Local variable w
-        vector[vector[double]] get_w()
-        vector[double] get_dendrite_w(int)
-        double get_synapse_w(int, int)
-        void set_w(vector[vector[double]])
-        void set_dendrite_w(int, vector[double])
-        void set_synapse_w(int, int, double)
+        vector[vector[%(float_prec)s]] get_w()
+        vector[%(float_prec)s] get_dendrite_w(int)
+        %(float_prec)s get_synapse_w(int, int)
+        void set_w(vector[vector[%(float_prec)s]])
+        void set_dendrite_w(int, vector[%(float_prec)s])
+        void set_synapse_w(int, int, %(float_prec)s)
 """,
     'pyx_wrapper_args': "",
     'pyx_wrapper_init': """
-        proj%(id_proj)s.set_w(syn.w)
+        proj%(id_proj)s.set_w(%(syn_w)s)
 """,
     'pyx_wrapper_accessor': """
     # Local variable w
@@ -210,11 +340,11 @@ lil_weight_matrix_omp = {
         proj%(id_proj)s.set_w( value )
     def get_dendrite_w(self, int rank):
         return proj%(id_proj)s.get_dendrite_w(rank)
-    def set_dendrite_w(self, int rank, vector[double] value):
+    def set_dendrite_w(self, int rank, vector[%(float_prec)s] value):
         proj%(id_proj)s.set_dendrite_w(rank, value)
     def get_synapse_w(self, int rank_post, int rank_pre):
         return proj%(id_proj)s.get_synapse_w(rank_post, rank_pre)
-    def set_synapse_w(self, int rank_post, int rank_pre, double value):
+    def set_synapse_w(self, int rank_post, int rank_pre, %(float_prec)s value):
         proj%(id_proj)s.set_synapse_w(rank_post, rank_pre, value)
 """
 }
@@ -222,13 +352,13 @@ lil_weight_matrix_omp = {
 single_weight_matrix_omp = {
     'declare': """
     // Single weight in the projection
-    double w;
+    %(float_prec)s w;
 """,
     'accessor': "",
     'init': "",
     'pyx_struct': """
         # Local variable w
-        double w
+        %(float_prec)s w
 """,
     'pyx_wrapper_args': "",
     'pyx_wrapper_init': """
@@ -243,26 +373,272 @@ single_weight_matrix_omp = {
         proj%(id_proj)s.w = value
     def get_dendrite_w(self, int rank):
         return proj%(id_proj)s.w
-    def set_dendrite_w(self, int rank, double value):
+    def set_dendrite_w(self, int rank, %(float_prec)s value):
         proj%(id_proj)s.w = value
     def get_synapse_w(self, int rank_post, int rank_pre):
         return proj%(id_proj)s.w
-    def set_synapse_w(self, int rank_post, int rank_pre, double value):
+    def set_synapse_w(self, int rank_post, int rank_pre, %(float_prec)s value):
         proj%(id_proj)s.w = value
 """
 }
 
+######################################
+### Connectivity matrix OMP (CSR)
+######################################
+# The synapses of the dendrite i are stored contiguously in [row_ptr[i], row_ptr[i+1]).
+# The accessors exchange lists of lists with Python, like the LIL ones.
+csr_connectivity_matrix_omp = {
+    'declare': """
+    // Connectivity (CSR)
+    std::vector<int> post_rank;
+    std::vector<int> row_ptr;
+    std::vector< %(idx_type)s > col_idx;
+""",
+    'accessor': """
+    // Accessor to connectivity data
+    std::vector<int> get_post_rank() { return post_rank; }
+    void set_post_rank(std::vector<int> ranks) { post_rank = ranks; }
+    std::vector< std::vector<int> > get_pre_rank() { return csr_to_lil(std::vector<int>(col_idx.begin(), col_idx.end())); }
+    void set_pre_rank(std::vector< std::vector<int> > ranks) {
+        row_ptr = std::vector<int>(1, 0);
+        for(int i=0; i<ranks.size(); i++){
+            row_ptr.push_back(row_ptr[i] + ranks[i].size());
+        }
+        std::vector<int> idx = lil_to_csr(ranks);
+        col_idx = std::vector< %(idx_type)s >(idx.begin(), idx.end());
+    }
+    int nb_synapses(int n) { return row_ptr[n+1] - row_ptr[n]; }
+
+    // Conversion between the CSR arrays and the lists of lists used by Python
+    template<typename T>
+    std::vector< std::vector<T> > csr_to_lil(const std::vector<T> &values) {
+        std::vector< std::vector<T> > lil(row_ptr.size()-1, std::vector<T>());
+        for(int i=0; i<row_ptr.size()-1; i++){
+            lil[i] = std::vector<T>(values.begin()+row_ptr[i], values.begin()+row_ptr[i+1]);
+        }
+        return lil;
+    }
+    template<typename T>
+    std::vector<T> lil_to_csr(const std::vector< std::vector<T> > &lil) {
+        std::vector<T> values;
+        values.reserve(row_ptr.back());
+        for(int i=0; i<lil.size(); i++){
+            values.insert(values.end(), lil[i].begin(), lil[i].end());
+        }
+        return values;
+    }
+""",
+    'init': """
+""",
+    'pyx_struct': lil_connectivity_matrix_omp['pyx_struct'],
+    'pyx_wrapper_args': lil_connectivity_matrix_omp['pyx_wrapper_args'],
+    'pyx_wrapper_init': lil_connectivity_matrix_omp['pyx_wrapper_init'],
+    'pyx_wrapper_accessor': lil_connectivity_matrix_omp['pyx_wrapper_accessor']
+}
+
+csr_weight_matrix_omp = {
+    'declare': """
+    // CSR weights
+    std::vector< %(float_prec)s > w;
+""",
+    'accessor': """
+    // Local parameter w
+    std::vector<std::vector< %(float_prec)s > > get_w() { return csr_to_lil(w); }
+    std::vector<%(float_prec)s> get_dendrite_w(int rk) { return std::vector<%(float_prec)s>(w.begin()+row_ptr[rk], w.begin()+row_ptr[rk+1]); }
+    %(float_prec)s get_synapse_w(int rk_post, int rk_pre) { return w[row_ptr[rk_post]+rk_pre]; }
+    void set_w(std::vector<std::vector< %(float_prec)s > >value) { w = lil_to_csr(value); }
+    void set_dendrite_w(int rk, std::vector<%(float_prec)s> value) { std::copy(value.begin(), value.end(), w.begin()+row_ptr[rk]); }
+    void set_synapse_w(int rk_post, int rk_pre, %(float_prec)s value) { w[row_ptr[rk_post]+rk_pre] = value; }
+""",
+    'init': """
+""",
+    'pyx_struct': lil_weight_matrix_omp['pyx_struct'],
+    'pyx_wrapper_args': lil_weight_matrix_omp['pyx_wrapper_args'],
+    'pyx_wrapper_init': lil_weight_matrix_omp['pyx_wrapper_init'],
+    'pyx_wrapper_accessor': lil_weight_matrix_omp['pyx_wrapper_accessor']
+}
+
+######################################
+### Connectivity matrix OMP (SELL-C-sigma)
+######################################
+# The dendrites are sorted by decreasing number of synapses inside windows of sorting_scope
+# dendrites (sigma), and grouped into chunks of chunk_size dendrites (C). A chunk is as wide as
+# its longest dendrite and is stored column by column: the s-th synapse of the dendrite i is at
+# row_start[i] + s*chunk_size, so that the summation can be vectorized across the dendrites of a
+# chunk. Padding elements have a pre-synaptic rank and values of 0.
+sell_connectivity_matrix_omp = {
+    'declare': """
+    // Connectivity (SELL-C-sigma)
+    static const int chunk_size = 8;
+    static const int sorting_scope = 256;
+    std::vector<int> post_rank;
+    std::vector<int> row_perm;
+    std::vector<int> row_len;
+    std::vector<int> row_start;
+    std::vector<int> chunk_ptr;
+    std::vector< %(idx_type)s > col_idx;
+""",
+    'accessor': """
+    // Accessor to connectivity data
+    std::vector<int> get_post_rank() { return post_rank; }
+    void set_post_rank(std::vector<int> ranks) { post_rank = ranks; }
+    std::vector< std::vector<int> > get_pre_rank() { return sell_to_lil(std::vector<int>(col_idx.begin(), col_idx.end())); }
+    void set_pre_rank(std::vector< std::vector<int> > ranks) {
+        int nb_rows = ranks.size();
+        int nb_chunks = (nb_rows + chunk_size - 1) / chunk_size;
+        row_len = std::vector<int>(nb_rows, 0);
+        for(int i=0; i<nb_rows; i++){
+            row_len[i] = ranks[i].size();
+        }
+        // Dendrite stored in each row of the chunks (-1 for the padding rows)
+        row_perm = std::vector<int>(nb_chunks*chunk_size, -1);
+        for(int i=0; i<nb_rows; i++){
+            row_perm[i] = i;
+        }
+        for(int begin=0; begin<nb_rows; begin+=sorting_scope){
+            int end = (begin + sorting_scope < nb_rows) ? begin + sorting_scope : nb_rows;
+            std::stable_sort(row_perm.begin()+begin, row_perm.begin()+end, [this](int a, int b){ return row_len[a] > row_len[b]; });
+        }
+        // Position of the chunks and of the dendrites
+        row_start = std::vector<int>(nb_rows, 0);
+        chunk_ptr = std::vector<int>(1, 0);
+        for(int c=0; c<nb_chunks; c++){
+            int width = 0;
+            for(int r=0; r<chunk_size; r++){
+                int i = row_perm[c*chunk_size+r];
+                if(i < 0) continue;
+                row_start[i] = chunk_ptr[c] + r;
+                if(row_len[i] > width) width = row_len[i];
+            }
+            chunk_ptr.push_back(chunk_ptr[c] + width*chunk_size);
+        }
+        std::vector<int> idx = lil_to_sell(ranks);
+        col_idx = std::vector< %(idx_type)s >(idx.begin(), idx.end());
+    }
+    int nb_synapses(int n) { return row_len[n]; }
+
+    // Conversion between the SELL arrays and the lists of lists used by Python
+    template<typename T>
+    std::vector<T> get_sell_row(const std::vector<T> &values, int i) {
+        std::vector<T> row(row_len[i]);
+        for(int s=0; s<row_len[i]; s++){
+            row[s] = values[row_start[i]+s*chunk_size];
+        }
+        return row;
+    }
+    template<typename T>
+    void set_sell_row(std::vector<T> &values, int i, const std::vector<T> &row) {
+        for(int s=0; s<row.size(); s++){
+            values[row_start[i]+s*chunk_size] = row[s];
+        }
+    }
+    template<typename T>
+    std::vector< std::vector<T> > sell_to_lil(const std::vector<T> &values) {
+        std::vector< std::vector<T> > lil(row_len.size(), std::vector<T>());
+        for(int i=0; i<row_len.size(); i++){
+            lil[i] = get_sell_row(values, i);
+        }
+        return lil;
+    }
+    template<typename T>
+    std::vector<T> lil_to_sell(const std::vector< std::vector<T> > &lil) {
+        std::vector<T> values(chunk_ptr.back(), T());
+        for(int i=0; i<lil.size(); i++){
+            set_sell_row(values, i, lil[i]);
+        }
+        return values;
+    }
+""",
+    'init': """
+""",
+    'pyx_struct': lil_connectivity_matrix_omp['pyx_struct'],
+    'pyx_wrapper_args': lil_connectivity_matrix_omp['pyx_wrapper_args'],
+    'pyx_wrapper_init': lil_connectivity_matrix_omp['pyx_wrapper_init'],
+    'pyx_wrapper_accessor': lil_connectivity_matrix_omp['pyx_wrapper_accessor']
+}
+
+sell_weight_matrix_omp = {
+    'declare': """
+    // SELL weights
+    std::vector< %(float_prec)s > w;
+""",
+    'accessor': """
+    // Local parameter w
+    std::vector<std::vector< %(float_prec)s > > get_w() { return sell_to_lil(w); }
+    std::vector<%(float_prec)s> get_dendrite_w(int rk) { return get_sell_row(w, rk); }
+    %(float_prec)s get_synapse_w(int rk_post, int rk_pre) { return w[row_start[rk_post]+rk_pre*chunk_size]; }
+    void set_w(std::vector<std::vector< %(float_prec)s > >value) { w = lil_to_sell(value); }
+    void set_dendrite_w(int rk, std::vector<%(float_prec)s> value) { set_sell_row(w, rk, value); }
+    void set_synapse_w(int rk_post, int rk_pre, %(float_prec)s value) { w[row_start[rk_post]+rk_pre*chunk_size] = value; }
+""",
+    'init': """
+""",
+    'pyx_struct': lil_weight_matrix_omp['pyx_struct'],
+    'pyx_wrapper_args': lil_weight_matrix_omp['pyx_wrapper_args'],
+    'pyx_wrapper_init': lil_weight_matrix_omp['pyx_wrapper_init'],
+    'pyx_wrapper_accessor': lil_weight_matrix_omp['pyx_wrapper_accessor']
+}
 
+# The synapses receiving the spikes of the pre-synaptic neuron k are stored contiguously (CSC) in
+# [inv_pre_ptr[k], inv_pre_ptr[k+1]): inv_dendrite gives the index of their dendrite and inv_synapse
+# their index inside the dendrite.
 inverse_connectivity_matrix = {
     'declare': """
-    std::map< int, std::vector< std::pair<int, int> > > inv_pre_rank ;
+    std::vector< int > inv_pre_ptr ;
+    std::vector< int > inv_dendrite ;
+    std::vector< int > inv_synapse ;
     std::vector< int > inv_post_rank ;
 """,
     'init': """
-        inv_pre_rank =  std::map< int, std::vector< std::pair<int, int> > > ();
+        // Number of synapses per pre-synaptic neuron
+        inv_pre_ptr = std::vector< int > (pop%(id_pre)s.size + 1, 0);
+        for(int i=0; i<pre_rank.size(); i++){
+            for(int j=0; j<pre_rank[i].size(); j++){
+                inv_pre_ptr[pre_rank[i][j]+1]++;
+            }
+        }
+        for(int k=0; k<pop%(id_pre)s.size; k++){
+            inv_pre_ptr[k+1] += inv_pre_ptr[k];
+        }
+        // Indices of the synapses
+        inv_dendrite = std::vector< int > (inv_pre_ptr.back());
+        inv_synapse = std::vector< int > (inv_pre_ptr.back());
+        std::vector< int > pos = std::vector< int > (inv_pre_ptr.begin(), inv_pre_ptr.end()-1);
         for(int i=0; i<pre_rank.size(); i++){
             for(int j=0; j<pre_rank[i].size(); j++){
-                inv_pre_rank[pre_rank[i][j]].push_back(std::pair<int, int>(i,j));
+                int l = pos[pre_rank[i][j]]++;
+                inv_dendrite[l] = i;
+                inv_synapse[l] = j;
+            }
+        }
+        inv_post_rank =  std::vector< int > (pop%(id_post)s.size, -1);
+        for(int i=0; i<post_rank.size(); i++){
+            inv_post_rank[post_rank[i]] = i;
+        }
+"""
+}
+
+# inv_synapse is the index of the synapse in the CSR arrays
+csr_inverse_connectivity_matrix = {
+    'declare': inverse_connectivity_matrix['declare'],
+    'init': """
+        // Number of synapses per pre-synaptic neuron
+        inv_pre_ptr = std::vector< int > (pop%(id_pre)s.size + 1, 0);
+        for(int j=0; j<col_idx.size(); j++){
+            inv_pre_ptr[col_idx[j]+1]++;
+        }
+        for(int k=0; k<pop%(id_pre)s.size; k++){
+            inv_pre_ptr[k+1] += inv_pre_ptr[k];
+        }
+        // Indices of the synapses
+        inv_dendrite = std::vector< int > (inv_pre_ptr.back());
+        inv_synapse = std::vector< int > (inv_pre_ptr.back());
+        std::vector< int > pos = std::vector< int > (inv_pre_ptr.begin(), inv_pre_ptr.end()-1);
+        for(int i=0; i<post_rank.size(); i++){
+            for(int j=row_ptr[i]; j<row_ptr[i+1]; j++){
+                int l = pos[col_idx[j]]++;
+                inv_dendrite[l] = i;
+                inv_synapse[l] = j;
             }
         }
         inv_post_rank =  std::vector< int > (pop%(id_post)s.size, -1);
@@ -272,6 +648,40 @@ inverse_connectivity_matrix = {
 """
 }
 
+# With several threads, the spikes are propagated in parallel by splitting the post-synaptic
+# neurons: the synapses of the pre-synaptic neuron k updated by thread t lie in
+# [inv_thread_ptr[t][k], inv_thread_ptr[t+1][k]). The partition is built at the first step
+# (the number of threads is only known then) and after each change of the connectivity.
+inverse_connectivity_partition = {
+    'declare': """
+    std::vector< std::vector< int > > inv_thread_ptr ;
+""",
+    'init': """
+        inv_thread_ptr.clear();
+""",
+    'update': """
+    // Split the dendrites between the threads
+    if (inv_thread_ptr.size() != omp_get_max_threads() + 1) {
+        int nb_threads = omp_get_max_threads();
+        // Thread t updates the dendrites in [bounds[t], bounds[t+1]), with the same number of synapses
+        std::vector< int > bounds = std::vector< int >(nb_threads + 1, post_rank.size());
+        bounds[0] = 0;
+        long int nb_synapses = inv_pre_ptr.back(), cumul = 0;
+        for(int i = 0, t = 1; i < post_rank.size() && t < nb_threads; i++){
+            cumul += %(dendrite_size)s;
+            while(t < nb_threads && cumul * nb_threads >= t * nb_synapses)
+                bounds[t++] = i + 1;
+        }
+        // The synapses of each pre-synaptic neuron are sorted by dendrite
+        inv_thread_ptr = std::vector< std::vector< int > >(nb_threads + 1, std::vector< int >(pop%(id_pre)s.size));
+        for(int k = 0; k < pop%(id_pre)s.size; k++){
+            for(int t = 0; t <= nb_threads; t++){
+                inv_thread_ptr[t][k] = std::lower_bound(inv_dendrite.begin() + inv_pre_ptr[k], inv_dendrite.begin() + inv_pre_ptr[k+1], bounds[t]) - inv_dendrite.begin();
+            }
+        }%(resize_queue)s
+    }
+"""
+}
 
 ######################################
 ### Connectivity matrix CUDA
@@ -468,6 +878,108 @@ for(int i = 0; i < nb_post; i++){
 """
 }
 
+# CSR
+csr_summation_operation = {
+    'sum' : """
+%(pre_copy)s
+nb_post = post_rank.size();
+%(omp_code)s
+for(int i = 0; i < nb_post; i++) {
+    sum = 0.0;
+    for(int j = row_ptr[i]; j < row_ptr[i+1]; j++) {
+        sum += %(psp)s ;
+    }
+    pop%(id_post)s._sum_%(target)s[post_rank[i]] += sum;
+}
+""",
+    'max': """
+%(pre_copy)s
+nb_post = post_rank.size();
+%(omp_code)s
+for(int i = 0; i < nb_post; i++){
+    int j = row_ptr[i];
+    sum = %(psp)s ;
+    for(int j = row_ptr[i]+1; j < row_ptr[i+1]; j++){
+        if(%(psp)s > sum){
+            sum = %(psp)s ;
+        }
+    }
+    pop%(id_post)s._sum_%(target)s[post_rank[i]] += sum;
+}
+""",
+    'min': """
+%(pre_copy)s
+nb_post = post_rank.size();
+%(omp_code)s
+for(int i = 0; i < nb_post; i++){
+    int j = row_ptr[i];
+    sum = %(psp)s ;
+    for(int j = row_ptr[i]+1; j < row_ptr[i+1]; j++){
+        if(%(psp)s < sum){
+            sum = %(psp)s ;
+        }
+    }
+    pop%(id_post)s._sum_%(target)s[post_rank[i]] += sum;
+}
+""",
+    'mean': """
+%(pre_copy)s
+nb_post = post_rank.size();
+%(omp_code)s
+for(int i = 0; i < nb_post; i++){
+    sum = 0.0 ;
+    for(int j = row_ptr[i]; j < row_ptr[i+1]; j++){
+        sum += %(psp)s ;
+    }
+    pop%(id_post)s._sum_%(target)s[post_rank[i]] += sum / (double)(row_ptr[i+1] - row_ptr[i]);
+}
+"""
+}
+
+# SELL-C-sigma: the inner loop over the dendrites of a chunk is vectorized for the slots which are filled
+# in every row of the chunk (the rows of a chunk have similar lengths). The remaining slots are processed
+# row by row and the padding is skipped: its psp may not be finite (e.g. pre.r / w with w = 0).
+sell_summation_operation = {
+    'sum' : """
+%(pre_copy)s
+nb_post = chunk_ptr.size() - 1;
+%(omp_code)s
+for(int c = 0; c < nb_post; c++) {
+    %(acc_prec)s _sum[chunk_size];
+    int _row[chunk_size], _len[chunk_size];
+    int width = (chunk_ptr[c+1] - chunk_ptr[c]) / chunk_size;
+    int full = width;
+    for(int r = 0; r < chunk_size; r++) {
+        _sum[r] = 0.0;
+        _row[r] = row_perm[c*chunk_size+r] < 0 ? 0 : row_perm[c*chunk_size+r];
+        _len[r] = row_perm[c*chunk_size+r] < 0 ? 0 : row_len[_row[r]];
+        full = _len[r] < full ? _len[r] : full;
+    }
+    for(int s = 0; s < full; s++) {
+        #pragma omp simd
+        for(int r = 0; r < chunk_size; r++) {
+            int i = _row[r];
+            int j = chunk_ptr[c] + s*chunk_size + r;
+            _sum[r] += %(psp)s;
+        }
+    }
+    for(int s = full; s < width; s++) {
+        for(int r = 0; r < chunk_size; r++) {
+            if(s < _len[r]) {
+                int i = _row[r];
+                int j = chunk_ptr[c] + s*chunk_size + r;
+                _sum[r] += %(psp)s;
+            }
+        }
+    }
+    for(int r = 0; r < chunk_size; r++) {
+        if(row_perm[c*chunk_size+r] >= 0)
+            pop%(id_post)s._sum_%(target)s[post_rank[_row[r]]] += _sum[r];
+    }
+}
+"""
+}
+
 # Dense matrix
 dense_summation_operation = {
     'sum' : """
@@ -550,6 +1062,40 @@ if(_transmission && _update && pop%(id_post)s._active && ( (t - _update_offset)%
 """
 }
 
+csr_update_variables = {
+    'local': """
+if(_transmission && _update && pop%(id_post)s._active && ( (t - _update_offset)%%_update_period == 0L) ){
+    %(omp_code)s
+    for(int i = 0; i < post_rank.size(); i++){
+        rk_post = post_rank[i];
+    %(global)s
+        for(int j = row_ptr[i]; j < row_ptr[i+1]; j++){
+            rk_pre = col_idx[j];
+    %(local)s
+        }
+    }
+}
+""",
+    'global': lil_update_variables['global']
+}
+
+sell_update_variables = {
+    'local': """
+if(_transmission && _update && pop%(id_post)s._active && ( (t - _update_offset)%%_update_period == 0L) ){
+    %(omp_code)s
+    for(int i = 0; i < post_rank.size(); i++){
+        rk_post = post_rank[i];
+    %(global)s
+        for(int j = row_start[i]; j < row_start[i] + row_len[i]*chunk_size; j += chunk_size){
+            rk_pre = col_idx[j];
+    %(local)s
+        }
+    }
+}
+""",
+    'global': lil_update_variables['global']
+}
+
 dense_update_variables = {
     'local': """
 if(_transmission && _update && pop%(id_post)s._active && ( (t - _update_offset)%%_update_period == 0L)){
@@ -581,26 +1127,72 @@ if(_transmission && _update && pop%(id_post)s._active && ( (t - _update_offset)%
 delay = {
     'header_struct': """
     // Non-uniform delay
-    std::vector< std::vector< int > > delay ;""",
+    std::vector< std::vector< %(delay_type)s > > delay ;
+    std::vector< std::vector<int> > get_delay() {
+        std::vector< std::vector<int> > value(delay.size());
+        for(int i=0; i<delay.size(); i++){
+            value[i] = get_dendrite_delay(i);
+        }
+        return value;
+    }
+    std::vector<int> get_dendrite_delay(int rk) { return std::vector<int>(delay[rk].begin(), delay[rk].end()); }
+    void set_delay(std::vector< std::vector<int> > value) {
+        delay = std::vector< std::vector< %(delay_type)s > >(value.size());
+        for(int i=0; i<value.size(); i++){
+            delay[i] = std::vector< %(delay_type)s >(value[i].begin(), value[i].end());
+        }
+    }""",
     'pyx_struct':
 """
         # Non-uniform delay
-        vector[vector[int]] delay""",
+        vector[vector[int]] get_delay()
+        vector[int] get_dendrite_delay(int)
+        void set_delay(vector[vector[int]])""",
     'pyx_wrapper_init':
 """
-        proj%(id_proj)s.delay = syn.delay""",
+        proj%(id_proj)s.set_delay(syn.delay)""",
     'pyx_wrapper_accessor':
 """
     # Access to non-uniform delay
     def get_delay(self):
-        return proj%(id_proj)s.delay
+        return proj%(id_proj)s.get_delay()
     def get_dendrite_delay(self, idx):
-        return proj%(id_proj)s.delay[idx]
+        return proj%(id_proj)s.get_dendrite_delay(idx)
     def set_delay(self, value):
-        proj%(id_proj)s.delay = value
+        proj%(id_proj)s.set_delay(value)
 """
 }
 
+csr_delay = {
+    'header_struct': """
+    // Non-uniform delay (CSR)
+    std::vector< %(delay_type)s > delay ;
+    std::vector< std::vector<int> > get_delay() { return csr_to_lil(std::vector<int>(delay.begin(), delay.end())); }
+    std::vector<int> get_dendrite_delay(int rk) { return std::vector<int>(delay.begin()+row_ptr[rk], delay.begin()+row_ptr[rk+1]); }
+    void set_delay(std::vector< std::vector<int> > value) {
+        std::vector<int> flat = lil_to_csr(value);
+        delay = std::vector< %(delay_type)s >(flat.begin(), flat.end());
+    }""",
+    'pyx_struct': delay['pyx_struct'],
+    'pyx_wrapper_init': delay['pyx_wrapper_init'],
+    'pyx_wrapper_accessor': delay['pyx_wrapper_accessor']
+}
+
+# Spiking projections with non-uniform delays queue the incoming spikes when they are emitted:
+# _delayed_events[t][(_event_head + d) modulo max_delay] holds the synapses (as indices in the
+# inverse connectivity) updated by thread t receiving a spike in d steps.
+spike_delay_queue = {
+    'header_struct': """
+    // Spikes waiting for their non-uniform delay
+    std::vector< std::vector< std::vector<int> > > _delayed_events;
+    int _event_head;""",
+    'cpp_init': """
+    _delayed_events = std::vector< std::vector< std::vector<int> > >(1, std::vector< std::vector<int> >(%(max_delay)s, std::vector<int>()));
+    _event_head = 0;
+""",
+    'resize': """
+        _delayed_events.resize(nb_threads, std::vector< std::vector<int> >(%(max_delay)s, std::vector<int>()));"""
+}
 
 ######################################
 ### Event-driven
@@ -622,6 +1214,18 @@ event_driven = {
 """
 }
 
+# With CSR, the time of the last event is allocated by init_projection()
+csr_event_driven = {
+    'header_struct': """
+    std::vector<long> _last_event;
+""",
+    'cpp_init': """
+        _last_event = std::vector<long>(col_idx.size(), -10000);
+""",
+    'pyx_struct': "",
+    'pyx_wrapper_init': ""
+}
+
 
 ######################################
 ### Attributes
@@ -662,6 +1266,18 @@ attribute_decl = {
     std::vector< %(type)s >  %(name)s ;
     %(type)s* gpu_%(name)s;
     bool %(name)s_dirty;
+"""
+    },
+    'csr': {
+    'local':
+"""
+    // Local %(attr_type)s %(name)s
+    std::vector< %(type)s > %(name)s;
+""",
+    'global':
+"""
+    // Global %(attr_type)s %(name)s
+    std::vector< %(type)s >  %(name)s ;
 """
     }
 }
@@ -713,6 +1329,46 @@ attribute_acc = {
     %(type)s get_dendrite_%(name)s(int rk) { return %(name)s[rk]; }
     void set_%(name)s(std::vector<%(type)s> value) { %(name)s = value; }
     void set_dendrite_%(name)s(int rk, %(type)s value) { %(name)s[rk] = value; }
+"""
+    },
+    'csr': {
+    'local':
+"""
+    // Local %(attr_type)s %(name)s
+    std::vector<std::vector< %(type)s > > get_%(name)s() { return csr_to_lil(%(name)s); }
+    std::vector<%(type)s> get_dendrite_%(name)s(int rk) { return std::vector<%(type)s>(%(name)s.begin()+row_ptr[rk], %(name)s.begin()+row_ptr[rk+1]); }
+    %(type)s get_synapse_%(name)s(int rk_post, int rk_pre) { return %(name)s[row_ptr[rk_post]+rk_pre]; }
+    void set_%(name)s(std::vector<std::vector< %(type)s > >value) { %(name)s = lil_to_csr(value); }
+    void set_dendrite_%(name)s(int rk, std::vector<%(type)s> value) { std::copy(value.begin(), value.end(), %(name)s.begin()+row_ptr[rk]); }
+    void set_synapse_%(name)s(int rk_post, int rk_pre, %(type)s value) { %(name)s[row_ptr[rk_post]+rk_pre] = value; }
+""",
+    'global':
+"""
+    // Global %(attr_type)s %(name)s
+    std::vector<%(type)s> get_%(name)s() { return %(name)s; }
+    %(type)s get_dendrite_%(name)s(int rk) { return %(name)s[rk]; }
+    void set_%(name)s(std::vector<%(type)s> value) { %(name)s = value; }
+    void set_dendrite_%(name)s(int rk, %(type)s value) { %(name)s[rk] = value; }
+"""
+    },
+    'sell': {
+    'local':
+"""
+    // Local %(attr_type)s %(name)s
+    std::vector<std::vector< %(type)s > > get_%(name)s() { return sell_to_lil(%(name)s); }
+    std::vector<%(type)s> get_dendrite_%(name)s(int rk) { return get_sell_row(%(name)s, rk); }
+    %(type)s get_synapse_%(name)s(int rk_post, int rk_pre) { return %(name)s[row_start[rk_post]+rk_pre*chunk_size]; }
+    void set_%(name)s(std::vector<std::vector< %(type)s > >value) { %(name)s = lil_to_sell(value); }
+    void set_dendrite_%(name)s(int rk, std::vector<%(type)s> value) { set_sell_row(%(name)s, rk, value); }
+    void set_synapse_%(name)s(int rk_post, int rk_pre, %(type)s value) { %(name)s[row_start[rk_post]+rk_pre*chunk_size] = value; }
+""",
+    'global':
+"""
+    // Global %(attr_type)s %(name)s
+    std::vector<%(type)s> get_%(name)s() { return %(name)s; }
+    %(type)s get_dendrite_%(name)s(int rk) { return %(name)s[rk]; }
+    void set_%(name)s(std::vector<%(type)s> value) { %(name)s = value; }
+    void set_dendrite_%(name)s(int rk, %(type)s value) { %(name)s[rk] = value; }
 """
     }
 }
@@ -750,10 +1406,27 @@ attribute_cpp_init = {
         // Global %(attr_type)s %(name)s
         cudaMalloc((void**)&gpu_%(name)s, post_rank.size() * sizeof(%(type)s));
         %(name)s_dirty = true;
+"""
+    },
+    'csr':
+    {
+    'local':
+"""
+        // Local %(attr_type)s %(name)s
+        %(name)s = std::vector<%(type)s>(col_idx.size(), %(init)s);
+""",
+    'global':
+"""
+        // Global %(attr_type)s %(name)s
+        %(name)s = std::vector<%(type)s>(post_rank.size(), %(init)s);
 """
     }
 }
 
+# SELL stores the local attributes in flat arrays like CSR (padding included)
+attribute_decl['sell'] = attribute_decl['csr']
+attribute_cpp_init['sell'] = attribute_cpp_init['csr']
+
 # export of accessors for synaptic attributes towards python, whereas 'local' is used if values can vary
 # across synapses within a dendrite, consequently 'global' is used if values are common to all synapses within
 # a single dendrite.
@@ -840,6 +1513,24 @@ public:
     };
 %(struct_code)s
 };
+""",
+    'struct_omp': """
+class ProjRecorder%(id)s : public Monitor
+{
+public:
+    ProjRecorder%(id)s(std::vector<int> ranks, int period, long int offset)
+        : Monitor(ranks, period, offset)
+    {
+%(init_code)s
+    };
+    virtual void record();
+%(struct_code)s
+};
+""",
+    'body_omp': """
+void ProjRecorder%(id)s::record() {
+%(recording_code)s
+}
 """,
     'local': {
         'struct': """
@@ -855,6 +1546,11 @@ public:
         if(this->record_%(name)s && ( (t - this->offset) %% this->period == 0 )){
             this->%(name)s.push_back(proj%(id)s.%(name)s[this->ranks[0]]);
         }
+""",
+        'recording_csr': """
+        if(this->record_%(name)s && ( (t - this->offset) %% this->period == 0 )){
+            this->%(name)s.push_back(proj%(id)s.get_dendrite_%(name)s(this->ranks[0]));
+        }
 """
     },
     'global': {
@@ -931,25 +1627,12 @@ structural_plasticity = {
     long int _creating_offset;
 """,
         'spiking_addcode': """
-        // Add the corresponding pair in inv_pre_rank
-        int idx_post = 0;
-        for(int i=0; i<post_rank.size(); i++){
-            if(post_rank[i] == post){
-                idx_post = i;
-                break;
-            }
-        }
-        inv_pre_rank[pre].push_back(std::pair<int, int>(idx_post, idx));
+        // Rebuild the inverse connectivity, the indices of the following synapses have changed
+        inverse_connectivity_matrix();
 """,
         'spiking_removecode': """
-        // Remove the corresponding pair in inv_pre_rank
-        int pre = pre_rank[post][idx];
-        for(int i=0; i<inv_pre_rank[pre].size(); i++){
-            if(inv_pre_rank[pre][i].second == idx){
-                inv_pre_rank[pre].erase(inv_pre_rank[pre].begin() + i);
-                break;
-            }
-        }
+        // Rebuild the inverse connectivity, the indices of the following synapses have changed
+        inverse_connectivity_matrix();
 """
 },
     'pyx_struct': {
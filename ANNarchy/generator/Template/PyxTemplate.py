@@ -48,6 +48,20 @@ cdef extern from "ANNarchy.h":
     void setNumberThreads(int)
 
 
+# The connectors create double-precision weights, which are converted when the network uses single precision
+cdef vector[vector[float]] single_precision(vector[vector[double]] values):
+    cdef vector[vector[float]] result
+    cdef vector[float] row
+    cdef unsigned int i, j
+    result.reserve(values.size())
+    for i in range(values.size()):
+        row.clear()
+        row.reserve(values[i].size())
+        for j in range(values[i].size()):
+            row.push_back(values[i][j])
+        result.push_back(row)
+    return result
+
 # Population wrappers
 %(pop_class)s
 
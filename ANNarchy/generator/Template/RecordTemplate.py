@@ -28,6 +28,15 @@ public:
 %(record_classes)s
 """
 
+record_body_file = """#include "ANNarchy.h"
+
+/*
+ * Recording methods
+ *
+ */
+%(record_bodies)s
+"""
+
 omp_population = {
     'template': """
 class PopRecorder%(id)s : public Monitor
@@ -38,11 +47,14 @@ public:
     {
 %(init_code)s
     };
-    virtual void record() {
-%(recording_code)s
-    };
+    virtual void record();
 %(struct_code)s
 };
+""",
+    'body': """
+void PopRecorder%(id)s::record() {
+%(recording_code)s
+}
 """,
     'local': {
     'struct': """
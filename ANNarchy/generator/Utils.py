@@ -1,4 +1,7 @@
+import re
+
 from ..core.Global import config
+from ..core.PopulationView import PopulationView
 
 def sort_odes(desc, locality='local'):
     equations = []
@@ -75,7 +78,7 @@ if(%(wrap)s){
 def generate_ODE_block(odes, locality, obj, conductance_only, wrap_w):
     code = ""
 
-    # Count how many steps (midpoint has more than one step)
+    # Count how many steps (midpoint and rk4 have more than one step)
     nb_step = 0
     for param in odes:
         if isinstance(param['cpp'], list):
@@ -159,6 +162,43 @@ def generate_equation_code(id, desc, locality='local', obj='pop', conductance_on
 
     return padded_code
 
+def generate_pre_loop_code(desc, locality='local', padding=3):
+    "Code computed once before the loop over the neurons, e.g. the factors of the exponential method."
+    code = ""
+    for param in desc['variables']:
+        if not param['name'] in desc[locality]:
+            continue
+        if 'pre_loop' in param.keys() and param['pre_loop'] != "":
+            code += param['pre_loop'] + '\n'
+
+    if code == "":
+        return ""
+
+    return tabify(code.strip(), padding)
+
+def substep_code(code, dt='_substep_dt', t='_substep_t'):
+    """
+    Rewrites generated code so that it uses the step size ``dt`` and the time ``t`` (in ms) instead of
+    the global ones. If ``t`` is None, the current time is kept. The times of the last spikes are still
+    converted with the global step size.
+    """
+    lines = []
+    for line in code.split('\n'):
+        if not line.strip().startswith('//'): # the comments keep the original equations
+            if t is not None:
+                line = line.replace('double(t)*dt', t)
+            line = re.sub(r'(?<!last_spike\[i\]\)\*)(?<!double\(t\)\*)\bdt\b', dt, line)
+        lines.append(line)
+    return '\n'.join(lines)
+
+def update_condition(pop):
+    "Condition on the current step for the update of a population with an update period."
+    if isinstance(pop, PopulationView):
+        pop = pop.population
+    if pop._update_period > 1:
+        return " && (t %% %(period)s == 0L)" % {'period': pop._update_period}
+    return ""
+
 def indentLine(line, spaces=1):
     return (' ' * 4 * spaces) + line
 
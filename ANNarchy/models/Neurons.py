@@ -882,7 +882,7 @@ gbar_K     = %(gbar_K)s
 gleak      = %(gleak)s      
 cm         = %(cm)s        
 v_offset   = %(v_offset)s 
-e_rev_Na   = %(e_rev_Na )s 
+e_rev_Na   = %(e_rev_Na)s 
 e_rev_K    = %(e_rev_K)s   
 e_rev_leak = %(e_rev_leak)s   
 e_rev_E    = %(e_rev_E)s    
@@ -22,10 +22,8 @@
 
 """
 from ANNarchy.core.Global import _warning, _error
-from ANNarchy.parser.Equation import Equation
-
-from sympy import *
-from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor, auto_number
+from ANNarchy.parser.Equation import Equation, frozen_parameters
+from ANNarchy.parser.Memoization import memo_key, memo_load, memo_store
 
 import re, pprint
 
@@ -48,11 +46,16 @@ class CoupledEquations(object):
         self.local_variables = self.description['local']
         self.global_variables = self.description['global']
 
-        self.local_dict = Equation('tmp', '',
+        # The sympy symbols are only created if the system has to be solved
+        self.equation = Equation('tmp', '',
                                       self.description, 
                                       method = 'implicit',
                                       untouched = self.untouched
-                                      ).local_dict
+                                      )
+
+    @property
+    def local_dict(self):
+        return self.equation.local_dict
 
 
     def process_variables(self):
@@ -67,13 +70,31 @@ class CoupledEquations(object):
         else:
             method = methods[0]
 
+        # The generated code is memoized on disk
+        key = memo_key('coupled', method, self.expression_list, 
+                       sorted(self.description['attributes']), sorted(self.local_variables), sorted(self.global_variables),
+                       self.untouched, frozen_parameters(self.description))
+        result = memo_load(key)
+        if result is not None:
+            for variable in self.variables:
+                variable['cpp'] = result[variable['name']]['cpp']
+                variable['switch'] = result[variable['name']]['switch']
+            return self.variables
+
         if method == 'implicit' or method == 'semiimplicit':
-            return self.solve_implicit(self.expression_list)
+            variables = self.solve_implicit(self.expression_list)
         elif method == 'midpoint': 
-            return self.solve_midpoint(self.expression_list)
+            variables = self.solve_midpoint(self.expression_list)
+        elif method == 'rk4':
+            variables = self.solve_rk4(self.expression_list)
+
+        memo_store(key, dict([(var['name'], {'cpp': var['cpp'], 'switch': var['switch']}) for var in variables]))
+        return variables
 
 
     def solve_implicit(self, expression_list):
+        from sympy import Symbol, collect, solve, ccode
+        from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor
 
         equations = {}
         new_vars = {}
@@ -139,6 +160,8 @@ class CoupledEquations(object):
 
 
     def solve_midpoint(self, expression_list):
+        from sympy import Symbol, solve, ccode
+        from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor
 
         expression_list = {}
         equations = {}
@@ -243,4 +266,71 @@ class CoupledEquations(object):
         switch = self.c_code(variable_name) + ' += dt*_' + self.name + ' ;'
 
         # Return result
-        return [explicit_code, switch]
\ No newline at end of file
+        return [explicit_code, switch]
+
+
+    def solve_rk4(self, expression_list):
+        from sympy import Symbol, solve, ccode
+        from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor
+
+        expression_list = {}
+
+        # Pre-processing to replace the gradient
+        for name, expression in self.expression_list.items():
+            # transform the expression to suppress =
+            if '=' in expression:
+                expression = expression.replace('=', '- (')
+                expression += ')'
+            # Suppress spaces to extract dvar/dt
+            expression = expression.replace(' ', '')
+            # Transform the gradient into a difference TODO: more robust...
+            expression = expression.replace('d'+name+'/dt', '_gradient_'+name)
+            self.local_dict['_gradient_'+name] = Symbol('_gradient_'+name)
+            expression_list[name] = expression
+
+        # The gradients are evaluated at the beginning of the step, twice at the middle and at the end,
+        # each stage using the previous one for all the variables.
+        time = ccode(self.local_dict['t'])
+        stages = [('', ''), ('_k1_', '0.5*dt'), ('_k2_', '0.5*dt'), ('_k3_', 'dt')]
+        ks = dict([(name, []) for name in expression_list.keys()])
+        for idx, (previous, step) in enumerate(stages):
+            tmp_dict = {}
+            for name, val in self.local_dict.items():
+                tmp_dict[name] = val
+            if previous:
+                for name in expression_list.keys():
+                    tmp_dict[name] = Symbol('(' + ccode(self.local_dict[name]) + ' + ' + step + '*' + previous + name + ')')
+                tmp_dict['t'] = Symbol('(' + time + ' + ' + step + ')')
+
+            for name, expression in expression_list.items():
+                tmp_analysed = parse_expr(expression,
+                    local_dict = tmp_dict,
+                    transformations = (standard_transformations + (convert_xor,))
+                )
+                solved = solve(tmp_analysed, self.local_dict['_gradient_'+name])
+                ks[name].append('double _k' + str(idx+1) + '_' + name + ' = ' + ccode(solved[0]) + ';')
+
+        # Weighted sum of the stages and switches
+        news = {}
+        switches = {}
+        for name in expression_list.keys():
+            news[name] = 'double _%(name)s = (_k1_%(name)s + 2.0*_k2_%(name)s + 2.0*_k3_%(name)s + _k4_%(name)s)/6.0;' % {'name': name}
+            switches[name] = ccode(self.local_dict[name]) + ' += dt * _' + name + ' ;'
+
+        # Store the generated code in the variables
+        for name in self.names:
+            steps = ks[name] + [news[name]]
+            switch = switches[name]
+
+            # Replace untouched variables with their original name
+            for prev, new in self.untouched.items():
+                steps = [re.sub(prev, new, step) for step in steps]
+                switch = re.sub(prev, new, switch)
+
+            # Store the result
+            for variable in self.variables:
+                if variable['name'] == name:
+                    variable['cpp'] = steps
+                    variable['switch'] = switch
+
+        return self.variables
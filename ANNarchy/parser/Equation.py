@@ -21,19 +21,20 @@
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """
-from ANNarchy.core.Global import _warning, _error, _print
+from ANNarchy.core.Global import _warning, _error, _print, config
+from ANNarchy.parser.Memoization import memo_key, memo_load, memo_store
 
-from sympy import *
-from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor, auto_number
 import re
 
+# SymPy is only imported when an equation is not found in the cache.
+
 class Equation(object):
     '''
     Class to analyse one equation.
     '''
     def __init__(self, name, expression, description, 
                  untouched = [], 
-                 method='explicit', type=None):
+                 method='explicit', type=None, hoist=False):
         '''
         Parameters:
         
@@ -45,6 +46,7 @@ class Equation(object):
         * method: the numerical method to use for ODEs
         * type: forces the analyser to consider the equation as: simple, cond, ODE, inc
         * untouched: list of terms which should not be modified
+        * hoist: the loop-invariant subexpressions can be computed before the loop over the neurons/synapses (see pre_loop())
         '''
         # Store attributes
         self.name = name
@@ -56,15 +58,31 @@ class Equation(object):
         self.variables = [var['name'] for var in self.description['variables']]
         self.untouched = untouched
         self.method = method
+        self.hoist = hoist
         
         # Determine the type of the equation
         if not type:
             self.type = self.identify_type()
         else:
             self.type = type
-        
-        # Build the default dictionary of built-in symbols or functions
-        self.local_dict = {
+
+        # Dictionary of sympy symbols, built when needed
+        self._local_dict = None
+
+        # Declarations of the loop-invariant temporaries
+        self._pre_loop = []
+
+    @property
+    def local_dict(self):
+        " Default dictionary of built-in symbols or functions, extended with the attributes."
+        if self._local_dict is None:
+            self._local_dict = self._build_local_dict()
+        return self._local_dict
+
+    def _build_local_dict(self):
+        from sympy import Symbol, Function, Integer, Float
+
+        local_dict = {
             'dt' : Symbol('dt'),
             't' : Symbol('double(t)*dt'),
             'w' : Symbol('w%(local_index)s'), 
@@ -83,15 +101,43 @@ class Equation(object):
 
         for var in self.attributes: # Add each variable of the neuron
             if var in self.local_attributes:
-                self.local_dict[var] = Symbol(var + '%(local_index)s')
+                local_dict[var] = Symbol(var + '%(local_index)s')
             elif var in self.global_attributes:
-                self.local_dict[var] = Symbol(var + '%(global_index)s')
+                local_dict[var] = Symbol(var + '%(global_index)s')
                 
         for var in self.untouched: # Add each untouched variable
-            self.local_dict[var] = Symbol(var)
-            
-        
+            local_dict[var] = Symbol(var)
+
+        for name, value in frozen_parameters(self.description): # Frozen parameters are replaced by their value
+            if isinstance(value, bool):
+                local_dict[name] = Symbol('true' if value else 'false')
+            elif float(value).is_integer():
+                local_dict[name] = Integer(int(value))
+            else:
+                local_dict[name] = Float(value)
+
+        return local_dict
+
     def parse(self):
+        """
+        Returns the C++ code of the equation. The result (and the dependencies)
+        is memoized on disk, so that SymPy is only called for new equations.
+        """
+        key = memo_key(self.name, self.expression, self.type, self.method,
+                       sorted(self.attributes), sorted(self.local_attributes), sorted(self.global_attributes),
+                       self.variables, sorted(self.untouched), frozen_parameters(self.description),
+                       self.description['object'], config['paradigm'], self.hoist)
+        result = memo_load(key)
+        if result is None:
+            code = self._parse()
+            result = {'code': code, 'dependencies': self._dependencies(), 'pre_loop': self._pre_loop}
+            memo_store(key, result)
+            result = memo_load(key) # independent copy of the stored code
+        self._deps = result['dependencies']
+        self._pre_loop = result['pre_loop']
+        return result['code']
+
+    def _parse(self):
         if self.type == 'ODE':
             code = self.analyse_ODE(self.expression)
         elif self.type == 'cond':
@@ -136,14 +182,17 @@ class Equation(object):
     
     def c_code(self, equation):
         "Returns the C version of a Sympy expression"
+        from sympy import ccode
         return ccode(equation, precision=8)#, user_functions=custom_functions)
 
     def latex_code(self, equation):
         "Returns the LaTeX version of a Sympy expression"
+        from sympy import latex
         return latex(equation)
     
     def parse_expression(self, expression, local_dict):
         " Parses a string with respect to the vocabulary defined in local_dict."
+        from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor
         
         try:
             res =  parse_expr(transform_condition(expression),
@@ -177,11 +226,14 @@ class Equation(object):
             return self.exponential(expression)
         elif self.method == 'midpoint':
             return self.midpoint(expression)
+        elif self.method == 'rk4':
+            return self.rk4(expression)
         elif self.method == 'event-driven':
             return self.eventdriven(expression)
         
     def explicit(self, expression):
         " Explicit or backward Euler numerical method"
+        from sympy import Symbol, simplify, collect, solve
 
         expression = expression.replace('d'+self.name+'/dt', '(_'+self.name+'-'+self.name+')/dt')
         new_var = Symbol('_'+self.name)
@@ -196,6 +248,7 @@ class Equation(object):
         variable_name = self.local_dict[self.name]
 
         equation = simplify(collect( solve(analysed, new_var)[0] - variable_name, self.local_dict['dt']), ratio=1.0)
+        equation = self.loop_invariant(equation)
 
         explicit_code = 'double _' + self.name + ' = ' + self.c_code(equation) + ';'
 
@@ -206,6 +259,7 @@ class Equation(object):
     
     def midpoint(self, expression):
         "Midpoint method."
+        from sympy import Symbol, simplify, collect, solve
 
         expression = expression.replace('d'+self.name+'/dt', '_grad_var_')
         new_var = Symbol('_grad_var_')
@@ -238,8 +292,46 @@ class Equation(object):
         # Return result
         return [explicit_code, switch]
     
+    def rk4(self, expression):
+        "Runge-Kutta method of order 4."
+        from sympy import Symbol, solve
+
+        expression = expression.replace('d'+self.name+'/dt', '_grad_var_')
+        new_var = Symbol('_grad_var_')
+        self.local_dict['_grad_var_'] = new_var
+
+        self.analysed = self.parse_expression(expression,
+            local_dict = self.local_dict
+        )
+
+        variable_name = self.c_code(self.local_dict[self.name])
+        time = self.c_code(self.local_dict['t'])
+
+        # The gradient is evaluated at the beginning of the step, twice at the middle and at the end
+        stages = [('', ''), ('_k1_', '0.5*dt'), ('_k2_', '0.5*dt'), ('_k3_', 'dt')]
+        code = []
+        for idx, (previous, step) in enumerate(stages):
+            tmp_dict = dict(self.local_dict)
+            if previous:
+                tmp_dict[self.name] = Symbol('(' + variable_name + ' + ' + step + '*' + previous + self.name + ')')
+                tmp_dict['t'] = Symbol('(' + time + ' + ' + step + ')')
+            tmp_analysed = self.parse_expression(expression,
+                local_dict = tmp_dict
+            )
+            gradient = self.loop_invariant(solve(tmp_analysed, new_var)[0])
+            code.append('double _k' + str(idx+1) + '_' + self.name + ' = ' + self.c_code(gradient) + ';')
+
+        code.append('double _%(name)s = (_k1_%(name)s + 2.0*_k2_%(name)s + 2.0*_k3_%(name)s + _k4_%(name)s)/6.0;' % {'name': self.name})
+
+        switch = variable_name + ' += dt*_' + self.name + ' ;'
+
+        # Return result
+        return ['\n    '.join(code), switch]
+
     def implicit(self, expression):
         "Full implicit method, linearising for example (V - E)^2, but this is not desired."
+        from sympy import Symbol, simplify, collect, solve
+        from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor
 
         # Transform the gradient into a difference TODO: more robust...
         new_expression = expression.replace('d'+self.name, '_t_gradient_')
@@ -281,6 +373,7 @@ class Equation(object):
     
     def semiimplicit(self, expression):
         " Implicit or forward Euler numerical method, but only for the linear part of the equation."
+        from sympy import together, S
         # Standardize the equation
         real_tau, stepsize, steadystate = self.standardize_ODE(expression)
 
@@ -293,8 +386,8 @@ class Equation(object):
         variable_name = self.c_code(self.local_dict[self.name])
 
         explicit_code = 'double _' + self.name + ' = ('\
-                        +  self.c_code(instepsize) + ')*(' \
-                        + self.c_code(steadystate)+ ' - ' + variable_name +');'
+                        +  self.c_code(self.loop_invariant(instepsize)) + ')*(' \
+                        + self.c_code(self.loop_invariant(steadystate))+ ' - ' + variable_name +');'
         switch = variable_name + ' += _' + self.name + ' ;'
 
         # Return result
@@ -302,6 +395,11 @@ class Equation(object):
     
     
     def exponential(self, expression):
+        """
+        Exponential Euler method. When the time constant is the same for all neurons (resp. synapses of a dendrite),
+        the exponential factor is computed once before the loop and input-free decays (tau * dv/dt = -v) are reduced
+        to a multiplication.
+        """
         # Standardize the equation
         real_tau, stepsize, steadystate = self.standardize_ODE(expression)
         if real_tau == None: # the equation can not be standardized
@@ -310,9 +408,19 @@ class Equation(object):
         # Obtain C code
         variable_name = self.c_code(self.local_dict[self.name])
 
-        explicit_code = 'double _' + self.name + ' =  (1.0 - exp('\
-                        + self.c_code(-stepsize) + '))*(' \
-                        + self.c_code(steadystate)+ ' - ' + self.c_code(self.local_dict[self.name]) +');'
+        if self._hoisting() and self._is_invariant(stepsize):
+            if self.c_code(steadystate) == '0': # input-free decay
+                self._pre_loop.append('const double _decay_' + self.name + ' = exp(' + self.c_code(-stepsize) + ');')
+                explicit_code = 'double _' + self.name + ' = _decay_' + self.name + '*' + variable_name + ';'
+                switch = variable_name + ' = _' + self.name + ' ;'
+                return [explicit_code, switch]
+            self._pre_loop.append('const double _step_' + self.name + ' = 1.0 - exp(' + self.c_code(-stepsize) + ');')
+            step = '_step_' + self.name
+        else:
+            step = '(1.0 - exp(' + self.c_code(self.loop_invariant(-stepsize)) + '))'
+
+        explicit_code = 'double _' + self.name + ' = ' + step + '*(' \
+                        + self.c_code(self.loop_invariant(steadystate))+ ' - ' + variable_name +');'
         switch = variable_name + ' += _' + self.name + ' ;'
 
         # Return result
@@ -358,6 +466,7 @@ class Equation(object):
     
             * steadystate: the right term of the equation after standardization
         """
+        from sympy import Symbol, collect, expand, together, S
         # Replace the gradient with a temporary variable
         expression = expression.replace('d' + self.name +'/dt', '_gradvar_') # TODO: robust to spaces
     
@@ -464,7 +573,8 @@ class Equation(object):
         self.analysed = analysed
     
         # Obtain C code
-        code = self.c_code(self.local_dict[self.name]) + ope + self.c_code(simplify(analysed, ratio=1.0)) +';'
+        from sympy import simplify
+        code = self.c_code(self.local_dict[self.name]) + ope + self.c_code(self.loop_invariant(simplify(analysed, ratio=1.0))) +';'
     
         # Return result
         return code
@@ -482,7 +592,7 @@ class Equation(object):
         self.analysed = analysed
     
         # Obtain C code
-        code = self.c_code(self.local_dict[self.name]) + ' = ' + self.c_code(analysed) +';'
+        code = self.c_code(self.local_dict[self.name]) + ' = ' + self.c_code(self.loop_invariant(analysed)) +';'
     
         # Return result
         return code
@@ -503,13 +613,72 @@ class Equation(object):
         return code
 
     def dependencies(self):
+        " Attributes the equation depends on (available after parse())."
+        return self._deps
+
+    def pre_loop(self):
+        " Declarations of the loop-invariant temporaries used by the code (available after parse())."
+        return '\n'.join(self._pre_loop)
+
+    def _hoisting(self):
+        " Loop-invariant code motion is only performed for the local variables of the OpenMP update loops."
+        return self.hoist and config['paradigm'] == 'openmp' and self.name in self.local_attributes
+
+    def _is_invariant(self, expression):
+        " True if the expression only depends on dt, t and global attributes."
+        invariant_symbols = [self.local_dict['dt'], self.local_dict['t']] + [self.local_dict[var] for var in self.global_attributes]
+        return all(symbol in invariant_symbols for symbol in expression.free_symbols)
+
+    def loop_invariant(self, expression):
+        """
+        Replaces the subexpressions which are the same for all neurons (resp. synapses of a dendrite) by temporaries
+        computed once before the loop. Single symbols or products of a number and a symbol are left in place.
+        """
+        from sympy import Symbol
+        if not self._hoisting():
+            return expression
+
+        temporaries = {}
+        def trivial(expr):
+            return expr.is_Atom or (expr.is_Mul and len(expr.args) == 2 and expr.args[0].is_Number and expr.args[1].is_Atom)
+
+        def hoist(expr):
+            code = self.c_code(expr)
+            if not code in temporaries.keys():
+                temporaries[code] = '_hoisted_' + self.name + '_' + str(len(self._pre_loop))
+                self._pre_loop.append('const double ' + temporaries[code] + ' = ' + code + ';')
+            return Symbol(temporaries[code])
+
+        def replace(expr):
+            if expr.is_Atom:
+                return expr
+            if self._is_invariant(expr):
+                return expr if trivial(expr) else hoist(expr)
+            if expr.is_Add or expr.is_Mul: # group the invariant terms or factors
+                invariant = [arg for arg in expr.args if self._is_invariant(arg)]
+                variant = [replace(arg) for arg in expr.args if not self._is_invariant(arg)]
+                if len(invariant) > 0 and not trivial(expr.func(*invariant)):
+                    invariant = [hoist(expr.func(*invariant))]
+                return expr.func(*(invariant + variant))
+            return expr.func(*[replace(arg) for arg in expr.args])
+
+        return replace(expression)
+
+    def _dependencies(self):
         deps = []
+        frozen = [name for name, value in frozen_parameters(self.description)]
         for att in self.attributes:
+            if att in frozen:
+                continue
             if self.local_dict[att] in self.analysed.atoms():
                 deps.append(att)
         return deps
         
         
+def frozen_parameters(description):
+    " Names and values of the parameters declared with the frozen flag, which are inlined in the generated code."
+    return [(param['name'], param['init']) for param in description['parameters'] if 'frozen' in param['flags']]
+
 def transform_condition(expr):
     expr = expr.replace (' and ', ' & ')
     expr = expr.replace (' or ', ' | ')
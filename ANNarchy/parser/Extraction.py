@@ -220,6 +220,11 @@ def extract_parameters(description, extra_values={}):
                 break
         else:
             locality = 'local' 
+
+        # Frozen parameters are inlined in the generated code
+        if 'frozen' in flags and not isinstance(init, (bool, int, float)):
+            _error('The frozen parameter ' + name + ' must be initialized with a number.')
+            exit(0)
             
         # Store the result
         desc = {'name': name,
@@ -580,6 +585,8 @@ def find_method(variable):
         method = 'exponential'
     elif 'midpoint' in variable['flags']:
         method = 'midpoint'
+    elif 'rk4' in variable['flags']:
+        method = 'rk4'
     elif 'explicit' in variable['flags']:
         method = 'explicit'
     elif 'exact' in variable['flags']:
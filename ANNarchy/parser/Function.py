@@ -24,9 +24,7 @@
 from ANNarchy.core.Global import _warning
 from ANNarchy.parser.Equation import transform_condition
 
-from sympy import *
-from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor, auto_number
-
+import re
 
 # Predefined symbols which must not be declared by the user, but used in the equations
 _predefined = ['weight', 'w']
@@ -36,6 +34,7 @@ class FunctionParser(object):
     Class to analyse one equation.
     '''
     def __init__(self, eq, args):
+        from sympy import Symbol, Function
         self.args = args
         self.eq = eq
         self.local_dict = {
@@ -74,6 +73,8 @@ class FunctionParser(object):
                 terms = expression.split('!=')
                 expression = 'Not(Equality(' + terms[0] + ', ' + terms[1] + '))'
 
+        from sympy import ccode
+        from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor
         eq = parse_expr(expression,
             local_dict = self.local_dict,
             transformations = (standard_transformations + (convert_xor,))
@@ -0,0 +1,84 @@
+"""
+
+    Memoization.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016  Julien Vitay <julien.vitay@gmail.com>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+from ANNarchy.core.Global import config, _debug
+
+import os, re, json, hashlib
+
+# Results already loaded or computed during this session (key -> json string)
+_memo = {}
+
+def memo_key(*elements):
+    """
+    Returns a hash of the given elements (strings, lists or dictionaries), which
+    must fully determine the result of the analysis. Whitespaces in strings are
+    normalized, and the ANNarchy release is always part of the key.
+    """
+    from ANNarchy import __release__
+    def normalize(element):
+        if isinstance(element, str):
+            return re.sub(r'\s+', ' ', element)
+        if isinstance(element, dict):
+            return [[normalize(k), normalize(v)] for k, v in sorted(element.items())]
+        if isinstance(element, (list, tuple)):
+            return [normalize(e) for e in element]
+        return element
+    description = json.dumps([__release__] + [normalize(e) for e in elements])
+    return hashlib.sha1(description.encode('utf-8')).hexdigest()
+
+def _memo_file(key):
+    return config['cache_dir'] + '/equations/' + key + '.json'
+
+def memo_load(key):
+    """
+    Returns the result stored for the key (a new copy each time), or None if the
+    analysis has to be performed.
+    """
+    if not key in _memo.keys():
+        if not config['cache_dir'] or not os.path.isfile(_memo_file(key)):
+            return None
+        try:
+            with open(_memo_file(key), 'r') as rfile:
+                _memo[key] = rfile.read()
+        except Exception as e:
+            _debug('Could not read the equation cache:', e)
+            return None
+    return json.loads(_memo[key])
+
+def memo_store(key, value):
+    """
+    Stores the result of an analysis (only strings, lists and dictionaries).
+    """
+    _memo[key] = json.dumps(value)
+    if not config['cache_dir']:
+        return
+    try:
+        if not os.path.exists(config['cache_dir'] + '/equations'):
+            os.makedirs(config['cache_dir'] + '/equations')
+        # Write then rename, so that concurrent processes never read a partial file
+        tmp_file = _memo_file(key) + '.' + str(os.getpid())
+        with open(tmp_file, 'w') as wfile:
+            wfile.write(_memo[key])
+        os.rename(tmp_file, _memo_file(key))
+    except Exception as e:
+        _debug('Could not store the equation in the cache:', e)
@@ -3,8 +3,6 @@ from ANNarchy.core.Random import RandomDistribution
 from .Extraction import *
 from ANNarchy.core.Synapse import Synapse
 
-from sympy import *
-from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor, auto_number
 import re
 import numpy as np
 
@@ -495,6 +493,7 @@ target_replacements = [
 ]
 
 def _process_neuron_equations(neuron):
+    from sympy import Symbol, Function
     code = ""
 
     # Extract parameters and variables
@@ -580,6 +579,7 @@ def _process_neuron_equations(neuron):
 
 
 def _process_synapse_equations(synapse):
+    from sympy import Symbol, Function
     psp = ""
     code = ""
     pre_event = ""
@@ -738,6 +738,8 @@ def _analyse_equation(orig, eq, local_dict, tex_dict):
 
 # Analyses and transform to latex a single part of an equation
 def _analyse_part(expr, local_dict, tex_dict):
+    from sympy import latex
+    from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor
 
     def regular_expr(expr):
         analysed = parse_expr(expr,
@@ -21,7 +21,7 @@
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """
-from ANNarchy.core.Global import _error, _warning, config
+from ANNarchy.core.Global import _error, _warning, _float_type, config
 from .Extraction import *
 from .CoupledEquations import CoupledEquations
 
@@ -166,10 +166,12 @@ def analyse_neuron(neuron):
                                     eq,
                                     description,
                                     method = method,
-                                    untouched = untouched
+                                    untouched = untouched,
+                                    hoist = True
                             )
             code = translator.parse()
             dependencies = translator.dependencies()
+            pre_loop = translator.pre_loop()
         else: # An if-then-else statement
             code = translate_ITE(
                         variable['name'],
@@ -178,6 +180,7 @@ def analyse_neuron(neuron):
                         description,
                         untouched )
             dependencies = []
+            pre_loop = ""
 
 
         if isinstance(code, str):
@@ -206,12 +209,13 @@ def analyse_neuron(neuron):
         # Store the result
         variable['cpp'] = cpp_eq # the C++ equation
         variable['switch'] = switch # switch value of ODE
+        variable['pre_loop'] = pre_loop # loop-invariant temporaries, computed before the loop
         variable['untouched'] = untouched # may be needed later
         variable['method'] = method # may be needed later
         variable['dependencies'] = dependencies # may be needed later
 
-        # If the method is implicit or midpoint, the equations must be solved concurrently (depend on v[t+1])
-        if method in ['implicit', 'midpoint']:
+        # If the method is implicit, midpoint or rk4, the equations must be solved concurrently (depend on v[t+1])
+        if method in ['implicit', 'midpoint', 'rk4']:
             concurrent_odes.append(variable)
 
     # After all variables are processed, do it again if they are concurrent
@@ -223,6 +227,9 @@ def analyse_neuron(neuron):
                 if variable['name'] == new_eq['name']:
                     description['variables'][idx] = new_eq
 
+    # Local attributes are stored with the required precision
+    _set_precision(description)
+
     return description
 
 def analyse_synapse(synapse):
@@ -395,14 +402,17 @@ def analyse_synapse(synapse):
             translator = Equation(variable['name'], eq,
                                   description,
                                   method = method,
-                                  untouched = untouched.keys())
+                                  untouched = untouched.keys(),
+                                  hoist = True)
             code = translator.parse()
             dependencies = translator.dependencies()
+            pre_loop = translator.pre_loop()
 
         else: # An if-then-else statement
             code = translate_ITE(variable['name'], eq, condition, description,
                     untouched)
             dependencies = []
+            pre_loop = ""
 
         if isinstance(code, str):
             cpp_eq = code
@@ -422,12 +432,13 @@ def analyse_synapse(synapse):
         # Store the result
         variable['cpp'] = cpp_eq # the C++ equation
         variable['switch'] = switch # switch value id ODE
+        variable['pre_loop'] = pre_loop # loop-invariant temporaries, computed before the loop
         variable['untouched'] = untouched # may be needed later
         variable['method'] = method # may be needed later
         variable['dependencies'] = dependencies # may be needed later
 
-        # If the method is implicit or midpoint, the equations must be solved concurrently (depend on v[t+1])
-        if method in ['implicit', 'midpoint']:
+        # If the method is implicit, midpoint or rk4, the equations must be solved concurrently (depend on v[t+1])
+        if method in ['implicit', 'midpoint', 'rk4']:
             concurrent_odes.append(variable)
 
     # After all variables are processed, do it again if they are concurrent
@@ -524,4 +535,14 @@ def analyse_synapse(synapse):
     if synapse.creating:
         description['creating'] = extract_structural_plasticity(synapse.creating, description)
 
+    # Local attributes (including the weights) are stored with the required precision
+    _set_precision(description)
+
     return description
+
+def _set_precision(description):
+    """ Sets the C++ type of the local floating-point attributes according to setup(precision=...).
+    Global attributes and the temporary variables of the equations stay in double precision."""
+    for var in description['parameters'] + description['variables']:
+        if var['ctype'] == 'double' and var['name'] in description['local']:
+            var['ctype'] = _float_type()
@@ -0,0 +1,41 @@
+"""
+Measures the time needed by ``from ANNarchy import *`` and checks which heavy
+dependencies are loaded at that point. SymPy, scipy and the code generation
+stack should only be imported once a network is analysed or compiled.
+
+Usage:
+
+    python import_time.py [number_of_trials]
+
+Each trial runs in a fresh interpreter. For a detailed breakdown per module, use:
+
+    python -X importtime -c "import ANNarchy" 2> importtime.log
+"""
+from __future__ import print_function
+import subprocess, sys
+
+heavy_modules = ['sympy', 'scipy', 'distutils', 'pkg_resources', 'optparse']
+
+code = """
+import sys, time
+tstart = time.time()
+from ANNarchy import *
+duration = time.time() - tstart
+loaded = [m for m in %(modules)s if m in sys.modules]
+print(str(duration) + ';' + ','.join(loaded))
+""" % {'modules': heavy_modules}
+
+trials = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+durations = []
+for trial in range(trials):
+    output = subprocess.check_output([sys.executable, '-c', code]).decode('utf-8')
+    # The last line of the output contains the measurement, the first one the ANNarchy banner
+    duration, loaded = output.strip().split('\n')[-1].split(';')
+    durations.append(float(duration))
+
+print('Import time: min', '%.3f' % min(durations), 's, mean', '%.3f' % (sum(durations)/len(durations)), 's over', trials, 'trials')
+if loaded:
+    print('Heavy modules loaded at import:', loaded)
+else:
+    print('No heavy module loaded at import.')
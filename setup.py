@@ -64,8 +64,11 @@ import ANNarchy
 
 package_data = ['core/cython_ext/*.pxd','generator/CudaCheck/cuda_check.so']
 
+# The connectors use OpenMP (not available with the default compiler on MacOSX)
+omp_flags = ['-fopenmp'] if sys.platform.startswith('linux') else []
+
 extensions = [
-    Extension("ANNarchy.core.cython_ext.Connector", ["ANNarchy/core/cython_ext/Connector.pyx"], include_dirs=[np.get_include()]),
+    Extension("ANNarchy.core.cython_ext.Connector", ["ANNarchy/core/cython_ext/Connector.pyx"], include_dirs=[np.get_include()], extra_compile_args=omp_flags, extra_link_args=omp_flags),
     Extension("ANNarchy.core.cython_ext.Coordinates", ["ANNarchy/core/cython_ext/Coordinates.pyx"], include_dirs=[np.get_include()]),
     Extension("ANNarchy.core.cython_ext.Transformations", ["ANNarchy/core/cython_ext/Transformations.pyx"], include_dirs=[np.get_include()]),
 ]
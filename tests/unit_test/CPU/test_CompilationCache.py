@@ -0,0 +1,136 @@
+"""
+
+    test_CompilationCache.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+import filecmp
+import os
+import shutil
+import subprocess
+import sys
+
+from ANNarchy import *
+
+# Empty cache and compilation directories, so that the first compilation stores the library
+cache_dir = os.path.abspath('annarchy_cache')
+for directory in [cache_dir, 'annarchy_cache_net0', 'annarchy_cache_net1']:
+    shutil.rmtree(directory, ignore_errors=True)
+setup(cache_dir=cache_dir)
+
+neuron = Neuron(
+    parameters = "tau = 10.0 : population, frozen",
+    equations = "tau * dr/dt + r = sum(exc) + 1.0"
+)
+
+pop1 = Population(10, neuron)
+pop2 = Population(10, neuron)
+proj = Projection(pop1, pop2, 'exc')
+proj.connect_all_to_all(weights = 0.1)
+
+compile(directory = 'annarchy_cache_net0')
+
+# Script printing the cache key of the same network for the given options,
+# after the code generation (nothing is compiled)
+key_script = """
+import os
+from ANNarchy import *
+from ANNarchy.generator.Compiler import Compiler, _folder_management, _native_targets
+setup(precision='%(precision)s')
+
+neuron = Neuron(
+    parameters = "tau = %(tau)s : population, frozen",
+    equations = "tau * dr/dt + r = sum(exc) + 1.0"
+)
+
+pop1 = Population(10, neuron)
+pop2 = Population(10, neuron)
+proj = Projection(pop1, pop2, 'exc')
+proj.connect_all_to_all(weights = 0.1)
+
+if '%(target)s':
+    _native_targets['g++'] = '%(target)s'
+
+annarchy_dir = os.getcwd() + '/%(directory)s'
+_folder_management(annarchy_dir, False, True, 0)
+compiler = Compiler(annarchy_dir, True, 'g++', '-march=native -O2', True, {}, False, False, populations(), projections(), 0)
+compiler.check_structure()
+compiler.code_generation()
+compiler.generate_makefile()
+print(compiler.cache_key())
+"""
+
+class test_CompilationCache(unittest.TestCase):
+    """
+    This class tests the cache of compiled networks:
+
+        * the key only depends on what determines the content of the library
+        * an identical network compiled in another directory or with another id reuses the cached library
+    """
+    def _key(self, directory='annarchy_key', tau=10.0, precision='double', target=''):
+        """
+        Cache key of the network of key_script, computed in a new interpreter.
+        """
+        output = subprocess.check_output([sys.executable, '-c', key_script % {
+            'directory': directory, 'tau': tau, 'precision': precision, 'target': target}])
+        return output.decode('utf-8').strip().split('\n')[-1]
+
+    def _cached(self):
+        """
+        Libraries stored in the cache (the cache also contains the memoized equations).
+        """
+        return [cache_dir + '/' + key + '/' + f for key in os.listdir(cache_dir) if key != 'equations'
+                                                for f in os.listdir(cache_dir + '/' + key)]
+
+    def test_key(self):
+        """
+        The key ignores the compilation directory, but changes with the value of a frozen parameter,
+        the precision and the CPU targeted by the compiler.
+        """
+        key = self._key()
+        self.assertEqual(self._key(directory='annarchy_key2'), key)
+        self.assertNotEqual(self._key(tau=20.0), key)
+        self.assertNotEqual(self._key(precision='float'), key)
+        self.assertNotEqual(self._key(target='another cpu'), key)
+
+    def test_reuse(self):
+        """
+        A copy of the network compiled in another directory reuses the library of the network 0.
+        """
+        self.assertEqual(len(self._cached()), 1)
+        cached = self._cached()[0]
+        self.assertEqual(os.path.basename(cached), 'ANNarchyCore0.so')
+
+        net = Network(everything=True)
+        net.compile(directory = 'annarchy_cache_net1')
+
+        # The library was copied from the cache and is imported under the name of network 0
+        self.assertEqual(self._cached(), [cached])
+        self.assertTrue(filecmp.cmp(cached, 'annarchy_cache_net1/ANNarchyCore' + str(net.id) + '.so', shallow=False))
+        with open('annarchy_cache_net1/ANNarchyCore' + str(net.id) + '.import_id', 'r') as rfile:
+            self.assertEqual(rfile.read(), '0')
+
+        # Both networks are simulated independently with the same results
+        simulate(20.0)
+        net.simulate(20.0)
+        self.assertTrue(numpy.allclose(net.get(pop2).r, pop2.r))
+        self.assertFalse(numpy.allclose(pop2.r, 0.0))
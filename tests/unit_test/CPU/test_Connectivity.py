@@ -25,6 +25,8 @@ import unittest
 import numpy
 
 from ANNarchy import *
+from ANNarchy.core import Global
+import ANNarchy.core.cython_ext.Connector as Connector
 
 neuron = Neuron(
     equations="r = 1"
@@ -52,6 +54,35 @@ proj2 = Projection(
 proj1.connect_one_to_one(weights = 0.1)
 proj2.connect_all_to_all(weights = 0.1)
 
+pop3 = Population((7, 7), neuron)
+pop4 = Population((5, 5), neuron2)
+
+proj3 = Projection(pop3, pop4, "exc")
+proj3.connect_gaussian(amp = 1.0, sigma = 0.2, limit = 0.1)
+
+proj4 = Projection(pop3, pop4, "exc")
+proj4.connect_dog(amp_pos = 1.0, sigma_pos = 0.2, amp_neg = 0.3, sigma_neg = 0.4, limit = 0.1)
+
+proj5 = Projection(pop4, pop4, "exc")
+proj5.connect_fixed_probability(probability = 1.0, weights = 0.1)
+
+def from_arrays(pre, post):
+    # the post-synaptic neuron 2 appears twice and is merged
+    return CSR.from_arrays([2, 5, 2], [0, 2, 3, 4], [0, 4, 1, 7], [0.1, 0.2, 0.3, 0.4], 0.0)
+
+proj6 = Projection(pop1, pop2, "exc")
+proj6.connect_with_func(from_arrays)
+
+proj7 = Projection(pop3, pop4, "exc")
+proj7.connect_fixed_number_pre(number = 5, weights = 0.1)
+
+proj8 = Projection(pop4, pop3, "exc")
+proj8.connect_fixed_number_post(number = 5, weights = 0.1)
+
+# Large enough to be drawn in several blocks of random numbers
+pop5 = Population(2000, neuron)
+pop6 = Population(1500, neuron2)
+
 compile(clean=True)
 
 #TODO: one2one, all2all for PopulationViews
@@ -85,3 +116,121 @@ class test_Connectivity(unittest.TestCase):
         """
         self.assertEqual(proj2.dendrite(3).rank, [0, 1, 2, 3, 4, 5, 6, 7, 8])
         self.assertTrue(numpy.allclose(proj2.dendrite(3).w, np.ones((8,1)) * 0.1))
+
+    def test_fixed_probability(self):
+        """
+        Tests the *fixed_probability* connectivity pattern, in which each pair of neurons
+        is connected with the given probability.
+
+        With a probability of 1, every pre-synaptic neuron except the neuron itself is connected.
+        """
+        self.assertEqual(proj5.dendrite(3).rank, [i for i in range(25) if i != 3])
+        self.assertTrue(numpy.allclose(proj5.dendrite(3).w, 0.1))
+
+    def _distances(self, rank):
+        """
+        Squared distances between the normalized coordinates of the neurons of pop3 and of the neuron *rank* of pop4.
+        """
+        pre = numpy.array([[i/6., j/6.] for i in range(7) for j in range(7)])
+        post = numpy.array([(rank // 5)/4., (rank % 5)/4.])
+        return numpy.sum((pre - post)**2, axis=1)
+
+    def test_gaussian(self):
+        """
+        Tests the *gaussian* connectivity pattern, in which the weights decrease with the
+        distance between the normalized coordinates of the neurons.
+
+        We test correctness of ranks and weight values.
+        """
+        values = numpy.exp(-self._distances(8)/(2*0.2**2))
+        self.assertEqual(proj3.dendrite(8).rank, list(numpy.nonzero(values > 0.1)[0]))
+        self.assertTrue(numpy.allclose(proj3.dendrite(8).w, values[values > 0.1]))
+
+    def test_dog(self):
+        """
+        Tests the *dog* connectivity pattern, in which the weights follow a difference of
+        Gaussians of the distance between the normalized coordinates of the neurons.
+
+        We test correctness of ranks and weight values.
+        """
+        d = self._distances(8)
+        values = numpy.exp(-d/(2*0.2**2)) - 0.3 * numpy.exp(-d/(2*0.4**2))
+        self.assertEqual(proj4.dendrite(8).rank, list(numpy.nonzero(numpy.abs(values) > 0.1*0.7)[0]))
+        self.assertTrue(numpy.allclose(proj4.dendrite(8).w, values[numpy.abs(values) > 0.1*0.7]))
+
+    def test_from_arrays(self):
+        """
+        Tests a user-defined pattern returning a CSR object created with *CSR.from_arrays()*.
+
+        We test correctness of ranks and weight values.
+        """
+        self.assertEqual(proj6.post_ranks, [2, 5])
+        self.assertEqual(proj6.dendrite(2).rank, [0, 4, 7])
+        self.assertTrue(numpy.allclose(proj6.dendrite(2).w, [0.1, 0.2, 0.4]))
+        self.assertEqual(proj6.dendrite(5).rank, [1])
+        self.assertTrue(numpy.allclose(proj6.dendrite(5).w, [0.3]))
+
+    def test_fixed_number_pre(self):
+        """
+        Tests the *fixed_number_pre* connectivity pattern, in which each post-synaptic neuron
+        receives synapses from the given number of distinct pre-synaptic neurons.
+        """
+        self.assertEqual(proj7.post_ranks, list(range(25)))
+        for rk in proj7.post_ranks:
+            ranks = proj7.dendrite(rk).rank
+            self.assertEqual(len(ranks), 5)
+            self.assertEqual(ranks, sorted(set(ranks)))
+            self.assertTrue(all(0 <= r < 49 for r in ranks))
+            self.assertTrue(numpy.allclose(proj7.dendrite(rk).w, 0.1))
+
+    def test_fixed_number_post(self):
+        """
+        Tests the *fixed_number_post* connectivity pattern, in which each pre-synaptic neuron
+        sends synapses to the given number of distinct post-synaptic neurons.
+        """
+        nb_post = numpy.zeros(25, dtype=int)
+        for rk in proj8.post_ranks:
+            ranks = proj8.dendrite(rk).rank
+            self.assertEqual(ranks, sorted(set(ranks)))
+            self.assertTrue(numpy.allclose(proj8.dendrite(rk).w, 0.1))
+            nb_post[ranks] += 1
+        self.assertTrue(numpy.all(nb_post == 5))
+
+    def _connect(self, num_threads, pattern, *args):
+        """
+        Synapses created by the given Cython connector with the given number of threads.
+        """
+        num_threads_old = Global.config['num_threads']
+        Global.config['num_threads'] = num_threads
+        numpy.random.seed(42)
+        try:
+            csr = pattern(*args)
+        finally:
+            Global.config['num_threads'] = num_threads_old
+        return list(csr.post_rank), list(csr.pre_rank), list(csr.w)
+
+    def _compare_threads(self, pattern, *args):
+        """
+        The synapses and their weights do not depend on the number of threads.
+        """
+        post_ranks, pre_ranks, w = self._connect(1, pattern, *args)
+        self.assertTrue(len(post_ranks) > 0)
+        self.assertEqual(self._connect(4, pattern, *args), (post_ranks, pre_ranks, w))
+
+    def test_fixed_probability_threads(self):
+        """
+        Tests that *fixed_probability* creates the same synapses with 1 and 4 threads.
+        """
+        self._compare_threads(Connector.fixed_probability, pop5, pop6, 0.5, Uniform(0.0, 1.0), 0.0, False)
+
+    def test_fixed_number_pre_threads(self):
+        """
+        Tests that *fixed_number_pre* creates the same synapses with 1 and 4 threads.
+        """
+        self._compare_threads(Connector.fixed_number_pre, pop5, pop6, 10, Uniform(0.0, 1.0), 0.0, False)
+
+    def test_fixed_number_post_threads(self):
+        """
+        Tests that *fixed_number_post* creates the same synapses with 1 and 4 threads.
+        """
+        self._compare_threads(Connector.fixed_number_post, pop5, pop6, 10, Uniform(0.0, 1.0), 0.0, False)
@@ -155,6 +155,23 @@ class test_Dendrite(unittest.TestCase):
         proj.dendrite(6)[2].w=3.0
         self.assertTrue(numpy.allclose(proj.dendrite(6).w, [2.0, 2.0, 3.0, 2.0, 2.0]))
 
+    def test_set_weights_list(self):
+        """
+        Tests the setting of the parameter *w* (weights) of a *Dendrite* through a list of values.
+        """
+        proj.dendrite(2).w = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.assertTrue(numpy.allclose(proj.dendrite(2).w, [1.0, 2.0, 3.0, 4.0, 5.0]))
+
+    def test_set_weights_wrong_size(self):
+        """
+        A list of values whose size differs from the number of synapses of the *Dendrite* is rejected
+        and the synapses of the next *Dendrite* are not overwritten.
+        """
+        with self.assertRaises(SystemExit):
+            proj.dendrite(3).w = [5.0, 5.0, 5.0, 5.0, 5.0, 5.0, 5.0]
+        self.assertTrue(numpy.allclose(proj.dendrite(3).w, [1.0, 1.0, 1.0, 1.0, 1.0]))
+        self.assertTrue(numpy.allclose(proj.dendrite(4).w, [1.0, 1.0, 1.0, 1.0, 1.0]))
+
     #def test_get_dendrite_tau_2(self):
     #    """
     #    Tests the access of the parameter *tau* with the *get()* method.
@@ -0,0 +1,101 @@
+"""
+
+    test_Export.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+from ANNarchy import *
+
+neuron = Neuron(
+    parameters = "baseline = 0.0",
+    equations = "10.0 * dr/dt = baseline - r + sum(exc) : min = 0.0"
+)
+
+Oja = Synapse(
+    parameters = "alpha = 0.5",
+    equations = "100.0 * dw/dt = pre.r * post.r - alpha * post.r^2 * w"
+)
+
+pop1 = Population(4, neuron)
+pop1.baseline = [1.0, 2.0, 3.0, 4.0]
+pop2 = Population(3, neuron)
+
+proj = Projection(pop1, pop2, 'exc', Oja)
+proj.connect_fixed_probability(0.75, weights = Uniform(0.0, 0.5))
+
+# Not the default directory: the exported library is the one which was loaded
+compile(directory = 'annarchy_export')
+
+# Script loading the bundle in a new interpreter and simulating it
+load_script = """
+import json
+from ANNarchy import *
+load_compiled('%(bundle)s')
+simulate(20.0)
+pop2 = populations()[1]
+proj = projections()[0]
+print(json.dumps({'r': list(pop2.r), 'w': dict((rk, list(proj.dendrite(rk).w)) for rk in proj.post_ranks)}))
+"""
+
+class test_Export(unittest.TestCase):
+    """
+    This class tests the export of a compiled network with *export_compiled()*
+    and its simulation after *load_compiled()* in another interpreter.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Simulates the network, exports it and continues the simulation.
+        """
+        cls.bundle = os.path.abspath('annarchy_bundle')
+        simulate(10.0)
+        export_compiled(cls.bundle)
+        simulate(20.0)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.bundle)
+
+    def test_bundle(self):
+        """
+        The bundle contains the library and the description of the network.
+        """
+        self.assertTrue(os.path.isfile(self.bundle + '/ANNarchyCore0.so'))
+        self.assertTrue(os.path.isfile(self.bundle + '/network.data'))
+
+    def test_load(self):
+        """
+        The loaded network continues from the exported values exactly like the original one.
+        """
+        output = subprocess.check_output([sys.executable, '-c', load_script % {'bundle': self.bundle}],
+                                         cwd = self.bundle)
+        result = json.loads(output.decode('utf-8').strip().split('\n')[-1])
+        self.assertTrue(numpy.allclose(result['r'], pop2.r))
+        self.assertEqual(sorted(result['w'].keys()), sorted(str(rk) for rk in proj.post_ranks))
+        for rk in proj.post_ranks:
+            self.assertTrue(numpy.allclose(result['w'][str(rk)], proj.dendrite(rk).w))
@@ -0,0 +1,111 @@
+"""
+
+    test_Memoization.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import os
+import shutil
+
+from ANNarchy import *
+from ANNarchy.core import Global
+import ANNarchy.parser.Memoization as Memoization
+from ANNarchy.parser.Equation import Equation
+
+cache_dir = os.path.abspath('annarchy_memo')
+
+def description(tau):
+    """
+    Description of a neuron with a frozen parameter tau, a parameter I and a variable v.
+    """
+    return {
+        'object': 'neuron',
+        'attributes': ['tau', 'I', 'v'],
+        'local': ['I', 'v'],
+        'global': ['tau'],
+        'parameters': [ {'name': 'tau', 'init': tau, 'flags': ['frozen']},
+                        {'name': 'I', 'init': 0.0, 'flags': []} ],
+        'variables': [ {'name': 'v'} ],
+    }
+
+class test_Memoization(unittest.TestCase):
+    """
+    This class tests the memoization of the analysis of equations: SymPy is only
+    called for equations which have not been parsed before with the same options.
+    """
+    def setUp(self):
+        """
+        Empty cache, and Equation._parse() (which calls SymPy) counts its calls.
+        """
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        self.cache_dir = Global.config['cache_dir']
+        Global.config['cache_dir'] = cache_dir
+        Memoization._memo.clear()
+
+        self.parse = Equation._parse
+        self.nb_calls = 0
+        def counted_parse(equation):
+            self.nb_calls += 1
+            return self.parse(equation)
+        Equation._parse = counted_parse
+
+    def tearDown(self):
+        Equation._parse = self.parse
+        Global.config['cache_dir'] = self.cache_dir
+        Memoization._memo.clear()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def _code(self, method='explicit', tau=10.0, hoist=False):
+        """
+        Code of the ODE, parsed with a new Equation object.
+        """
+        return Equation('v', 'tau * dv/dt + v = I', description(tau), method=method, hoist=hoist).parse()
+
+    def test_hit(self):
+        """
+        The second analysis of an equation is read from the JSON files of the cache.
+        """
+        code = self._code()
+        self.assertEqual(self.nb_calls, 1)
+        self.assertEqual(len(os.listdir(cache_dir + '/equations')), 1)
+
+        # Forget the results kept in memory: only the files remain
+        Memoization._memo.clear()
+        self.assertEqual(self._code(), code)
+        self.assertEqual(self.nb_calls, 1)
+
+    def test_miss(self):
+        """
+        Changing the numerical method, the value of a frozen parameter or the hoisting
+        requires a new analysis.
+        """
+        code = self._code()
+        self.assertEqual(self.nb_calls, 1)
+
+        self.assertNotEqual(self._code(method='implicit'), code)
+        self.assertEqual(self.nb_calls, 2)
+
+        self.assertNotEqual(self._code(tau=20.0), code)
+        self.assertEqual(self.nb_calls, 3)
+
+        self._code(hoist=True)
+        self.assertEqual(self.nb_calls, 4)
+        self.assertEqual(len(os.listdir(cache_dir + '/equations')), 4)
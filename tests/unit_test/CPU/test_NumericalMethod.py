@@ -0,0 +1,134 @@
+"""
+
+    test_NumericalMethod.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import *
+
+setup(dt=0.1)
+
+neuron = Neuron(
+    parameters = """
+        tau = 10.0 : population
+        tau_local = 10.0
+        baseline = 1.0 : population
+        tau_frozen = 10.0 : population, frozen
+    """,
+    equations = """
+        tau * dr/dt = -r : exponential, init = 1.0
+        tau_local * dy/dt = -y : exponential, init = 1.0
+        tau * dz/dt + z = baseline : exponential
+        tau_frozen * dw/dt = -w : init = 1.0
+    """
+)
+
+oscillator = Neuron(
+    equations = """
+        dr/dt = x : rk4, init = 1.0
+        dx/dt = -r : rk4
+    """
+)
+
+decay = Neuron(
+    equations = """
+        dr/dt = -r : init = 1.0
+    """
+)
+
+pop = Population(5, neuron)
+pop.tau_local = numpy.linspace(5.0, 15.0, 5)
+
+pop2 = Population(5, oscillator)
+pop3 = Population(5, decay, substeps=10)
+pop4 = Population(5, neuron, period=1.0)
+
+compile(clean=True)
+
+
+class test_NumericalMethod(unittest.TestCase):
+    """
+    Linear first-order ODEs integrated with the exponential method are solved exactly,
+    the other methods converge with the expected order.
+    """
+    def setUp(self):
+        """
+        basic setUp() method to reset the network after every test
+        """
+        reset()
+
+    def test_population_decay(self):
+        """
+        input-free decay with a population-wide time constant
+        """
+        simulate(10.0)
+        self.assertTrue(numpy.allclose(pop.r, numpy.exp(-1.0)))
+
+    def test_local_decay(self):
+        """
+        input-free decay with a time constant per neuron
+        """
+        simulate(10.0)
+        self.assertTrue(numpy.allclose(pop.y, numpy.exp(-10.0/numpy.linspace(5.0, 15.0, 5))))
+
+    def test_steady_state(self):
+        """
+        convergence towards a steady state
+        """
+        simulate(10.0)
+        self.assertTrue(numpy.allclose(pop.z, 1.0 - numpy.exp(-1.0)))
+
+    def test_frozen_parameter(self):
+        """
+        frozen parameters are inlined in the equations and can not be modified
+        """
+        pop.tau_frozen = 20.0
+        self.assertEqual(pop.tau_frozen, 10.0)
+        simulate(10.0)
+        self.assertTrue(numpy.allclose(pop.w, (1.0 - 0.1/10.0)**100))
+
+    def test_rk4(self):
+        """
+        coupled ODEs integrated with the fourth-order Runge-Kutta method
+        """
+        simulate(10.0)
+        self.assertTrue(numpy.allclose(pop2.r, numpy.cos(10.0), atol=1e-5))
+        self.assertTrue(numpy.allclose(pop2.x, -numpy.sin(10.0), atol=1e-5))
+
+    def test_substeps(self):
+        """
+        a population with substeps is integrated with a smaller step size
+        """
+        simulate(10.0)
+        self.assertTrue(numpy.allclose(pop3.r, (1.0 - 0.01)**1000))
+
+    def test_period(self):
+        """
+        a population with an update period is integrated with a larger step size
+        """
+        simulate(10.0)
+        self.assertTrue(numpy.allclose(pop4.r, numpy.exp(-1.0)))
+        self.assertTrue(numpy.allclose(pop4.w, (1.0 - 1.0/10.0)**10))
+        reset()
+        simulate(0.5)
+        self.assertTrue(numpy.allclose(pop4.w, 1.0 - 1.0/10.0))
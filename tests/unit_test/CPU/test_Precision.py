@@ -0,0 +1,98 @@
+"""
+
+    test_Precision.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import *
+
+setup(precision='mixed')
+
+neuron = Neuron(
+    parameters = "baseline = 0.0",
+    equations = "r = baseline"
+)
+
+neuron2 = Neuron(
+    equations = """
+        sum1 = sum(lil)
+        sum2 = sum(sell)
+        max_r = max(r) : population
+        r = sum1
+    """
+)
+
+pop1 = Population(20, neuron)
+pop2 = Population(19, neuron2)
+
+weights = [[ 0.01 * (i+j) if (i*j) % 3 != 1 else None for j in range(20)] for i in range(19)]
+
+proj1 = Projection(pop1, pop2, 'lil', storage_format = 'lil')
+proj1.connect_from_matrix(weights)
+
+proj2 = Projection(pop1, pop2, 'sell', storage_format = 'sell')
+proj2.connect_from_matrix(weights)
+
+pop1.baseline = numpy.linspace(0.0, 1.0, 20)
+
+compile(clean=True)
+
+
+class test_Precision(unittest.TestCase):
+    """
+    Networks can be simulated in single precision, with double-precision
+    accumulators in the weighted sums ('mixed').
+    """
+    def setUp(self):
+        """
+        basic setUp() method to reset the network after every test
+        """
+        reset()
+
+    def test_dtype(self):
+        """
+        the local attributes are returned as single-precision arrays
+        """
+        self.assertEqual(pop1.baseline.dtype, numpy.float32)
+        self.assertEqual(pop2.r.dtype, numpy.float32)
+
+    def test_weighted_sum(self):
+        """
+        the weighted sums match the double-precision computation
+        """
+        simulate(3)
+        W = numpy.array([[w if w is not None else 0.0 for w in row] for row in weights])
+        expected = W.dot(numpy.linspace(0.0, 1.0, 20))
+        self.assertTrue(numpy.allclose(pop2.sum1, expected, rtol=1e-6))
+        self.assertTrue(numpy.allclose(pop2.sum2, expected, rtol=1e-6))
+        self.assertAlmostEqual(pop2.max_r, numpy.max(expected), places=5)
+
+    def test_set_weights(self):
+        """
+        the weights can be modified from Python
+        """
+        w = proj2.dendrite(3).w
+        proj2.dendrite(3).w = 0.5
+        self.assertTrue(numpy.allclose(proj2.dendrite(3).w, 0.5))
+        proj2.dendrite(3).w = w
+        self.assertTrue(numpy.allclose(proj2.dendrite(3).w, proj1.dendrite(3).w))
@@ -0,0 +1,98 @@
+"""
+
+    test_Quiescence.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import *
+
+# Decays by 10% per step: from 5.0, the first step changes v by 0.5
+neuron = Neuron(
+    equations = """
+        dv/dt = (-v + g_exc)/10.0 : init = 5.0
+        g_exc = 0.0
+    """,
+    spike = "v > 1000.0",
+    reset = "v = 0.0"
+)
+
+inp = SpikeSourceArray(spike_times=[[5.0], [], []])
+pop1 = Population(3, neuron)
+pop2 = Population(3, neuron, quiescence=1.0)
+
+proj = Projection(inp, pop2, 'exc')
+proj.connect_one_to_one(weights = 20.0)
+
+compile(clean=True)
+
+
+class test_Quiescence(unittest.TestCase):
+    """
+    Spiking neurons whose variables change by less than the quiescence
+    tolerance are not updated until they are woken up.
+    """
+    def setUp(self):
+        """
+        basic setUp() method to reset the network after every test
+        """
+        reset()
+
+    def test_rest(self):
+        """
+        neurons at rest are not updated anymore
+        """
+        simulate(1)
+        self.assertTrue(numpy.allclose(pop2.v, 4.5))
+        simulate(4)
+        self.assertTrue(numpy.allclose(pop1.v, 5.0 * 0.9**5))
+        self.assertTrue(numpy.allclose(pop2.v[1:], 4.5))
+
+    def test_spike(self):
+        """
+        an incoming spike wakes the neuron up until it is at rest again
+        """
+        simulate(20)
+        # 4.5 + (20.0 - 4.5)/10 = 6.05, then 6.05 - 0.605 = 5.445
+        self.assertTrue(numpy.allclose(pop2.v, [5.445, 4.5, 4.5]))
+
+    def test_set_attribute(self):
+        """
+        setting an attribute from Python wakes the neurons up
+        """
+        simulate(3)
+        pop2.neuron(1).v = 8.0
+        simulate(1)
+        self.assertTrue(numpy.allclose(pop2.v[1:], [7.2, 4.5]))
+        pop2.v = 3.0
+        simulate(1)
+        self.assertTrue(numpy.allclose(pop2.v, 2.7))
+
+    def test_reset(self):
+        """
+        reset() puts all neurons back in the update list
+        """
+        simulate(3)
+        reset()
+        self.assertTrue(numpy.allclose(pop2.v, 5.0))
+        simulate(1)
+        self.assertTrue(numpy.allclose(pop2.v, 4.5))
@@ -0,0 +1,64 @@
+"""
+
+    test_SpikeSourceArray.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+
+from ANNarchy import *
+
+setup(dt=0.1)
+
+inp = SpikeSourceArray(spike_times=[[1.0, 0.3, 2.0, 2.0], [], [5.5]])
+m = Monitor(inp, 'spike')
+
+compile(clean=True)
+
+
+class test_SpikeSourceArray(unittest.TestCase):
+    """
+    SpikeSourceArray emits spikes at the given times, which can be
+    modified or extended during the simulation.
+    """
+    def setUp(self):
+        """
+        basic setUp() method to reset the network after every test
+        """
+        reset()
+        m.get()
+
+    def test_spike_times(self):
+        """
+        the spikes are emitted at the closest step, duplicates are removed
+        """
+        simulate(10.0)
+        self.assertEqual(m.get('spike'), {0: [3, 10, 20], 1: [], 2: [55]})
+
+    def test_add_spikes(self):
+        """
+        spikes added during the simulation are emitted, past ones are ignored
+        """
+        simulate(3.0)
+        inp.add_spikes([[4.0, 1.5], [3.5], []])
+        self.assertEqual(inp.spike_times, [[0.3, 1.0, 1.5, 2.0, 4.0], [3.5], [5.5]])
+        simulate(7.0)
+        self.assertEqual(m.get('spike'), {0: [3, 10, 20, 40], 1: [35], 2: [55]})
+        inp.spike_times = [[0.3, 1.0, 2.0], [], [5.5]]
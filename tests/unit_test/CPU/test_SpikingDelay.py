@@ -0,0 +1,145 @@
+"""
+
+    test_SpikingDelay.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+import json
+import subprocess
+import sys
+
+from ANNarchy import *
+
+neuron = Neuron(
+    equations = """
+        dv/dt = -v/20.0 + g_exc
+        g_exc = 0.0
+    """,
+    spike = "v > 1000.0",
+    reset = "v = 0.0"
+)
+
+inp = SpikeSourceArray(spike_times=[[float(10 + 7*i + 13*k) for k in range(5)] for i in range(10)])
+pop1 = Population(5, neuron)
+pop2 = Population(5, neuron)
+
+weights = numpy.array([[0.1 * (1 + (i+j) % 4) for j in range(10)] for i in range(5)])
+delays = numpy.array([[float(1 + (2*i+j) % 6) for j in range(10)] for i in range(5)])
+
+# Non-uniform delays
+proj = Projection(inp, pop1, 'exc')
+proj.connect_from_matrix(weights.tolist(), delays=delays.tolist())
+
+# Same synapses split into projections with uniform delays
+for d in range(1, 7):
+    w = [[weights[i, j] if delays[i, j] == d else None for j in range(10)] for i in range(5)]
+    Projection(inp, pop2, 'exc').connect_from_matrix(w, delays=float(d))
+
+m1 = Monitor(pop1, 'v')
+m2 = Monitor(pop2, 'v')
+
+compile(clean=True)
+
+# Network large enough to be updated and propagated in parallel (more than
+# OMP_MIN_NB_NEURONS post-synaptic neurons), simulated in a new interpreter
+# for each number of threads.
+threads_script = """
+import json
+import numpy
+from ANNarchy import *
+setup(num_threads=%(num_threads)s, seed=1)
+
+neuron = Neuron(
+    parameters = "I = 0.0",
+    equations = "dv/dt = (-v + I + g_exc - g_inh)/20.0",
+    spike = "v > 1.0",
+    reset = "v = 0.0"
+)
+
+pop = Population(1000, neuron)
+pop.I = numpy.random.uniform(0.9, 1.5, 1000)
+
+exc = Projection(pop, pop, 'exc')
+exc.connect_fixed_probability(0.05, weights=Uniform(0.0, 0.05), delays=Uniform(1.0, 5.0))
+inh = Projection(pop, pop, 'inh')
+inh.connect_fixed_number_pre(20, weights=0.05, delays=2.0)
+
+m = Monitor(pop, 'spike')
+
+compile(directory='annarchy_threads%(num_threads)s')
+
+spiked = []
+for t in range(2000):
+    step()
+    spiked.append(pop.cyInstance.get_spiked())
+
+print(json.dumps({'spiked': spiked, 'spikes': m.get('spike'), 'v': list(pop.v)}))
+"""
+
+
+class test_SpikingDelay(unittest.TestCase):
+    """
+    Spiking projections accept non-uniform delays.
+    """
+    def test_delay(self):
+        """
+        the delays of the synapses are the ones provided
+        """
+        self.assertTrue(numpy.allclose(proj.dendrite(2).delay, delays[2]))
+
+    def test_transmission(self):
+        """
+        each spike reaches its synapses after their own delay
+        """
+        simulate(100.0)
+        self.assertTrue(numpy.allclose(m1.get('v'), m2.get('v')))
+
+
+class test_SpikingThreads(unittest.TestCase):
+    """
+    Spiking networks give the same results with one and several threads.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Simulates the same network with 1 and 4 threads.
+        """
+        cls.results = {}
+        for num_threads in [1, 4]:
+            output = subprocess.check_output([sys.executable, '-c', threads_script % {'num_threads': num_threads}])
+            cls.results[num_threads] = json.loads(output.decode('utf-8').strip().split('\n')[-1])
+
+    def test_spike_trains(self):
+        """
+        the spikes propagated in parallel with their delays give the same spike trains
+        """
+        self.assertTrue(sum(len(times) for times in self.results[1]['spikes'].values()) > 0)
+        self.assertEqual(self.results[4]['spikes'], self.results[1]['spikes'])
+        self.assertTrue(numpy.allclose(self.results[4]['v'], self.results[1]['v']))
+
+    def test_spike_order(self):
+        """
+        the spikes collected by the threads are emitted in the sequential order, sorted by rank
+        """
+        self.assertEqual(self.results[4]['spiked'], self.results[1]['spiked'])
+        for spiked in self.results[4]['spiked']:
+            self.assertEqual(spiked, sorted(spiked))
@@ -0,0 +1,136 @@
+"""
+
+    test_StorageFormat.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import *
+
+neuron = Neuron(
+    parameters = "baseline = 0.0",
+    equations = "r = baseline"
+)
+
+neuron2 = Neuron(
+    equations = """
+        sum1 = sum(lil)
+        sum2 = sum(csr)
+        sum3 = sum(sell)
+        sum4 = sum(lil_div)
+        sum5 = sum(sell_div)
+        r = sum1
+    """
+)
+
+hebb = Synapse(
+    parameters = "eta = 0.1",
+    equations = "dw/dt = eta * pre.r * post.r"
+)
+
+# The psp is not finite on the padding elements of SELL (w = 0)
+division = Synapse(
+    psp = "pre.r / w"
+)
+
+pop1 = Population(20, neuron)
+pop2 = Population(19, neuron2)
+
+# Sparse matrix with a different number of synapses per post-synaptic neuron
+weights = [[ 0.01 * (i+j) if (i*j) % 3 != 1 else None for j in range(20)] for i in range(19)]
+
+proj1 = Projection(pop1, pop2, 'lil', hebb, storage_format = 'lil')
+proj1.connect_from_matrix(weights)
+
+proj2 = Projection(pop1, pop2, 'csr', hebb, storage_format = 'csr')
+proj2.connect_from_matrix(weights)
+
+proj3 = Projection(pop1, pop2, 'sell', hebb, storage_format = 'sell')
+proj3.connect_from_matrix(weights)
+
+weights_div = [[ 0.5 if (i*j) % 3 != 1 else None for j in range(20)] for i in range(19)]
+
+proj4 = Projection(pop1, pop2, 'lil_div', division, storage_format = 'lil')
+proj4.connect_from_matrix(weights_div)
+
+proj5 = Projection(pop1, pop2, 'sell_div', division, storage_format = 'sell')
+proj5.connect_from_matrix(weights_div)
+
+pop1.baseline = numpy.linspace(0.0, 1.0, 20)
+
+compile(clean=True)
+
+
+class test_StorageFormat(unittest.TestCase):
+    """
+    Projections using the LIL, CSR and SELL formats must compute the same
+    weighted sums and learn the same weights.
+    """
+    def setUp(self):
+        """
+        basic setUp() method to reset the network after every test
+        """
+        reset()
+
+    def test_pre_ranks(self):
+        """
+        the accessors return the same connectivity whatever the format
+        """
+        for rk in range(19):
+            self.assertEqual(proj1.dendrite(rk).rank, proj2.dendrite(rk).rank)
+            self.assertEqual(proj1.dendrite(rk).rank, proj3.dendrite(rk).rank)
+
+    def test_weighted_sum(self):
+        """
+        the weighted sums are identical
+        """
+        simulate(2)
+        self.assertTrue(numpy.allclose(pop2.sum1, pop2.sum2))
+        self.assertTrue(numpy.allclose(pop2.sum1, pop2.sum3))
+
+    def test_padding(self):
+        """
+        the padding elements of SELL do not contribute to the weighted sum,
+        even when their psp is not finite
+        """
+        simulate(2)
+        self.assertTrue(numpy.all(numpy.isfinite(pop2.sum5)))
+        self.assertTrue(numpy.allclose(pop2.sum4, pop2.sum5))
+
+    def test_learning(self):
+        """
+        the learning rule updates the same synapses
+        """
+        simulate(5)
+        self.assertTrue(numpy.allclose(proj1.dendrite(4).w, proj2.dendrite(4).w))
+        self.assertTrue(numpy.allclose(proj1.dendrite(4).w, proj3.dendrite(4).w))
+
+    def test_set_weights(self):
+        """
+        the weights of a dendrite can be modified
+        """
+        proj1.dendrite(3).w = 0.5
+        proj2.dendrite(3).w = 0.5
+        proj3.dendrite(3).w = 0.5
+        self.assertTrue(numpy.allclose(proj2.dendrite(3).w, 0.5))
+        self.assertTrue(numpy.allclose(proj3.dendrite(3).w, 0.5))
+        self.assertTrue(numpy.allclose(proj2.dendrite(4).w, proj3.dendrite(4).w))